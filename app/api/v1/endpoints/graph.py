@@ -1,10 +1,255 @@
-from fastapi import APIRouter
-from app.schemas.analysis_result import GraphResponse
+import json
+from typing import AsyncIterator, Iterator, List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from app.schemas.analysis_result import (
+    GraphResponse,
+    GraphNodePage,
+    GraphEdgePage,
+    GraphWriteJob,
+    GraphWriteQueueStats,
+)
 from app.services.nlp_service import get_graph_response
+from app.services.graph_service import graph_service
+from app.services.async_graph_service import async_graph_service
+from app.services.graph_writer import graph_write_queue
 
 router = APIRouter(tags=["graph"])
+# Served instead of `router` when settings.neo4j_async is enabled
+async_router = APIRouter(tags=["graph"])
 
 
 @router.get("/graph", response_model=GraphResponse)
 def get_graph() -> GraphResponse:
     return get_graph_response()
+
+
+@router.get("/graph/nodes", response_model=GraphNodePage)
+def get_graph_nodes(
+    limit: int = Query(500, ge=1, le=5000),
+    cursor: Optional[str] = None,
+    type: Optional[str] = Query(None, description="user | post | platform | entity"),
+    label: Optional[str] = Query(None, description="Entity NER label, e.g. PERSON"),
+) -> GraphNodePage:
+    try:
+        nodes, next_cursor = graph_service.get_nodes_page(
+            limit=limit, cursor=cursor, node_type=type, label=label)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return GraphNodePage(nodes=nodes, next_cursor=next_cursor)
+
+
+@router.get("/graph/edges", response_model=GraphEdgePage)
+def get_graph_edges(
+    limit: int = Query(500, ge=1, le=5000),
+    cursor: Optional[str] = None,
+    rel_type: Optional[str] = Query(None, description="POSTED | ON | MENTIONS"),
+) -> GraphEdgePage:
+    try:
+        edges, next_cursor = graph_service.get_edges_page(
+            limit=limit, cursor=cursor, rel_type=rel_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return GraphEdgePage(edges=edges, next_cursor=next_cursor)
+
+
+@router.get("/graph/export")
+def export_graph(
+    type: Optional[str] = Query(None, description="user | post | platform | entity"),
+    label: Optional[str] = Query(None, description="Entity NER label, e.g. PERSON"),
+    page_size: int = Query(1000, ge=1, le=5000),
+) -> StreamingResponse:
+    """
+    Stream the graph as NDJSON: one {"kind": "node", ...} line per node, then
+    one {"kind": "edge", ...} line per relationship. Edges are only included
+    for an unfiltered export.
+    """
+    try:
+        first_page = graph_service.get_nodes_page(
+            limit=page_size, node_type=type, label=label)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    def lines() -> Iterator[str]:
+        nodes, cursor = first_page
+        while True:
+            for node in nodes:
+                yield json.dumps({"kind": "node", **node.model_dump()}) + "\n"
+            if cursor is None:
+                break
+            nodes, cursor = graph_service.get_nodes_page(
+                limit=page_size, cursor=cursor, node_type=type, label=label)
+        if type is None and label is None:
+            for edges in graph_service.iter_edges(page_size=page_size):
+                for edge in edges:
+                    yield json.dumps({"kind": "edge", **edge.model_dump()}) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+# Subgraph and path routes: node ids contain ":" and, for URL entities, "/"
+@router.get("/graph/nodes/{node_id:path}/subgraph", response_model=GraphResponse)
+def get_node_subgraph(
+    node_id: str,
+    depth: int = Query(2, ge=1, le=4),
+    limit: int = Query(500, ge=1, le=5000, description="Maximum nodes, the center included"),
+    fanout: int = Query(50, ge=1, le=1000, description="Maximum new edges followed per node per hop"),
+    rel_type: Optional[List[str]] = Query(None, description="POSTED | ON | MENTIONS (default: all)"),
+) -> GraphResponse:
+    """
+    The neighbourhood of a node up to `depth` hops, from one bounded
+    traversal, e.g. /graph/nodes/entity:PERSON:Joko Widodo/subgraph?depth=2
+    """
+    try:
+        subgraph = graph_service.get_subgraph(
+            node_id, depth=depth, limit=limit, fanout=fanout, rel_types=rel_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if subgraph is None:
+        raise HTTPException(status_code=404, detail="Node not found")
+    return subgraph
+
+
+@router.get("/graph/path", response_model=GraphResponse)
+def get_shortest_path(
+    source: str,
+    target: str,
+    max_depth: int = Query(4, ge=1, le=8),
+    rel_type: List[str] = Query(
+        ["POSTED", "MENTIONS"],
+        description="Relationship types the path may use; ON (via a platform node) is left out by default",
+    ),
+) -> GraphResponse:
+    """One shortest path between two nodes, at most `max_depth` hops long."""
+    try:
+        path = graph_service.get_shortest_path(
+            source, target, max_depth=max_depth, rel_types=rel_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"No path within {max_depth} hops")
+    return path
+
+
+@async_router.get("/graph", response_model=GraphResponse)
+async def get_graph_async() -> GraphResponse:
+    return await async_graph_service.get_graph_response()
+
+
+@async_router.get("/graph/nodes", response_model=GraphNodePage)
+async def get_graph_nodes_async(
+    limit: int = Query(500, ge=1, le=5000),
+    cursor: Optional[str] = None,
+    type: Optional[str] = Query(None, description="user | post | platform | entity"),
+    label: Optional[str] = Query(None, description="Entity NER label, e.g. PERSON"),
+) -> GraphNodePage:
+    try:
+        nodes, next_cursor = await async_graph_service.get_nodes_page(
+            limit=limit, cursor=cursor, node_type=type, label=label)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return GraphNodePage(nodes=nodes, next_cursor=next_cursor)
+
+
+@async_router.get("/graph/edges", response_model=GraphEdgePage)
+async def get_graph_edges_async(
+    limit: int = Query(500, ge=1, le=5000),
+    cursor: Optional[str] = None,
+    rel_type: Optional[str] = Query(None, description="POSTED | ON | MENTIONS"),
+) -> GraphEdgePage:
+    try:
+        edges, next_cursor = await async_graph_service.get_edges_page(
+            limit=limit, cursor=cursor, rel_type=rel_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return GraphEdgePage(edges=edges, next_cursor=next_cursor)
+
+
+@async_router.get("/graph/export")
+async def export_graph_async(
+    type: Optional[str] = Query(None, description="user | post | platform | entity"),
+    label: Optional[str] = Query(None, description="Entity NER label, e.g. PERSON"),
+    page_size: int = Query(1000, ge=1, le=5000),
+) -> StreamingResponse:
+    """Async version of the NDJSON graph export."""
+    try:
+        first_page = await async_graph_service.get_nodes_page(
+            limit=page_size, node_type=type, label=label)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def lines() -> AsyncIterator[str]:
+        nodes, cursor = first_page
+        while True:
+            for node in nodes:
+                yield json.dumps({"kind": "node", **node.model_dump()}) + "\n"
+            if cursor is None:
+                break
+            nodes, cursor = await async_graph_service.get_nodes_page(
+                limit=page_size, cursor=cursor, node_type=type, label=label)
+        if type is None and label is None:
+            while True:
+                edges, cursor = await async_graph_service.get_edges_page(
+                    limit=page_size, cursor=cursor)
+                for edge in edges:
+                    yield json.dumps({"kind": "edge", **edge.model_dump()}) + "\n"
+                if cursor is None:
+                    break
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@async_router.get("/graph/nodes/{node_id:path}/subgraph", response_model=GraphResponse)
+async def get_node_subgraph_async(
+    node_id: str,
+    depth: int = Query(2, ge=1, le=4),
+    limit: int = Query(500, ge=1, le=5000, description="Maximum nodes, the center included"),
+    fanout: int = Query(50, ge=1, le=1000, description="Maximum new edges followed per node per hop"),
+    rel_type: Optional[List[str]] = Query(None, description="POSTED | ON | MENTIONS (default: all)"),
+) -> GraphResponse:
+    """Async version of the subgraph route."""
+    try:
+        subgraph = await async_graph_service.get_subgraph(
+            node_id, depth=depth, limit=limit, fanout=fanout, rel_types=rel_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if subgraph is None:
+        raise HTTPException(status_code=404, detail="Node not found")
+    return subgraph
+
+
+@async_router.get("/graph/path", response_model=GraphResponse)
+async def get_shortest_path_async(
+    source: str,
+    target: str,
+    max_depth: int = Query(4, ge=1, le=8),
+    rel_type: List[str] = Query(
+        ["POSTED", "MENTIONS"],
+        description="Relationship types the path may use; ON (via a platform node) is left out by default",
+    ),
+) -> GraphResponse:
+    """Async version of the shortest path route."""
+    try:
+        path = await async_graph_service.get_shortest_path(
+            source, target, max_depth=max_depth, rel_types=rel_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"No path within {max_depth} hops")
+    return path
+
+
+@router.get("/graph/queue", response_model=GraphWriteQueueStats)
+@async_router.get("/graph/queue", response_model=GraphWriteQueueStats)
+def get_graph_queue_stats() -> GraphWriteQueueStats:
+    return graph_write_queue.stats()
+
+
+@router.get("/graph/jobs/{job_id}", response_model=GraphWriteJob)
+@async_router.get("/graph/jobs/{job_id}", response_model=GraphWriteJob)
+def get_graph_job(job_id: str) -> GraphWriteJob:
+    job = graph_write_queue.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Unknown graph job {job_id}")
+    return job
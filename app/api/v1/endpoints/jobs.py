@@ -0,0 +1,113 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+
+from app.schemas.analysis_result import AnalysisJobResults, AnalysisJobStatus
+from app.schemas.data_ingestion import AnalysisJobRequest
+from app.services.analysis_jobs import analysis_jobs, iter_ndjson_posts
+from app.services.post_store import post_store
+from app.services.stream_analysis import spool_body
+
+router = APIRouter(tags=["jobs"])
+
+
+@router.post("/jobs", response_model=AnalysisJobStatus, status_code=202)
+def submit_analysis_job(request: AnalysisJobRequest) -> AnalysisJobStatus:
+    """
+    Queue a bulk analysis and return at once; poll /jobs/{job_id} for progress.
+    """
+    try:
+        return analysis_jobs.submit(
+            request.posts,
+            batch_size=request.batch_size,
+            persist_graph=request.persist_graph,
+            ner_backend=request.ner_backend,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@router.post("/jobs/upload", response_model=AnalysisJobStatus, status_code=202)
+async def upload_analysis_job(
+    request: Request,
+    batch_size: Optional[int] = Query(None, ge=1, le=10_000),
+    persist_graph: bool = True,
+    ner_backend: Optional[str] = None,
+) -> AnalysisJobStatus:
+    """
+    Queue a bulk analysis of an NDJSON body (one Post per line). The whole
+    file is rejected (422) if any line is not a valid post or the NER
+    backend is unknown.
+    """
+    spool = await spool_body(request.stream())
+    try:
+        return await run_in_threadpool(
+            analysis_jobs.submit, iter_ndjson_posts(spool),
+            batch_size=batch_size, persist_graph=persist_graph, ner_backend=ner_backend)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    finally:
+        spool.close()
+
+
+@router.post("/jobs/reanalyze", response_model=AnalysisJobStatus, status_code=202)
+def reanalyze_stored_posts(
+    platform: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    batch_size: Optional[int] = Query(None, ge=1, le=10_000),
+    persist_graph: bool = False,
+    ner_backend: Optional[str] = None,
+) -> AnalysisJobStatus:
+    """
+    Queue a bulk analysis of posts already in the Parquet post store, e.g.
+    after switching NER backends.
+    """
+    if not post_store.enabled:
+        raise HTTPException(status_code=503, detail="Post store is disabled (needs pyarrow)")
+    try:
+        return analysis_jobs.submit(
+            post_store.iter_posts(platform=platform, since=since, until=until),
+            batch_size=batch_size, persist_graph=persist_graph, ner_backend=ner_backend)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
+@router.get("/jobs/{job_id}", response_model=AnalysisJobStatus)
+def get_analysis_job(job_id: str) -> AnalysisJobStatus:
+    """
+    Progress of a job: posts done, throughput and ETA.
+    """
+    job = analysis_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/jobs/{job_id}/results", response_model=AnalysisJobResults)
+def get_analysis_job_results(
+    job_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+) -> AnalysisJobResults:
+    """
+    Analyzed posts in input order, from position `offset`. Follow
+    `next_offset` until it is null; pages fill in while the job runs.
+    """
+    page = analysis_jobs.results(job_id, offset=offset, limit=limit)
+    if page is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return page
+
+
+@router.post("/jobs/{job_id}/resume", response_model=AnalysisJobStatus)
+def resume_analysis_job(job_id: str) -> AnalysisJobStatus:
+    """
+    Retry a failed job from its last checkpoint.
+    """
+    job = analysis_jobs.resume(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -0,0 +1,77 @@
+import json
+from datetime import datetime
+from typing import Iterator, List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.schemas.analysis_result import AuthorProfile, StoredPost
+from app.services.post_repository import post_repository
+from app.services.post_store import post_store
+
+router = APIRouter(tags=["posts"])
+
+
+@router.get("/posts/export")
+def export_posts(
+    platform: Optional[str] = None,
+    since: Optional[datetime] = Query(None, description="Only posts at or after this time"),
+    until: Optional[datetime] = Query(None, description="Only posts before this time"),
+) -> StreamingResponse:
+    """
+    Stream the latest stored analysis of each post from the Parquet post
+    store as NDJSON, one PostAnalysis per line, without touching Neo4j.
+    """
+    if not post_store.enabled:
+        raise HTTPException(status_code=503, detail="Post store is disabled (needs pyarrow)")
+
+    def lines() -> Iterator[str]:
+        for item in post_store.iter_analyses(platform=platform, since=since, until=until):
+            yield item.model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@router.post("/posts/flush")
+def flush_posts() -> dict:
+    """Write buffered analyses to Parquet now instead of at the next interval."""
+    return {"rows_written": post_store.flush()}
+
+
+def _require_repository() -> None:
+    if not post_repository.enabled:
+        raise HTTPException(status_code=503, detail="Post repository is disabled (POST_REPOSITORY_ENABLED)")
+
+
+@router.get("/posts/copies", response_model=List[StoredPost])
+def get_post_copies(
+    text: str = Query(..., min_length=1),
+    limit: int = Query(100, ge=1, le=1000),
+) -> List[StoredPost]:
+    """Posts on any platform whose normalized text matches `text`, newest first."""
+    _require_repository()
+    return post_repository.copies(text, limit=limit)
+
+
+@router.get("/profiles/{platform}/{author}", response_model=AuthorProfile)
+def get_author_profile(platform: str, author: str) -> AuthorProfile:
+    _require_repository()
+    profile = post_repository.get_profile(platform, author)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Author not found")
+    return profile
+
+
+@router.get("/profiles/{platform}/{author}/posts", response_model=List[StoredPost])
+def get_author_posts(
+    platform: str,
+    author: str,
+    limit: int = Query(50, ge=1, le=1000),
+    before: Optional[float] = Query(None, description="posted_at of the last post of the previous page"),
+) -> List[StoredPost]:
+    """
+    An author's latest posts with their analyses, from the relational
+    repository rather than a graph scan.
+    """
+    _require_repository()
+    return post_repository.latest_posts(platform, author, limit=limit, before=before)
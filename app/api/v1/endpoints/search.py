@@ -0,0 +1,41 @@
+from typing import Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.schemas.analysis_result import SearchResponse
+from app.services.search_index import search_index
+
+router = APIRouter(tags=["search"])
+
+
+@router.get("/search", response_model=SearchResponse)
+def search_posts(
+    q: Optional[str] = Query(None, description="Keywords, all required; end one with * for a prefix"),
+    phrase: Optional[str] = Query(None, description="Exact phrase in the post text"),
+    entity: Optional[str] = Query(None, description="Entity text, e.g. Joko Widodo"),
+    label: Optional[str] = Query(None, description="Entity NER label, e.g. PERSON"),
+    platform: Optional[str] = None,
+    author: Optional[str] = None,
+    sort: Literal["relevance", "recent"] = "relevance",
+    limit: int = Query(20, ge=1, le=500),
+    offset: int = Query(0, ge=0, le=10_000),
+) -> SearchResponse:
+    """
+    Analyzed posts matching all the given criteria, by relevance (BM25 over
+    the newest SEARCH_RANK_WINDOW matches) or newest first. Follow
+    `next_offset` for more hits.
+    """
+    try:
+        return search_index.search(
+            q=q,
+            phrase=phrase,
+            entity=entity,
+            label=label,
+            platform=platform,
+            author=author,
+            sort=sort,
+            limit=limit,
+            offset=offset,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
@@ -1,14 +1,93 @@
-from fastapi import APIRouter
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from app.core.config import settings
 from app.schemas.data_ingestion import AnalyzeRequest
-from app.schemas.analysis_result import AnalysisResponse
-from app.services.nlp_service import analyze_posts, build_knowledge_graph
+from app.schemas.analysis_result import AnalysisResponse, AnalysisCacheStats, NERBackendInfo
+from app.services.nlp_service import analyze_posts, persist_knowledge_graph
+from app.services.analysis_cache import get_analysis_cache
+from app.services.graph_writer import GraphQueueFull
+from app.services.ner_backends import NERBackendError, get_ner_backend, list_ner_backends
+from app.services.stream_analysis import analyze_ndjson, iter_file_chunks, spool_body
 
 router = APIRouter(tags=["analysis"])
 
 
+def _check_ner_backend(name: Optional[str]) -> None:
+    try:
+        get_ner_backend(name)
+    except NERBackendError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+
 @router.post("/analyze", response_model=AnalysisResponse)
 def analyze(request: AnalyzeRequest) -> AnalysisResponse:
-    result = analyze_posts(request.posts)
-    # Build/update the knowledge graph from latest analysis
-    build_knowledge_graph(result)
+    _check_ner_backend(request.ner_backend)
+    result = analyze_posts(request.posts, ner_backend=request.ner_backend)
+    # Build/update the knowledge graph from latest analysis in the background
+    try:
+        result.graph_job_id = persist_knowledge_graph(result)
+    except GraphQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
     return result
+
+
+@router.post("/analyze/stream")
+async def analyze_stream(
+    request: Request,
+    batch_size: Optional[int] = Query(None, ge=1, le=10_000),
+    persist_graph: bool = True,
+    ner_backend: Optional[str] = None,
+) -> StreamingResponse:
+    """
+    Analyze an NDJSON body of posts (one Post per line) in micro-batches.
+
+    Responds with NDJSON: a {"kind": "post", ...PostAnalysis} line per post,
+    {"kind": "error", "line": n, "detail": ...} for rejected lines and a final
+    {"kind": "stats", ...AnalysisStats, "graph_job_ids": [...]} line. Each
+    batch is added to the knowledge graph (without clearing it) unless
+    persist_graph is false.
+    """
+    _check_ner_backend(ner_backend)
+    # The body must be consumed before the response starts: once it has,
+    # Starlette's disconnect listener owns receive()
+    spool = await spool_body(request.stream())
+    lines = analyze_ndjson(
+        iter_file_chunks(spool),
+        batch_size=batch_size or settings.analyze_stream_batch_size,
+        persist_graph=persist_graph,
+        ner_backend=ner_backend,
+    )
+    return StreamingResponse(
+        lines, media_type="application/x-ndjson", background=BackgroundTask(spool.close))
+
+
+@router.get("/analyze/cache", response_model=AnalysisCacheStats)
+def analysis_cache_stats() -> AnalysisCacheStats:
+    cache = get_analysis_cache()
+    if cache is None:
+        return AnalysisCacheStats(enabled=False)
+    return AnalysisCacheStats(enabled=True, **cache.stats())
+
+
+@router.get("/analyze/ner-backends", response_model=List[NERBackendInfo])
+def ner_backends() -> List[NERBackendInfo]:
+    """
+    NER backends a request can pick with `ner_backend`, fastest tiers first.
+    """
+    try:
+        default = get_ner_backend().name
+    except NERBackendError:
+        default = None
+    return [
+        NERBackendInfo(
+            name=b.name,
+            description=b.description,
+            posts_per_second=b.posts_per_second,
+            available=b.available(),
+            default=b.name == default,
+        )
+        for b in sorted(list_ner_backends(), key=lambda b: -b.posts_per_second)
+    ]
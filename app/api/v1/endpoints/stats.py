@@ -0,0 +1,46 @@
+from datetime import datetime
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app.schemas.analysis_result import SentimentStatsResponse
+from app.services.sentiment_stats import sentiment_stats
+
+router = APIRouter(tags=["stats"])
+
+
+@router.get("/stats", response_model=SentimentStatsResponse)
+def get_stats(
+    group_by: Literal["none", "platform", "author", "time"] = "platform",
+    bucket_seconds: int = Query(3600, ge=1),
+    window: int = Query(1, ge=1, le=10_000),
+    platform: Optional[str] = None,
+    author: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    top: int = Query(50, ge=1, le=1000),
+    bins: int = Query(20, ge=1, le=2000, description="Histogram bins; must divide 2000"),
+    percentiles: List[float] = Query([50, 90, 99]),
+) -> SentimentStatsResponse:
+    """
+    Sentiment counts, mean score, histogram and percentiles over every
+    analyzed post, per platform, per author (the `top` largest) or per time
+    bucket (the `top` latest, with a rolling mean over `window` buckets).
+    """
+    if any(not 0 <= q <= 100 for q in percentiles):
+        raise HTTPException(status_code=422, detail="percentiles must be between 0 and 100")
+    try:
+        return sentiment_stats.query(
+            group_by=group_by,
+            bucket_seconds=bucket_seconds,
+            window=window,
+            platform=platform,
+            author=author,
+            since=since,
+            until=until,
+            top=top,
+            bins=bins,
+            percentiles=percentiles,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
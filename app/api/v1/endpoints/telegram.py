@@ -0,0 +1,14 @@
+from fastapi import APIRouter
+
+from app.schemas.data_ingestion import TelegramIngestStats
+from app.services.telegram_ingest import telegram_ingest
+
+router = APIRouter(tags=["telegram"])
+
+
+@router.get("/telegram/ingest", response_model=TelegramIngestStats)
+def get_telegram_ingest_stats() -> TelegramIngestStats:
+    """
+    Status of the long-polling ingestion worker (offset, throughput, errors).
+    """
+    return telegram_ingest.stats()
@@ -1,10 +1,12 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, List, Optional
 
 from app.schemas.analysis_result import AnalysisResponse
 from app.services.data_fetcher import TwitterFetcher
-from app.services.nlp_service import analyze_posts, build_knowledge_graph
+from app.services.handle_cache import normalize_handle
+from app.services.nlp_service import analyze_posts, persist_knowledge_graph
+from app.services.graph_writer import GraphQueueFull
 
 router = APIRouter(tags=["twitter"])
 
@@ -12,6 +14,8 @@ router = APIRouter(tags=["twitter"])
 class TwitterFetchRequest(BaseModel):
     username: str
     limit: int = 10
+    # Only fetch tweets newer than the last ingested one for this account
+    incremental: bool = True
 
 
 class TwitterProfileResponse(BaseModel):
@@ -21,6 +25,17 @@ class TwitterProfileResponse(BaseModel):
     location: Optional[str]
 
 
+class TwitterResolveRequest(BaseModel):
+    usernames: List[str]
+    refresh: bool = False
+
+
+class TwitterResolveResponse(BaseModel):
+    # None marks handles that don't exist or are suspended
+    user_ids: Dict[str, Optional[str]]
+    unresolved: List[str]
+
+
 @router.post("/twitter/fetch", response_model=AnalysisResponse)
 def fetch_and_analyze_twitter(request: TwitterFetchRequest) -> AnalysisResponse:
     """
@@ -29,7 +44,13 @@ def fetch_and_analyze_twitter(request: TwitterFetchRequest) -> AnalysisResponse:
     fetcher = TwitterFetcher()
     
     # Fetch posts
-    posts = fetcher.fetch_posts(request.username, limit=request.limit)
+    if request.incremental:
+        posts = fetcher.fetch_new_posts(request.username, limit=request.limit, commit=False)
+        if not posts and fetcher.has_watermark(request.username):
+            # Nothing new since the last fetch
+            return analyze_posts([])
+    else:
+        posts = fetcher.fetch_posts(request.username, limit=request.limit)
     
     if not posts:
         raise HTTPException(
@@ -40,8 +61,16 @@ def fetch_and_analyze_twitter(request: TwitterFetchRequest) -> AnalysisResponse:
     # Analyze the posts
     result = analyze_posts(posts)
     
-    # Build knowledge graph
-    build_knowledge_graph(result, clear_existing=False)
+    # Build knowledge graph in the background; the watermark advances only
+    # once the tweets are in the graph, so a failed write refetches them
+    on_done = None
+    if request.incremental:
+        on_done = lambda: fetcher.commit_watermark(request.username, posts)
+    try:
+        result.graph_job_id = persist_knowledge_graph(
+            result, clear_existing=False, on_done=on_done)
+    except GraphQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
     
     return result
 
@@ -66,3 +95,19 @@ def get_twitter_profile(username: str) -> TwitterProfileResponse:
         name=profile.name,
         location=profile.location
     )
+
+
+@router.post("/twitter/resolve", response_model=TwitterResolveResponse)
+def resolve_twitter_handles(request: TwitterResolveRequest) -> TwitterResolveResponse:
+    """
+    Resolve a watchlist of handles to user ids in batched lookups.
+    Set `refresh` to bypass cached resolutions.
+    """
+    fetcher = TwitterFetcher()
+    user_ids = fetcher.resolve_user_ids(request.usernames, refresh=request.refresh)
+    unresolved = [
+        h for h in dict.fromkeys(normalize_handle(u) for u in request.usernames)
+        if h and h not in user_ids
+    ]
+    return TwitterResolveResponse(user_ids=user_ids, unresolved=unresolved)
+
@@ -0,0 +1,63 @@
+import json
+
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.schemas.data_ingestion import WhatsAppIngestStats
+from app.services.whatsapp_ingest import parse_webhook, verify_signature, whatsapp_ingest
+
+router = APIRouter(tags=["whatsapp"])
+
+
+@router.get("/whatsapp/webhook", response_class=PlainTextResponse)
+def verify_whatsapp_webhook(
+    mode: str = Query(None, alias="hub.mode"),
+    token: str = Query(None, alias="hub.verify_token"),
+    challenge: str = Query("", alias="hub.challenge"),
+) -> str:
+    """
+    Meta's webhook subscription handshake: echo the challenge if the verify token matches.
+    """
+    if mode != "subscribe" or not settings.whatsapp_verify_token or token != settings.whatsapp_verify_token:
+        raise HTTPException(status_code=403, detail="Webhook verification failed")
+    return challenge
+
+
+@router.post("/whatsapp/webhook")
+async def receive_whatsapp_webhook(request: Request) -> dict:
+    """
+    Receive Cloud API notifications. Messages are buffered durably and
+    acknowledged at once; analysis happens in the background worker.
+    Bodies are only accepted with a valid signature, so WHATSAPP_APP_SECRET
+    must be configured.
+    """
+    if not settings.whatsapp_app_secret:
+        raise HTTPException(status_code=403, detail="Webhook app secret not configured")
+    body = await request.body()
+    if not verify_signature(
+        body, request.headers.get("X-Hub-Signature-256"), settings.whatsapp_app_secret
+    ):
+        raise HTTPException(status_code=403, detail="Invalid webhook signature")
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Webhook body is not JSON")
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="Webhook body is not a JSON object")
+    try:
+        rows = parse_webhook(payload)
+    except (AttributeError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Malformed webhook payload")
+
+    buffered = await run_in_threadpool(whatsapp_ingest.append, rows)
+    return {"status": "ok", "buffered": buffered}
+
+
+@router.get("/whatsapp/ingest", response_model=WhatsAppIngestStats)
+def get_whatsapp_ingest_stats() -> WhatsAppIngestStats:
+    """
+    Status of the webhook buffer and its batch worker.
+    """
+    return whatsapp_ingest.stats()
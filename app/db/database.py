@@ -1,8 +1,44 @@
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from app.core.config import settings
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./data.db"
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+Base = declarative_base()
+# Tables of the relational post repository, which lives at
+# settings.database_url rather than in the local store
+RepositoryBase = declarative_base()
+
+
+def init_db(bind=None) -> None:
+    """Create any missing tables for the models in app.db.models."""
+    from app.db import models  # noqa: F401  (registers tables on Base)
+
+    Base.metadata.create_all(bind=bind or engine)
+
+
+def create_repository_engine(url=None):
+    """Pooled engine for settings.database_url (or ``url``)."""
+    url = url or settings.database_url
+    if url.startswith("sqlite"):
+        return create_engine(url, connect_args={"check_same_thread": False})
+    return create_engine(
+        url,
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+        pool_timeout=settings.database_pool_timeout,
+        pool_recycle=settings.database_pool_recycle,
+        # Drop connections the server closed while they sat in the pool
+        pool_pre_ping=True,
+    )
+
+
+def init_repository(bind) -> None:
+    """Create any missing repository tables (posts, profiles, analyses)."""
+    from app.db import models  # noqa: F401  (registers tables on RepositoryBase)
+
+    RepositoryBase.metadata.create_all(bind=bind)
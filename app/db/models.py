@@ -0,0 +1,180 @@
+from sqlalchemy import (
+    Boolean, Column, Float, Index, Integer, LargeBinary, String, Text, UniqueConstraint,
+)
+
+from app.db.database import Base, RepositoryBase
+
+
+class AnalysisCacheEntry(Base):
+    """On-disk tier of the content-hash analysis cache."""
+
+    __tablename__ = "analysis_cache"
+
+    key = Column(String(64), primary_key=True)
+    sentiment_label = Column(String(16), nullable=False)
+    sentiment_score = Column(Float, nullable=False)
+    entities = Column(Text, nullable=False)  # JSON list of [text, label]
+    created_at = Column(Float, nullable=False, index=True)
+
+
+class HttpCacheEntry(Base):
+    """Cached upstream API response for the platform fetchers."""
+
+    __tablename__ = "http_cache"
+
+    key = Column(String(64), primary_key=True)
+    endpoint = Column(String(255), nullable=False, index=True)
+    status_code = Column(Integer, nullable=False)
+    headers = Column(Text, nullable=False)  # JSON object
+    body = Column(LargeBinary, nullable=False)
+    etag = Column(String(255), nullable=True)
+    last_modified = Column(String(64), nullable=True)
+    stored_at = Column(Float, nullable=False)
+    expires_at = Column(Float, nullable=False, index=True)
+
+
+class TwitterHandleEntry(Base):
+    """Resolved Twitter handle -> user id; user_id NULL caches a miss."""
+
+    __tablename__ = "twitter_handles"
+
+    handle = Column(String(64), primary_key=True)  # lowercased, without "@"
+    user_id = Column(String(32), nullable=True)
+    resolved_at = Column(Float, nullable=False)
+    expires_at = Column(Float, nullable=False)
+
+
+class FetchWatermark(Base):
+    """Newest item already ingested for a tracked account on a platform."""
+
+    __tablename__ = "fetch_watermarks"
+
+    platform = Column(String(32), primary_key=True)
+    account = Column(String(255), primary_key=True)
+    since_id = Column(String(64), nullable=True)  # newest post/message id
+    since_ts = Column(Float, nullable=True)  # newest post time, epoch seconds
+    update_offset = Column(Integer, nullable=True)  # Telegram getUpdates offset
+    updated_at = Column(Float, nullable=False)
+
+
+class WhatsAppMessage(Base):
+    """Inbound WhatsApp message captured by the Cloud API webhook."""
+
+    __tablename__ = "whatsapp_messages"
+    __table_args__ = (
+        Index("ix_whatsapp_messages_sender_ts", "sender", "timestamp"),
+        Index("ix_whatsapp_messages_pending", "processed", "received_at"),
+    )
+
+    id = Column(String(128), primary_key=True)  # wamid; webhooks may redeliver
+    phone_number_id = Column(String(32), nullable=True)  # receiving business number
+    sender = Column(String(32), nullable=False)  # wa_id
+    sender_name = Column(String(255), nullable=True)
+    text = Column(Text, nullable=False)
+    timestamp = Column(Float, nullable=False)  # epoch seconds, from WhatsApp
+    received_at = Column(Float, nullable=False)
+    processed = Column(Boolean, nullable=False, default=False)
+
+
+class AnalysisJob(Base):
+    """A bulk analysis job; done_posts is the checkpoint it resumes from."""
+
+    __tablename__ = "analysis_jobs"
+
+    id = Column(String(32), primary_key=True)
+    status = Column(String(16), nullable=False, index=True)  # queued | running | done | failed
+    total_posts = Column(Integer, nullable=False)
+    done_posts = Column(Integer, nullable=False, default=0)
+    batch_size = Column(Integer, nullable=False)
+    persist_graph = Column(Boolean, nullable=False, default=True)
+    ner_backend = Column(String(32), nullable=True)  # None = deployment default
+    positive = Column(Integer, nullable=False, default=0)
+    neutral = Column(Integer, nullable=False, default=0)
+    negative = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    created_at = Column(Float, nullable=False)
+    # Start of the current run and the checkpoint it began at, for throughput
+    started_at = Column(Float, nullable=True)
+    start_offset = Column(Integer, nullable=False, default=0)
+    finished_at = Column(Float, nullable=True)
+
+
+class AnalysisJobItem(Base):
+    """One input post of an analysis job and, once analyzed, its result."""
+
+    __tablename__ = "analysis_job_items"
+
+    job_id = Column(String(32), primary_key=True)
+    seq = Column(Integer, primary_key=True)  # input order, from 0
+    post = Column(Text, nullable=False)  # Post JSON
+    result = Column(Text, nullable=True)  # PostAnalysis JSON
+
+
+class SearchDocument(Base):
+    """
+    A post in the full-text search index. The post_search FTS5 table indexes
+    text, entity_terms and entity_labels, kept in sync by triggers.
+    """
+
+    __tablename__ = "search_documents"
+    __table_args__ = (UniqueConstraint("platform", "post_id"),)
+
+    id = Column(Integer, primary_key=True)  # rowid in post_search
+    platform = Column(String(32), nullable=False)
+    post_id = Column(String(128), nullable=False)
+    author = Column(String(255), nullable=False)
+    text = Column(Text, nullable=False)
+    entities = Column(Text, nullable=False)  # JSON list of [text, label]
+    entity_terms = Column(Text, nullable=False)  # "PERSON Joko Widodo ; GPE Jakarta"
+    entity_labels = Column(Text, nullable=False)  # "PERSON GPE"
+    sentiment_label = Column(String(16), nullable=False)
+    sentiment_score = Column(Float, nullable=False)
+    posted_at = Column(Float, nullable=False)  # epoch seconds; analysis time if no timestamp
+
+
+class PostRecord(RepositoryBase):
+    """A post in the relational repository; re-ingesting it updates the row."""
+
+    __tablename__ = "posts"
+    __table_args__ = (
+        # Latest posts by author, and by platform via the leading column
+        Index("ix_posts_platform_author_posted", "platform", "author", "posted_at"),
+    )
+
+    platform = Column(String(32), primary_key=True)
+    id = Column(String(128), primary_key=True)
+    author = Column(String(255), nullable=False)
+    author_id = Column(String(64), nullable=True)
+    text = Column(Text, nullable=False)
+    text_hash = Column(String(64), nullable=False, index=True)  # SHA-256 of the normalized text
+    url = Column(Text, nullable=True)
+    timestamp = Column(String(64), nullable=True)  # as the platform sent it
+    posted_at = Column(Float, nullable=False)  # epoch seconds; ingestion time if no timestamp
+    ingested_at = Column(Float, nullable=False)
+
+
+class AuthorProfileRecord(RepositoryBase):
+    """An author seen in ingested posts, per platform."""
+
+    __tablename__ = "author_profiles"
+
+    platform = Column(String(32), primary_key=True)
+    author = Column(String(255), primary_key=True)
+    author_id = Column(String(64), nullable=True, index=True)
+    first_seen_at = Column(Float, nullable=False)
+    last_post_at = Column(Float, nullable=True)  # newest posted_at ingested
+    updated_at = Column(Float, nullable=False)
+
+
+class PostAnalysisRecord(RepositoryBase):
+    """Latest analysis of a post."""
+
+    __tablename__ = "post_analyses"
+
+    platform = Column(String(32), primary_key=True)
+    post_id = Column(String(128), primary_key=True)
+    sentiment_label = Column(String(16), nullable=False, index=True)
+    sentiment_score = Column(Float, nullable=False)
+    entities = Column(Text, nullable=False)  # JSON list of [text, label]
+    ner_backend = Column(String(32), nullable=True)
+    analyzed_at = Column(Float, nullable=False)
@@ -0,0 +1,35 @@
+import threading
+
+from app.db.database import SessionLocal, init_db
+
+
+class SQLiteStore:
+    """
+    Base for services that keep their state in the local SQLite database.
+
+    Tables are created on first use rather than at import, so constructing a
+    store is free and tests can point one at their own engine via
+    ``session_factory``/``bind``.
+    """
+
+    def __init__(self, session_factory=None, bind=None):
+        self._session_factory = session_factory or SessionLocal
+        self._bind = bind
+        self._tables_ready = False
+        self._tables_lock = threading.Lock()
+
+    def _ensure_tables(self) -> None:
+        if not self._tables_ready:
+            with self._tables_lock:
+                if not self._tables_ready:
+                    self._create_tables()
+                    self._tables_ready = True
+
+    def _create_tables(self) -> None:
+        """Create missing tables; stores with extra DDL (triggers, FTS) extend this."""
+        init_db(self._bind)
+
+    def _session(self):
+        """Open a session, creating the tables first if needed."""
+        self._ensure_tables()
+        return self._session_factory()
@@ -1,18 +1,48 @@
+import threading
+import time
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.core.config import settings
-from app.api.v1.endpoints.sentiment import router as sentiment_router
-from app.api.v1.endpoints.graph import router as graph_router
-from app.api.v1.endpoints.twitter import router as twitter_router
+from app.api.v1.endpoints import (
+    sentiment, graph, jobs, posts, search, stats, twitter, telegram, whatsapp,
+)
 from app.services.graph_service import graph_service
+from app.services.analysis_jobs import analysis_jobs
+from app.services.async_graph_service import async_graph_service
+from app.services.graph_writer import graph_write_queue
+from app.services import nlp_service
+from app.services.nlp_executor import shutdown_executor
+from app.services.post_repository import post_repository
+from app.services.post_store import post_store
+from app.services.search_index import search_index
+from app.services.sentiment_stats import sentiment_stats
+from app.services.telegram_ingest import telegram_ingest
+from app.services.whatsapp_ingest import whatsapp_ingest
+
+
+def _seed_stats() -> None:
+    """Rebuild the in-memory /stats arrays from the Parquet post store."""
+    started = time.perf_counter()
+    columns = ["platform", "post_id", "author", "sentiment_label", "sentiment_score", "time"]
+    try:
+        loaded = sentiment_stats.load(post_store.scan(columns=columns))
+    except Exception as e:
+        print(f"⚠️ Could not seed stats from the post store: {e}")
+        return
+    print(f"✅ Seeded stats with {loaded} stored analyses in {time.perf_counter() - started:.2f}s")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler for startup and shutdown events."""
     # Startup
+    started = time.perf_counter()
+    if settings.nlp_warmup:
+        # Serve /health at once; /ready reports when the models are in
+        threading.Thread(target=nlp_service.load_models, name="nlp-warmup", daemon=True).start()
     try:
         if graph_service.verify_connectivity():
             graph_service.init_constraints()
@@ -21,11 +51,40 @@ async def lifespan(app: FastAPI):
             print("⚠️ Neo4j connection failed - graph features will not work")
     except Exception as e:
         print(f"⚠️ Neo4j initialization error: {e}")
+    graph_write_queue.start()
+    if post_store.enabled:
+        post_store.start()
+        if settings.stats_enabled:
+            threading.Thread(target=_seed_stats, name="stats-seed", daemon=True).start()
+    if settings.search_enabled:
+        search_index.start()
+    resumed = analysis_jobs.start()
+    if resumed:
+        print(f"✅ Resumed {resumed} analysis job(s)")
+    if settings.telegram_ingest_enabled:
+        telegram_ingest.start()
+    if settings.whatsapp_ingest_enabled:
+        whatsapp_ingest.start()
+    print(f"✅ Startup finished in {time.perf_counter() - started:.2f}s")
     
     yield
     
     # Shutdown
+    # An interrupted poll is redelivered on restart (offset not yet stored)
+    telegram_ingest.stop(timeout=5)
+    # Unprocessed webhook messages stay buffered for the next start
+    whatsapp_ingest.stop(timeout=5)
+    # Unfinished jobs resume from their last checkpoint on the next start
+    analysis_jobs.stop()
+    # Writes out whatever analyses are still buffered
+    post_store.stop()
+    search_index.stop()
+    post_repository.close()
+    graph_write_queue.stop()
+    print("✅ Graph write queue drained")
+    shutdown_executor()
     graph_service.close()
+    await async_graph_service.close()
     print("✅ Neo4j connection closed")
 
 
@@ -39,11 +98,33 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.include_router(sentiment_router, prefix="/api/v1")
-app.include_router(graph_router, prefix="/api/v1")
-app.include_router(twitter_router, prefix="/api/v1")
+# NEO4J_ASYNC=true serves the graph read routes on the async Neo4j driver
+for router in (
+    sentiment.router,
+    jobs.router,
+    stats.router,
+    posts.router,
+    search.router,
+    graph.async_router if settings.neo4j_async else graph.router,
+    twitter.router,
+    telegram.router,
+    whatsapp.router,
+):
+    app.include_router(router, prefix="/api/v1")
 
 
 @app.get("/health")
 def health():
     return {"status": "ok"}
+
+
+@app.get("/ready")
+def ready():
+    """Readiness: 503 until the NLP models are loaded (when warming up at startup)."""
+    if settings.nlp_warmup and not nlp_service.models_ready():
+        return JSONResponse(status_code=503, content={"status": "loading"})
+    return {
+        "status": "ready",
+        "models_loaded": nlp_service.models_ready(),
+        "model_load_seconds": nlp_service.model_load_seconds,
+    }
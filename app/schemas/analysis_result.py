@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List
+from typing import Dict, List, Optional
 
 
 class NEREntity(BaseModel):
@@ -31,6 +31,7 @@ class AnalysisStats(BaseModel):
 class AnalysisResponse(BaseModel):
     items: List[PostAnalysis]
     stats: AnalysisStats
+    graph_job_id: Optional[str] = None  # poll /graph/jobs/{id} for persistence
 
 
 class GraphNode(BaseModel):
@@ -48,3 +49,132 @@ class GraphEdge(BaseModel):
 class GraphResponse(BaseModel):
     nodes: List[GraphNode]
     edges: List[GraphEdge]
+
+
+class AnalysisCacheStats(BaseModel):
+    enabled: bool
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    hit_rate: float = 0.0
+    size: int = 0
+    max_size: int = 0
+
+
+class NERBackendInfo(BaseModel):
+    name: str
+    description: str
+    posts_per_second: int  # nominal, single core
+    available: bool
+    default: bool
+
+
+class StatsGroup(BaseModel):
+    key: str  # platform, author, "all", or the UTC start of a time bucket
+    count: int
+    positive: int
+    neutral: int
+    negative: int
+    mean_score: float
+    rolling_mean: Optional[float] = None  # time buckets: over the trailing `window` buckets
+    percentiles: Dict[str, float]  # "p50" -> score, to 0.001
+    histogram: List[int]  # counts per bin of histogram_edges
+
+
+class SentimentStatsResponse(BaseModel):
+    group_by: str
+    total_posts: int  # matching the filters
+    histogram_edges: List[float]
+    groups: List[StatsGroup]
+    elapsed_ms: float
+
+
+class GraphNodePage(BaseModel):
+    nodes: List[GraphNode]
+    next_cursor: Optional[str] = None
+
+
+class GraphEdgePage(BaseModel):
+    edges: List[GraphEdge]
+    next_cursor: Optional[str] = None
+
+
+class GraphWriteJob(BaseModel):
+    job_id: str
+    status: str  # queued | running | done | failed | superseded (cleared by a later job)
+    posts: int
+    enqueued_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+
+
+class GraphWriteQueueStats(BaseModel):
+    depth: int
+    capacity: int
+    lag_seconds: float
+    processed_jobs: int
+    failed_jobs: int
+    batches: int
+
+
+class AnalysisJobStatus(BaseModel):
+    job_id: str
+    status: str  # queued | running | done | failed
+    total_posts: int
+    done_posts: int
+    stats: AnalysisStats  # over the posts done so far
+    posts_per_second: float = 0.0  # in the current run
+    eta_seconds: Optional[float] = None
+    error: Optional[str] = None
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+
+class AnalysisJobResults(BaseModel):
+    job_id: str
+    items: List[PostAnalysis]
+    next_offset: Optional[int] = None  # pass as offset for the next page
+
+
+class StoredPost(BaseModel):
+    """A post from the relational repository, with its latest analysis."""
+    id: str
+    platform: str
+    author: str
+    author_id: Optional[str] = None
+    text: str
+    timestamp: Optional[str] = None
+    url: Optional[str] = None
+    posted_at: Optional[float] = None  # epoch seconds
+    sentiment: Optional[SentimentResult] = None  # None until analyzed
+    entities: List[NEREntity] = []
+
+
+class AuthorProfile(BaseModel):
+    platform: str
+    author: str
+    author_id: Optional[str] = None
+    post_count: int
+    first_seen_at: float
+    last_post_at: Optional[float] = None
+
+
+class SearchHit(BaseModel):
+    post_id: str
+    platform: str
+    author: str
+    text: str
+    snippet: str  # text with matched terms in [brackets]
+    sentiment: SentimentResult
+    entities: List[NEREntity]
+    posted_at: float  # epoch seconds
+    score: float  # BM25 relevance, higher is better
+
+
+class SearchResponse(BaseModel):
+    query: str  # the FTS5 expression that was run
+    hits: List[SearchHit]
+    next_offset: Optional[int] = None  # None once there are no more hits
+    elapsed_ms: float
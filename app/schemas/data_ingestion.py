@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import Callable, Optional, List
 
 
 class Post(BaseModel):
@@ -33,3 +33,50 @@ class UserProfile(BaseModel):
 
 class AnalyzeRequest(BaseModel):
     posts: List[Post] = Field(default_factory=list)
+    ner_backend: Optional[str] = None  # see GET /analyze/ner-backends; None = deployment default
+
+
+class AnalysisJobRequest(AnalyzeRequest):
+    batch_size: Optional[int] = Field(None, ge=1, le=10_000)
+    persist_graph: bool = True
+
+
+class PlatformFetchStatus(BaseModel):
+    platform: str
+    user_id: str
+    status: str  # ok | error | timeout | unsupported
+    posts: int = 0
+    elapsed_ms: float = 0.0
+    error: Optional[str] = None
+
+
+class MultiFetchResult(BaseModel):
+    posts: List[Post] = Field(default_factory=list)
+    platforms: List[PlatformFetchStatus] = Field(default_factory=list)
+    # Watermark advances for incremental fetches that finished in time
+    _watermark_commits: List[Callable[[], None]] = PrivateAttr(default_factory=list)
+
+    def commit_watermarks(self) -> None:
+        """Advance the watermarks of every account fetched; call once the posts are processed."""
+        commits, self._watermark_commits = self._watermark_commits, []
+        for commit in commits:
+            commit()
+
+
+class TelegramIngestStats(BaseModel):
+    running: bool
+    offset: Optional[int] = None  # next getUpdates offset
+    updates: int = 0
+    messages: int = 0
+    chats: int = 0
+    errors: int = 0
+    last_poll_at: Optional[float] = None
+
+
+class WhatsAppIngestStats(BaseModel):
+    running: bool
+    pending: int = 0  # buffered, not yet analyzed
+    received: int = 0
+    processed: int = 0
+    batches: int = 0
+    errors: int = 0
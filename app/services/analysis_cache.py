@@ -0,0 +1,236 @@
+"""
+Content-hash cache for per-text analysis results.
+
+Feeds repeat the same text constantly (retweets, forwards, copy-paste), so
+sentiment and entities are cached under a SHA-256 of the exact text (a
+whitespace or Unicode variant is a different key, since its entity strings
+differ).
+Lookups go through an in-process LRU tier with TTL and a size cap, then an
+optional SQLite tier in the local store, before anything is scored.
+"""
+import hashlib
+import json
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.dialects.sqlite import insert
+
+from app.core.config import settings
+from app.db.models import AnalysisCacheEntry
+from app.db.store import SQLiteStore
+from app.schemas.analysis_result import SentimentResult
+from app.services.ner_backends import Entity
+
+# (sentiment, entities) for one text
+CachedAnalysis = Tuple[SentimentResult, List[Entity]]
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form used for hashing: NFC, trimmed, single-spaced."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def text_key(text: str, ner_backend: str = "") -> str:
+    """
+    Cache key of a text; entities differ per NER backend, so it's part of the key.
+
+    The text is not normalized: entities are returned as spans of the text,
+    so a variant sharing the key would get the other variant's strings.
+    """
+    return hashlib.sha256(f"{ner_backend}\0{text}".encode("utf-8")).hexdigest()
+
+
+class MemoryTier:
+    """Thread-safe LRU with per-entry TTL."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, CachedAnalysis]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Optional[CachedAnalysis]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if self.ttl and time.time() - stored_at > self.ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: CachedAnalysis, stored_at: Optional[float] = None) -> None:
+        with self._lock:
+            self._data[key] = (stored_at or time.time(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class SQLiteTier(SQLiteStore):
+    """Persistent tier backed by the analysis_cache table."""
+
+    # Keep IN (...) lists under SQLite's bound-parameter limit
+    _LOOKUP_CHUNK = 500
+    _PRUNE_EVERY = 1000
+
+    def __init__(self, max_size: int, ttl: float, session_factory=None, bind=None):
+        super().__init__(session_factory, bind)
+        self._ensure_tables()
+        self.max_size = max_size
+        self.ttl = ttl
+        self._writes = 0
+
+    def get_many(self, keys: List[str]) -> Dict[str, Tuple[float, CachedAnalysis]]:
+        found: Dict[str, Tuple[float, CachedAnalysis]] = {}
+        oldest = time.time() - self.ttl if self.ttl else 0
+        with self._session_factory() as db:
+            for i in range(0, len(keys), self._LOOKUP_CHUNK):
+                rows = db.query(AnalysisCacheEntry).filter(
+                    AnalysisCacheEntry.key.in_(keys[i:i + self._LOOKUP_CHUNK]),
+                    AnalysisCacheEntry.created_at >= oldest,
+                )
+                for row in rows:
+                    found[row.key] = (row.created_at, (
+                        SentimentResult(label=row.sentiment_label, score=row.sentiment_score),
+                        [(t, l) for t, l in json.loads(row.entities)],
+                    ))
+        return found
+
+    def put_many(self, items: Dict[str, CachedAnalysis]) -> None:
+        if not items:
+            return
+        now = time.time()
+        rows = [
+            {
+                "key": key,
+                "sentiment_label": sentiment.label,
+                "sentiment_score": sentiment.score,
+                "entities": json.dumps(entities),
+                "created_at": now,
+            }
+            for key, (sentiment, entities) in items.items()
+        ]
+        stmt = insert(AnalysisCacheEntry)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["key"],
+            set_={c: stmt.excluded[c] for c in rows[0] if c != "key"},
+        )
+        with self._session_factory() as db:
+            db.execute(stmt, rows)
+            self._writes += len(rows)
+            if self._writes >= self._PRUNE_EVERY:
+                self._writes = 0
+                self._prune(db, now)
+            db.commit()
+
+    def _prune(self, db, now: float) -> None:
+        if self.ttl:
+            db.query(AnalysisCacheEntry).filter(
+                AnalysisCacheEntry.created_at < now - self.ttl
+            ).delete(synchronize_session=False)
+        newest = db.query(AnalysisCacheEntry.key).order_by(
+            AnalysisCacheEntry.created_at.desc()).limit(self.max_size)
+        db.query(AnalysisCacheEntry).filter(
+            AnalysisCacheEntry.key.not_in(newest.scalar_subquery())
+        ).delete(synchronize_session=False)
+
+    def clear(self) -> None:
+        with self._session_factory() as db:
+            db.query(AnalysisCacheEntry).delete()
+            db.commit()
+
+
+class AnalysisCache:
+    """Two-tier (memory, optional SQLite) cache with hit-rate accounting."""
+
+    def __init__(self, max_size: int, ttl: float, disk: Optional[SQLiteTier] = None):
+        self.memory = MemoryTier(max_size, ttl)
+        self.disk = disk
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, CachedAnalysis]:
+        """
+        Cached values for ``keys``. Accounting is per key occurrence: the
+        first miss of a key is a miss, its repeats in the same batch are hits
+        since they won't be scored again.
+        """
+        keys = list(keys)
+        found: Dict[str, CachedAnalysis] = {}
+        missing: List[str] = []
+        for key in dict.fromkeys(keys):
+            value = self.memory.get(key)
+            if value is not None:
+                found[key] = value
+            else:
+                missing.append(key)
+
+        disk_found = 0
+        if missing and self.disk is not None:
+            for key, (stored_at, value) in self.disk.get_many(missing).items():
+                self.memory.put(key, value, stored_at=stored_at)
+                found[key] = value
+                disk_found += 1
+
+        misses = len(missing) - disk_found
+        with self._lock:
+            self.hits += len(keys) - misses
+            self.disk_hits += disk_found
+            self.misses += misses
+        return found
+
+    def put_many(self, items: Dict[str, CachedAnalysis]) -> None:
+        for key, value in items.items():
+            self.memory.put(key, value)
+        if self.disk is not None:
+            self.disk.put_many(items)
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self.memory),
+            "max_size": self.memory.max_size,
+        }
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+        with self._lock:
+            self.hits = self.disk_hits = self.misses = 0
+
+
+_cache: Optional[AnalysisCache] = None
+
+
+def get_analysis_cache() -> Optional[AnalysisCache]:
+    """Return the process-wide cache, or None when caching is disabled."""
+    global _cache
+    if not settings.analysis_cache_enabled:
+        return None
+    if _cache is None:
+        disk = None
+        if settings.analysis_cache_disk:
+            disk = SQLiteTier(settings.analysis_cache_size, settings.analysis_cache_ttl)
+        _cache = AnalysisCache(
+            settings.analysis_cache_size, settings.analysis_cache_ttl, disk=disk)
+    return _cache
@@ -0,0 +1,297 @@
+"""
+Bulk analysis jobs.
+
+A job's input posts are stored in the local SQLite store when it is
+submitted, and the job is analyzed on a small thread pool in batches of
+``batch_size`` posts. Each batch's results and the job's progress counter
+(``done_posts``) are committed in one transaction, so that counter is the
+checkpoint a job resumes from: jobs that were queued or running when the
+process stopped are picked up again on the next start() without redoing
+finished batches. Results are read back in pages by input position.
+"""
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Callable, Iterable, Iterator, List, Optional
+
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.db.models import AnalysisJob, AnalysisJobItem
+from app.db.store import SQLiteStore
+from app.schemas.analysis_result import (
+    AnalysisJobResults,
+    AnalysisJobStatus,
+    AnalysisResponse,
+    AnalysisStats,
+    PostAnalysis,
+)
+from app.schemas.data_ingestion import Post
+from app.services.ner_backends import get_ner_backend
+from app.services.nlp_service import analyze_posts, persist_knowledge_graph
+
+logger = logging.getLogger(__name__)
+
+# Input rows inserted per executemany while a job is created
+_INSERT_CHUNK = 1000
+# Job states a restart resumes; "running" means the process died mid-job
+_RESUMABLE = ("queued", "running")
+
+
+def iter_ndjson_posts(f: IO[bytes]) -> Iterator[Post]:
+    """
+    Parse an NDJSON file of posts, skipping blank lines.
+
+    Raises:
+        ValueError: a line is not a valid Post (the message names the line)
+    """
+    for lineno, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield Post.model_validate_json(line)
+        except ValidationError as e:
+            raise ValueError(f"line {lineno}: {e.errors()[0]['msg']}")
+
+
+class AnalysisJobManager(SQLiteStore):
+    """Durable job table plus the worker pool that runs the jobs."""
+
+    def __init__(
+        self,
+        session_factory=None,
+        bind=None,
+        workers: Optional[int] = None,
+        analyze: Callable[..., AnalysisResponse] = analyze_posts,
+        persist: Callable[..., str] = persist_knowledge_graph,
+    ):
+        super().__init__(session_factory, bind)
+        self.workers = workers or settings.analysis_job_workers
+        self._analyze = analyze
+        self._persist = persist
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    def start(self) -> int:
+        """Start the pool and requeue unfinished jobs; returns how many."""
+        with self._lock:
+            self._stopping.clear()
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="analysis-job")
+            pool = self._pool
+        with self._session() as db:
+            job_ids = [
+                job_id for (job_id,) in db.query(AnalysisJob.id)
+                .filter(AnalysisJob.status.in_(_RESUMABLE))
+                .order_by(AnalysisJob.created_at)
+            ]
+        for job_id in job_ids:
+            pool.submit(self._run_job, job_id)
+        return len(job_ids)
+
+    def stop(self) -> None:
+        """
+        Stop after the in-flight batches. Jobs keep their checkpoint and
+        status, and resume on the next start().
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is None:
+            return
+        self._stopping.set()
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    def submit(
+        self,
+        posts: Iterable[Post],
+        batch_size: Optional[int] = None,
+        persist_graph: bool = True,
+        ner_backend: Optional[str] = None,
+    ) -> AnalysisJobStatus:
+        """
+        Store a job's posts and queue it.
+
+        Raises:
+            ValueError: ``posts`` raised it while being read, or ``ner_backend``
+                is unknown or not installed (nothing is stored)
+        """
+        get_ner_backend(ner_backend)
+        job_id = uuid.uuid4().hex
+        total = 0
+        with self._session() as db:
+            chunk: List[dict] = []
+            for post in posts:
+                chunk.append({"job_id": job_id, "seq": total, "post": post.model_dump_json()})
+                total += 1
+                if len(chunk) >= _INSERT_CHUNK:
+                    db.bulk_insert_mappings(AnalysisJobItem, chunk)
+                    chunk = []
+            if chunk:
+                db.bulk_insert_mappings(AnalysisJobItem, chunk)
+            job = AnalysisJob(
+                id=job_id,
+                status="queued" if total else "done",
+                total_posts=total,
+                done_posts=0,
+                batch_size=batch_size or settings.analysis_job_batch_size,
+                persist_graph=persist_graph,
+                ner_backend=ner_backend,
+                positive=0,
+                neutral=0,
+                negative=0,
+                created_at=time.time(),
+                start_offset=0,
+                finished_at=None if total else time.time(),
+            )
+            db.add(job)
+            db.commit()
+            status = self._status(job)
+        if total:
+            self._enqueue(job_id)
+        return status
+
+    def resume(self, job_id: str) -> Optional[AnalysisJobStatus]:
+        """Requeue a failed job from its checkpoint."""
+        with self._session() as db:
+            job = db.get(AnalysisJob, job_id)
+            if job is None:
+                return None
+            if job.status == "failed":
+                job.status = "queued"
+                job.error = None
+                db.commit()
+                self._enqueue(job_id)
+            return self._status(job)
+
+    def get(self, job_id: str) -> Optional[AnalysisJobStatus]:
+        with self._session() as db:
+            job = db.get(AnalysisJob, job_id)
+            return self._status(job) if job else None
+
+    def results(self, job_id: str, offset: int = 0, limit: int = 100) -> Optional[AnalysisJobResults]:
+        """Analyzed posts from input position ``offset`` on, in input order."""
+        with self._session() as db:
+            job = db.get(AnalysisJob, job_id)
+            if job is None:
+                return None
+            rows = (
+                db.query(AnalysisJobItem.seq, AnalysisJobItem.result)
+                .filter(
+                    AnalysisJobItem.job_id == job_id,
+                    AnalysisJobItem.seq >= offset,
+                    AnalysisJobItem.seq < job.done_posts,
+                )
+                .order_by(AnalysisJobItem.seq)
+                .limit(limit)
+                .all()
+            )
+            total = job.total_posts
+        items = [PostAnalysis.model_validate_json(result) for _, result in rows]
+        next_offset = rows[-1].seq + 1 if rows else offset
+        # Past done_posts the next page fills in as the job progresses
+        return AnalysisJobResults(
+            job_id=job_id,
+            items=items,
+            next_offset=next_offset if next_offset < total else None,
+        )
+
+    def _enqueue(self, job_id: str) -> None:
+        with self._lock:
+            if self._pool is None:
+                # Picked up by the next start()
+                return
+            self._pool.submit(self._run_job, job_id)
+
+    def _run_job(self, job_id: str) -> None:
+        with self._session() as db:
+            job = db.get(AnalysisJob, job_id)
+            if job is None or job.status not in _RESUMABLE:
+                return
+            job.status = "running"
+            job.started_at = time.time()
+            job.start_offset = job.done_posts
+            db.commit()
+        try:
+            while not self._stopping.is_set():
+                if not self._run_batch(job_id):
+                    return
+        except Exception as e:
+            logger.error(f"Analysis job {job_id} failed: {e}")
+            with self._session() as db:
+                job = db.get(AnalysisJob, job_id)
+                if job is None:
+                    return
+                job.status = "failed"
+                job.error = str(e)
+                job.finished_at = time.time()
+                db.commit()
+
+    def _run_batch(self, job_id: str) -> bool:
+        """Analyze and checkpoint the next batch; False once the job is done."""
+        with self._session() as db:
+            job = db.get(AnalysisJob, job_id)
+            if job is None:
+                return False
+            rows = (
+                db.query(AnalysisJobItem)
+                .filter(AnalysisJobItem.job_id == job_id, AnalysisJobItem.seq >= job.done_posts)
+                .order_by(AnalysisJobItem.seq)
+                .limit(job.batch_size)
+                .all()
+            )
+            if not rows:
+                job.status = "done"
+                job.finished_at = time.time()
+                db.commit()
+                return False
+
+            result = self._analyze(
+                [Post.model_validate_json(row.post) for row in rows], ner_backend=job.ner_backend)
+            # A crash before the commit below redoes this batch; graph writes MERGE
+            if job.persist_graph:
+                self._persist(result, clear_existing=False)
+            for row, item in zip(rows, result.items):
+                row.result = item.model_dump_json()
+            job.done_posts += len(rows)
+            job.positive += result.stats.positive
+            job.neutral += result.stats.neutral
+            job.negative += result.stats.negative
+            db.commit()
+        return True
+
+    @staticmethod
+    def _status(job: AnalysisJob) -> AnalysisJobStatus:
+        rate = 0.0
+        eta = None
+        if job.status == "running" and job.started_at:
+            elapsed = time.time() - job.started_at
+            if elapsed > 0:
+                rate = (job.done_posts - job.start_offset) / elapsed
+            if rate > 0:
+                eta = (job.total_posts - job.done_posts) / rate
+        return AnalysisJobStatus(
+            job_id=job.id,
+            status=job.status,
+            total_posts=job.total_posts,
+            done_posts=job.done_posts,
+            stats=AnalysisStats(
+                total_posts=job.done_posts,
+                positive=job.positive,
+                neutral=job.neutral,
+                negative=job.negative,
+            ),
+            posts_per_second=rate,
+            eta_seconds=eta,
+            error=job.error,
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+        )
+
+
+analysis_jobs = AnalysisJobManager()
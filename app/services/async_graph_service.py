@@ -0,0 +1,159 @@
+"""
+Async Neo4j Graph Service built on AsyncGraphDatabase.
+
+Mirrors the read API of Neo4jGraphService for use from ``async def`` graph
+routes, so concurrent graph requests are bounded by the driver's connection
+pool rather than by FastAPI's threadpool. Cypher and the pagination walk are
+shared with the sync service; writes go through the graph write queue.
+"""
+from contextlib import asynccontextmanager
+from typing import List, Optional, Tuple
+
+from neo4j import AsyncDriver, AsyncGraphDatabase
+from neo4j.exceptions import ServiceUnavailable
+
+from app.core.config import settings
+from app.schemas.analysis_result import GraphEdge, GraphNode, GraphResponse
+from app.services.graph_service import (
+    EdgePager,
+    NodePager,
+    graph_from_record,
+    node_query,
+    shortest_path_query,
+    subgraph_query,
+)
+
+
+class AsyncNeo4jGraphService:
+    """Async counterpart of Neo4jGraphService."""
+
+    _driver: Optional[AsyncDriver] = None
+
+    @classmethod
+    def get_driver(cls) -> AsyncDriver:
+        """Get or create the async Neo4j driver instance."""
+        if cls._driver is None:
+            cls._driver = AsyncGraphDatabase.driver(
+                settings.neo4j_uri,
+                auth=(settings.neo4j_user, settings.neo4j_password),
+                max_connection_pool_size=settings.neo4j_max_connection_pool_size,
+            )
+        return cls._driver
+
+    @classmethod
+    async def close(cls) -> None:
+        """Close the async Neo4j driver connection."""
+        if cls._driver is not None:
+            await cls._driver.close()
+            cls._driver = None
+
+    @classmethod
+    @asynccontextmanager
+    async def get_session(cls):
+        """Async context manager for a Neo4j session."""
+        session = cls.get_driver().session(database=settings.neo4j_database)
+        try:
+            yield session
+        finally:
+            await session.close()
+
+    @classmethod
+    async def verify_connectivity(cls) -> bool:
+        """Verify Neo4j connection is working."""
+        try:
+            await cls.get_driver().verify_connectivity()
+            return True
+        except ServiceUnavailable:
+            return False
+
+    @classmethod
+    async def get_nodes_page(
+        cls,
+        limit: int = 500,
+        cursor: Optional[str] = None,
+        node_type: Optional[str] = None,
+        label: Optional[str] = None,
+    ) -> Tuple[List[GraphNode], Optional[str]]:
+        """Async version of Neo4jGraphService.get_nodes_page."""
+        pager = NodePager(limit, cursor, node_type, label)
+        async with cls.get_session() as session:
+            for node_label, query, params in pager.steps():
+                result = await session.run(query, **params)
+                pager.add(node_label, [record async for record in result])
+        return pager.nodes, pager.next_cursor
+
+    @classmethod
+    async def get_edges_page(
+        cls,
+        limit: int = 500,
+        cursor: Optional[str] = None,
+        rel_type: Optional[str] = None,
+    ) -> Tuple[List[GraphEdge], Optional[str]]:
+        """Async version of Neo4jGraphService.get_edges_page."""
+        pager = EdgePager(limit, cursor, rel_type)
+        async with cls.get_session() as session:
+            for node_label, query, params in pager.steps():
+                result = await session.run(query, **params)
+                pager.add(node_label, [record async for record in result])
+        return pager.edges, pager.next_cursor
+
+    @classmethod
+    async def get_graph_response(cls) -> GraphResponse:
+        """Retrieve the entire graph; prefer the paged methods for large graphs."""
+        nodes: List[GraphNode] = []
+        edges: List[GraphEdge] = []
+        cursor = None
+        while True:
+            page, cursor = await cls.get_nodes_page(limit=1000, cursor=cursor)
+            nodes.extend(page)
+            if cursor is None:
+                break
+        while True:
+            page, cursor = await cls.get_edges_page(limit=1000, cursor=cursor)
+            edges.extend(page)
+            if cursor is None:
+                break
+        return GraphResponse(nodes=nodes, edges=edges)
+
+    @classmethod
+    async def get_subgraph(
+        cls,
+        node_id: str,
+        depth: int = 2,
+        limit: int = 500,
+        fanout: int = 50,
+        rel_types: Optional[List[str]] = None,
+    ) -> Optional[GraphResponse]:
+        """Async version of Neo4jGraphService.get_subgraph."""
+        query = subgraph_query(node_id, depth, rel_types)
+        async with cls.get_session() as session:
+            result = await session.run(query, node_id=node_id, limit=limit, fanout=fanout)
+            record = await result.single()
+        return graph_from_record(record) if record else None
+
+    @classmethod
+    async def get_shortest_path(
+        cls,
+        source: str,
+        target: str,
+        max_depth: int = 4,
+        rel_types: Optional[List[str]] = None,
+    ) -> Optional[GraphResponse]:
+        """Async version of Neo4jGraphService.get_shortest_path."""
+        query = shortest_path_query(source, target, max_depth, rel_types)
+        async with cls.get_session() as session:
+            if source == target:
+                # shortestPath() raises when both ends are the same node
+                result = await session.run(node_query(source), node_id=source)
+                record = await result.single()
+                if record is None:
+                    return None
+                node = GraphNode(id=record["id"], label=record["label"], type=record["type"].lower())
+                return GraphResponse(nodes=[node], edges=[])
+            result = await session.run(query, source=source, target=target)
+            record = await result.single()
+        return graph_from_record(record) if record else None
+
+
+# Singleton instance for convenience
+async_graph_service = AsyncNeo4jGraphService()
@@ -0,0 +1,87 @@
+"""
+Base class for the ingestion workers' daemon threads.
+
+A worker calls ``run_once()`` in a loop until stopped. Failed rounds back off
+exponentially (settings.worker_backoff_base doubling up to
+settings.worker_backoff_max); rounds that found nothing to do call ``_idle()``
+before the next one.
+"""
+import logging
+import threading
+from typing import Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def backoff_delay(failures: int) -> float:
+    """Seconds to wait after ``failures`` consecutive failed rounds."""
+    return min(settings.worker_backoff_max, settings.worker_backoff_base * 2 ** (failures - 1))
+
+
+class BackgroundWorker:
+    """Start/stop lifecycle and the retry loop shared by ingestion workers."""
+
+    thread_name = "background-worker"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.errors = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        with self._lock:
+            if self.running or not self._before_start():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop after the in-flight round."""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stop.set()
+        self._interrupt()
+        thread.join(timeout)
+        self._thread = None
+        self._after_stop()
+
+    def run_once(self) -> int:
+        """Do one round of work; returns how many items it handled."""
+        raise NotImplementedError
+
+    def _before_start(self) -> bool:
+        """Prepare to start (called under the lock); False refuses to start."""
+        return True
+
+    def _after_stop(self) -> None:
+        pass
+
+    def _interrupt(self) -> None:
+        """Wake an idle or blocked round so stop() returns promptly."""
+
+    def _idle(self) -> None:
+        """Called after a round that handled nothing."""
+
+    def _run(self) -> None:
+        failures = 0
+        while not self._stop.is_set():
+            try:
+                handled = self.run_once()
+                failures = 0
+            except Exception as e:
+                failures += 1
+                self.errors += 1
+                logger.error(f"{self.thread_name} round failed: {e}")
+                self._stop.wait(backoff_delay(failures))
+                continue
+            if not handled:
+                self._idle()
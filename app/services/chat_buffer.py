@@ -0,0 +1,39 @@
+"""
+Recent Telegram messages per chat, kept in memory.
+
+The ingestion worker fills the buffer and TelegramFetcher reads it; neither
+imports the other. The buffer is only authoritative while ``live`` (the
+worker is running and owns getUpdates).
+"""
+import threading
+from collections import defaultdict, deque
+from typing import Deque, Dict, Iterable, List, Optional
+
+from app.core.config import settings
+from app.schemas.data_ingestion import Post
+
+
+class ChatBuffer:
+    """Bounded per-chat deques of recent messages."""
+
+    def __init__(self, size: Optional[int] = None):
+        self.size = size or settings.telegram_chat_buffer_size
+        self._chats: Dict[str, Deque[Post]] = defaultdict(lambda: deque(maxlen=self.size))
+        self._lock = threading.Lock()
+        self.live = False
+
+    def extend(self, chat_id: str, posts: Iterable[Post]) -> None:
+        with self._lock:
+            self._chats[chat_id].extend(posts)
+
+    def recent(self, chat_id: str) -> List[Post]:
+        """Buffered messages of a chat, newest first."""
+        with self._lock:
+            return list(reversed(self._chats.get(chat_id, ())))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._chats)
+
+
+telegram_chats = ChatBuffer()
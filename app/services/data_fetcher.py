@@ -6,15 +6,32 @@ IMPORTANT: Always respect platform Terms of Service and rate limits.
 Some platforms require OAuth authentication or app approval.
 """
 import os
+import json
 import logging
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait
+from fnmatch import fnmatch
+from itertools import islice
+from typing import Callable, Iterator, List, Optional, Dict, Tuple, Union
+from datetime import datetime, timezone
 
 import requests
 
-from app.schemas.data_ingestion import Post, UserProfile
+from app.schemas.data_ingestion import (
+    Post,
+    UserProfile,
+    PlatformFetchStatus,
+    MultiFetchResult,
+)
 from app.core.config import settings
+from app.services.rate_limiter import credential_key, endpoint_key, rate_limiter
+from app.services.http_cache import cache_key, http_cache
+from app.services.handle_cache import handle_cache, normalize_handle
+from app.services.watermarks import Watermark, advance, is_newer, watermark_store
+from app.services.chat_buffer import ChatBuffer, telegram_chats
+from app.services.whatsapp_ingest import WhatsAppIngest, whatsapp_ingest
 
 
 logger = logging.getLogger(__name__)
@@ -23,6 +40,14 @@ logger = logging.getLogger(__name__)
 class BaseFetcher(ABC):
     """Abstract base class for all platform fetchers."""
 
+    # Platform name watermarks are stored under
+    PLATFORM = ""
+    # Largest page the platform serves per request
+    MAX_PAGE_SIZE = 100
+    # Response cache TTL (seconds) per endpoint-template glob; 0 = never cache.
+    # Endpoints not listed use settings.http_cache_default_ttl.
+    CACHE_TTLS: Dict[str, float] = {}
+
     def __init__(self):
         self.session = requests.Session()
         self.session.headers.update({
@@ -35,19 +60,176 @@ class BaseFetcher(ABC):
         pass
 
     @abstractmethod
-    def fetch_posts(self, user_id: str, limit: int = 50) -> List[Post]:
-        """Fetch posts/statuses from a user."""
+    def iter_posts(
+        self, user_id: str, page_size: int = 100, since: Optional[Watermark] = None
+    ) -> Iterator[Post]:
+        """
+        Lazily yield posts/statuses from a user, newest first, following the
+        platform's pagination cursor one page of ``page_size`` at a time.
+        With ``since``, only items newer than the watermark are requested
+        where the platform supports it, and paging stops once known items
+        are reached.
+        """
         pass
 
-    def _safe_request(self, method: str, url: str, **kwargs) -> Optional[requests.Response]:
-        """Make a safe HTTP request with error handling."""
+    def fetch_posts(self, user_id: str, limit: int = 50) -> List[Post]:
+        """Fetch up to ``limit`` posts/statuses from a user."""
+        page_size = max(1, min(limit, self.MAX_PAGE_SIZE))
+        return list(islice(self.iter_posts(user_id, page_size=page_size), limit))
+
+    def account_key(self, user_id: str) -> str:
+        """Key the account's watermark is stored under."""
+        return user_id.strip()
+
+    def fetch_new_posts(self, user_id: str, limit: int = 50, commit: bool = True) -> List[Post]:
+        """
+        Fetch up to ``limit`` posts newer than the account's watermark.
+
+        When more than ``limit`` new posts exist, pages back to the watermark
+        and returns the oldest ``limit`` of them, so repeated calls catch up
+        without skipping any. At most settings.fetch_backfill_max_posts new
+        posts are read per call; posts older than that are logged as a gap.
+        Without a watermark the newest ``limit`` posts are returned.
+
+        The watermark advances to the newest post returned; pass
+        ``commit=False`` to advance it later with commit_watermark, once the
+        posts have been processed.
+        """
+        mark = watermark_store.get(self.PLATFORM, self.account_key(user_id))
+        cap = limit if mark is None else max(limit, settings.fetch_backfill_max_posts)
+        page_size = max(1, min(cap, self.MAX_PAGE_SIZE))
+        new = (p for p in self.iter_posts(user_id, page_size=page_size, since=mark)
+               if is_newer(p, mark))
+        # One past the cap tells a complete catch-up from a truncated one
+        pending = list(islice(new, cap + 1 if mark is not None else cap))
+        if len(pending) > cap:
+            logger.warning(
+                f"{self.PLATFORM}:{user_id} has more than {cap} posts since its "
+                f"watermark; older ones are skipped")
+            pending = pending[:cap]
+        posts = pending[-limit:] if limit > 0 else []
+        if commit:
+            self.commit_watermark(user_id, posts)
+        return posts
+
+    def commit_watermark(self, user_id: str, posts: List[Post]) -> None:
+        """Advance the account's watermark past ``posts``."""
+        account = self.account_key(user_id)
+        mark = advance(watermark_store.get(self.PLATFORM, account), posts)
+        if mark is not None:
+            watermark_store.save(self.PLATFORM, account, mark)
+
+    def has_watermark(self, user_id: str) -> bool:
+        return watermark_store.get(self.PLATFORM, self.account_key(user_id)) is not None
+
+    def _iter_graph_pages(self, url: str) -> Iterator[dict]:
+        """Yield items from a Graph API edge, following paging.next links."""
+        next_url: Optional[str] = url
+        while next_url:
+            resp = self._safe_request("GET", next_url)
+            if not resp:
+                return
+            data = resp.json()
+            items = data.get("data", [])
+            yield from items
+            next_url = data.get("paging", {}).get("next") if items else None
+
+    def _cache_ttl(self, endpoint: str) -> float:
+        for pattern, ttl in self.CACHE_TTLS.items():
+            if fnmatch(endpoint, pattern):
+                return ttl
+        return settings.http_cache_default_ttl
+
+    def _safe_request(
+        self, method: str, url: str, endpoint: Optional[str] = None, **kwargs
+    ) -> Optional[requests.Response]:
+        """
+        Make a safe HTTP request with error handling.
+
+        GETs are answered from the persistent response cache while fresh and
+        revalidated with ETag / If-Modified-Since once expired. Requests that
+        do go out are paced by the shared rate-limit scheduler, keyed by this
+        fetcher's credential and the endpoint template (derived from the URL
+        unless ``endpoint`` is given). 429s and 5xx responses are retried with
+        jittered backoff, up to settings.fetch_max_retries times; if the
+        platform keeps refusing, a stale cached copy is served instead.
+        """
+        token = credential_key(self.session, url, kwargs.get("params"))
+        endpoint = endpoint or endpoint_key(url)
+
+        ttl = self._cache_ttl(endpoint) if method.upper() == "GET" else 0
+        cached = None
+        key = None
+        if ttl > 0 and settings.http_cache_enabled:
+            key = cache_key(token, method, url, kwargs.get("params"))
+            cached = http_cache.get(key)
+            if cached is not None and cached.fresh:
+                http_cache.hits += 1
+                return cached.to_response(url)
+            if cached is not None:
+                kwargs["headers"] = {**cached.conditional_headers(), **kwargs.get("headers", {})}
+
+        response = self._send(method, url, token, endpoint, **kwargs)
+
+        if cached is not None and (response is None or response.status_code == 429):
+            logger.warning(f"Serving stale cached response for {endpoint}")
+            http_cache.stale_served += 1
+            return cached.to_response(url)
+        if response is None:
+            return None
+        if response.status_code == 304 and cached is not None:
+            http_cache.revalidated += 1
+            http_cache.refresh(key, ttl)
+            return cached.to_response(url)
         try:
-            response = self.session.request(method, url, timeout=30, **kwargs)
             response.raise_for_status()
-            return response
         except requests.RequestException as e:
-            logger.error(f"Request failed: {e}")
+            self._log_request_error(e)
             return None
+        if key is not None:
+            http_cache.misses += 1
+            http_cache.store(key, endpoint, response, ttl)
+        return response
+
+    def _send(
+        self, method: str, url: str, token: str, endpoint: str, **kwargs
+    ) -> Optional[requests.Response]:
+        """Send through the rate-limit scheduler, retrying 429s and 5xx."""
+        kwargs.setdefault("timeout", 30)
+        for attempt in range(settings.fetch_max_retries + 1):
+            wait = rate_limiter.reserve(token, endpoint, max_wait=settings.rate_limit_max_wait)
+            if wait > settings.rate_limit_max_wait:
+                logger.error(
+                    f"Rate limit budget for {endpoint} exhausted for another {wait:.0f}s")
+                return None
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.RequestException as e:
+                if attempt == settings.fetch_max_retries:
+                    self._log_request_error(e)
+                    return None
+                time.sleep(rate_limiter.backoff(attempt))
+                continue
+
+            rate_limiter.observe(token, endpoint, response)
+            retryable = response.status_code == 429 or response.status_code >= 500
+            if not retryable or attempt == settings.fetch_max_retries:
+                return response
+            logger.warning(
+                f"{endpoint} returned {response.status_code}, retrying "
+                f"({attempt + 1}/{settings.fetch_max_retries})")
+            if response.status_code >= 500:
+                time.sleep(rate_limiter.backoff(attempt))
+            else:
+                # observe() has paused the endpoint if the platform said
+                # for how long; otherwise back off on the bucket itself
+                rate_limiter.penalize(token, endpoint, rate_limiter.backoff(attempt))
+        return None
+
+    def _log_request_error(self, e: requests.RequestException) -> None:
+        logger.error(f"Request failed: {e}")
 
 
 class LinkedInFetcher(BaseFetcher):
@@ -57,7 +239,9 @@ class LinkedInFetcher(BaseFetcher):
     See: https://docs.microsoft.com/en-us/linkedin/shared/authentication/authorization-code-flow
     """
 
+    PLATFORM = "linkedin"
     BASE_URL = "https://api.linkedin.com/v2"
+    CACHE_TTLS = {"*/me": 3600, "*/emailAddress": 3600, "*/ugcPosts": 300}
 
     def __init__(self):
         super().__init__()
@@ -109,43 +293,54 @@ class LinkedInFetcher(BaseFetcher):
             location=data.get("location", {}).get("name"),
         )
 
-    def fetch_posts(self, user_id: str, limit: int = 50) -> List[Post]:
+    def iter_posts(
+        self, user_id: str, page_size: int = 100, since: Optional[Watermark] = None
+    ) -> Iterator[Post]:
         """
-        Fetch LinkedIn posts/shares. Requires w_member_social scope.
+        Iterate LinkedIn posts/shares. Requires w_member_social scope.
+        Pages with start/count offsets.
         """
         if not self.access_token:
             logger.warning("LinkedIn token not configured")
-            return []
-
-        posts: List[Post] = []
-        url = f"{self.BASE_URL}/ugcPosts?q=authors&authors=List(urn:li:person:{user_id})&count={limit}"
-
-        resp = self._safe_request("GET", url)
-        if not resp:
-            return posts
-
-        data = resp.json()
-        for item in data.get("elements", []):
-            text = ""
-            specific_content = item.get("specificContent", {})
-            share_content = specific_content.get(
-                "com.linkedin.ugc.ShareContent", {})
-            share_commentary = share_content.get("shareCommentary", {})
-            text = share_commentary.get("text", "")
-
-            posts.append(Post(
-                id=item.get("id", ""),
-                platform="linkedin",
-                author=user_id,
-                author_id=item.get("author", ""),
-                text=text,
-                timestamp=datetime.fromtimestamp(
-                    item.get("created", {}).get("time", 0) / 1000
-                ).isoformat() if item.get("created") else None,
-                url=f"https://www.linkedin.com/feed/update/{item.get('id', '')}",
-            ))
-
-        return posts
+            return
+
+        start = 0
+        while True:
+            url = (
+                f"{self.BASE_URL}/ugcPosts?q=authors&authors=List(urn:li:person:{user_id})"
+                f"&start={start}&count={page_size}"
+            )
+            resp = self._safe_request("GET", url)
+            if not resp:
+                return
+
+            elements = resp.json().get("elements", [])
+            for item in elements:
+                specific_content = item.get("specificContent", {})
+                share_content = specific_content.get(
+                    "com.linkedin.ugc.ShareContent", {})
+                share_commentary = share_content.get("shareCommentary", {})
+                text = share_commentary.get("text", "")
+
+                post = Post(
+                    id=item.get("id", ""),
+                    platform="linkedin",
+                    author=user_id,
+                    author_id=item.get("author", ""),
+                    text=text,
+                    timestamp=datetime.fromtimestamp(
+                        item.get("created", {}).get("time", 0) / 1000, tz=timezone.utc
+                    ).isoformat() if item.get("created") else None,
+                    url=f"https://www.linkedin.com/feed/update/{item.get('id', '')}",
+                )
+                # No server-side filter; newest first, so stop at known posts
+                if not is_newer(post, since):
+                    return
+                yield post
+
+            if len(elements) < page_size:
+                return
+            start += len(elements)
 
 
 class FacebookFetcher(BaseFetcher):
@@ -155,7 +350,9 @@ class FacebookFetcher(BaseFetcher):
     See: https://developers.facebook.com/docs/graph-api/
     """
 
+    PLATFORM = "facebook"
     BASE_URL = "https://graph.facebook.com/v18.0"
+    CACHE_TTLS = {"*/me": 3600, "*/:id": 3600}
 
     def __init__(self):
         super().__init__()
@@ -190,27 +387,25 @@ class FacebookFetcher(BaseFetcher):
                 data.get("location"), dict) else None,
         )
 
-    def fetch_posts(self, user_id: str, limit: int = 50) -> List[Post]:
+    def iter_posts(
+        self, user_id: str, page_size: int = 100, since: Optional[Watermark] = None
+    ) -> Iterator[Post]:
         """
-        Fetch Facebook posts. Requires user_posts permission.
+        Iterate Facebook posts. Requires user_posts permission.
         """
         if not self.access_token:
             logger.warning("Facebook token not configured")
-            return []
+            return
 
-        posts: List[Post] = []
         fields = "id,message,created_time,permalink_url"
-        url = f"{self.BASE_URL}/{user_id}/posts?fields={fields}&limit={limit}&access_token={self.access_token}"
-
-        resp = self._safe_request("GET", url)
-        if not resp:
-            return posts
+        url = f"{self.BASE_URL}/{user_id}/posts?fields={fields}&limit={page_size}&access_token={self.access_token}"
+        if since and since.since_ts is not None:
+            url += f"&since={int(since.since_ts)}"
 
-        data = resp.json()
-        for item in data.get("data", []):
+        for item in self._iter_graph_pages(url):
             if not item.get("message"):
                 continue
-            posts.append(Post(
+            yield Post(
                 id=item.get("id", ""),
                 platform="facebook",
                 author=user_id,
@@ -218,9 +413,7 @@ class FacebookFetcher(BaseFetcher):
                 text=item.get("message", ""),
                 timestamp=item.get("created_time"),
                 url=item.get("permalink_url"),
-            ))
-
-        return posts
+            )
 
 
 class TwitterFetcher(BaseFetcher):
@@ -236,7 +429,18 @@ class TwitterFetcher(BaseFetcher):
     See: https://developer.x.com/en/docs/twitter-api
     """
 
+    PLATFORM = "twitter"
     BASE_URL = "https://api.x.com/2"
+    # Profiles change rarely; timelines are short-lived. Batch handle lookups
+    # are cached per handle in handle_cache instead.
+    CACHE_TTLS = {
+        "*/users/by/username/*": 86400,
+        "*/users/:id": 86400,
+        "*/tweets": 300,
+        "*/users/by": 0,
+    }
+    # Usernames per /users/by request
+    MAX_LOOKUP_BATCH = 100
 
     def __init__(self):
         super().__init__()
@@ -246,32 +450,26 @@ class TwitterFetcher(BaseFetcher):
                 "Authorization": f"Bearer {self.bearer_token}"
             })
 
-    def _safe_request(self, method: str, url: str, **kwargs) -> Optional[requests.Response]:
-        """Make a safe HTTP request with Twitter-specific error handling."""
-        try:
-            response = self.session.request(method, url, timeout=30, **kwargs)
-            response.raise_for_status()
-            return response
-        except requests.RequestException as e:
-            # Check for common Twitter API errors
-            if hasattr(e, 'response') and e.response is not None:
-                try:
-                    error_data = e.response.json()
-                    if error_data.get("reason") == "official-client-forbidden":
-                        logger.error(
-                            "Twitter API Error: The bearer token appears to be from an official "
-                            "Twitter client and cannot be used with the API. Please register your "
-                            "own app at https://developer.twitter.com and generate a new bearer token."
-                        )
-                    elif error_data.get("title"):
-                        logger.error(f"Twitter API Error: {error_data.get('title')} - {error_data.get('detail', '')}")
-                    else:
-                        logger.error(f"Request failed: {e}")
-                except Exception:
+    def _log_request_error(self, e: requests.RequestException) -> None:
+        """Log request failures with Twitter-specific error details."""
+        # Check for common Twitter API errors
+        if hasattr(e, 'response') and e.response is not None:
+            try:
+                error_data = e.response.json()
+                if error_data.get("reason") == "official-client-forbidden":
+                    logger.error(
+                        "Twitter API Error: The bearer token appears to be from an official "
+                        "Twitter client and cannot be used with the API. Please register your "
+                        "own app at https://developer.twitter.com and generate a new bearer token."
+                    )
+                elif error_data.get("title"):
+                    logger.error(f"Twitter API Error: {error_data.get('title')} - {error_data.get('detail', '')}")
+                else:
                     logger.error(f"Request failed: {e}")
-            else:
+            except Exception:
                 logger.error(f"Request failed: {e}")
-            return None
+        else:
+            logger.error(f"Request failed: {e}")
 
     def fetch_user_profile(self, user_id: str) -> Optional[UserProfile]:
         """
@@ -284,18 +482,22 @@ class TwitterFetcher(BaseFetcher):
         # Determine if user_id is numeric (ID) or username
         if user_id.isdigit():
             url = f"{self.BASE_URL}/users/{user_id}"
+            endpoint = "api.x.com/2/users/:id"
         else:
             url = f"{self.BASE_URL}/users/by/username/{user_id}"
+            endpoint = "api.x.com/2/users/by/username/:username"
 
         params = {
             "user.fields": "id,name,username,location,description,created_at,public_metrics"
         }
 
-        resp = self._safe_request("GET", url, params=params)
+        resp = self._safe_request("GET", url, endpoint=endpoint, params=params)
         if not resp:
             return None
 
         data = resp.json().get("data", {})
+        if data.get("id") and data.get("username"):
+            handle_cache.put_many({data["username"]: data["id"]})
         return UserProfile(
             platform="twitter",
             user_id=data.get("id", user_id),
@@ -307,47 +509,103 @@ class TwitterFetcher(BaseFetcher):
             location=data.get("location"),
         )
 
-    def fetch_posts(self, user_id: str, limit: int = 50) -> List[Post]:
+    def resolve_user_ids(
+        self, usernames: List[str], refresh: bool = False
+    ) -> Dict[str, Optional[str]]:
+        """
+        Resolve handles to numeric user ids.
+
+        Cached resolutions are used unless ``refresh`` is set; the rest are
+        looked up with batched ``/users/by?usernames=`` calls. Handles the API
+        reports as missing or suspended map to None and are negatively cached.
+        Handles whose lookup failed (network, rate limit) are left out of the
+        result and are not cached.
         """
-        Fetch tweets from a user. Max 100 per request.
+        handles = list(dict.fromkeys(normalize_handle(u) for u in usernames if u.strip()))
+        resolved = {} if refresh else handle_cache.get_many(handles)
+        pending = [h for h in handles if h not in resolved]
+        if not pending or not self.bearer_token:
+            return resolved
+
+        url = f"{self.BASE_URL}/users/by"
+        for start in range(0, len(pending), self.MAX_LOOKUP_BATCH):
+            batch = pending[start:start + self.MAX_LOOKUP_BATCH]
+            resp = self._safe_request(
+                "GET", url, params={"usernames": ",".join(batch), "user.fields": "id,username"}
+            )
+            if not resp:
+                continue
+
+            body = resp.json()
+            found: Dict[str, Optional[str]] = {
+                normalize_handle(u["username"]): u["id"]
+                for u in body.get("data", [])
+                if u.get("username") and u.get("id")
+            }
+            # Unknown and suspended users come back as per-item errors
+            for error in body.get("errors", []):
+                handle = normalize_handle(str(error.get("value", "")))
+                if handle in batch and handle not in found:
+                    found[handle] = None
+            handle_cache.put_many(found)
+            resolved.update(found)
+        return resolved
+
+    def account_key(self, user_id: str) -> str:
+        """Handles and ids of the same account share one watermark."""
+        return self.resolve_user_id(user_id) or normalize_handle(user_id)
+
+    def resolve_user_id(self, username: str) -> Optional[str]:
+        """Resolve one handle (numeric ids pass through)."""
+        if username.isdigit():
+            return username
+        return self.resolve_user_ids([username]).get(normalize_handle(username))
+
+    def iter_posts(
+        self, user_id: str, page_size: int = 100, since: Optional[Watermark] = None
+    ) -> Iterator[Post]:
+        """
+        Iterate tweets from a user, following meta.next_token.
+        Pages hold 5-100 tweets.
         """
         if not self.bearer_token:
             logger.warning("Twitter bearer token not configured")
-            return []
-
-        posts: List[Post] = []
+            return
 
         # Get user ID if username provided
-        if not user_id.isdigit():
-            profile = self.fetch_user_profile(user_id)
-            if profile:
-                user_id = profile.user_id
-            else:
-                return posts
+        user_id = self.resolve_user_id(user_id)
+        if not user_id:
+            return
 
         url = f"{self.BASE_URL}/users/{user_id}/tweets"
         params = {
-            "max_results": min(limit, 100),
+            "max_results": max(5, min(page_size, self.MAX_PAGE_SIZE)),
             "tweet.fields": "id,text,created_at,author_id"
         }
-
-        resp = self._safe_request("GET", url, params=params)
-        if not resp:
-            return posts
-
-        data = resp.json()
-        for item in data.get("data", []):
-            posts.append(Post(
-                id=item.get("id", ""),
-                platform="twitter",
-                author=user_id,
-                author_id=item.get("author_id", user_id),
-                text=item.get("text", ""),
-                timestamp=item.get("created_at"),
-                url=f"https://x.com/i/status/{item.get('id', '')}",
-            ))
-
-        return posts
+        if since and since.since_id:
+            params["since_id"] = since.since_id
+
+        while True:
+            resp = self._safe_request("GET", url, params=params)
+            if not resp:
+                return
+
+            data = resp.json()
+            for item in data.get("data", []):
+                yield Post(
+                    id=item.get("id", ""),
+                    platform="twitter",
+                    author=user_id,
+                    author_id=item.get("author_id", user_id),
+                    text=item.get("text", ""),
+                    timestamp=item.get("created_at"),
+                    url=f"https://x.com/i/status/{item.get('id', '')}",
+                )
+
+            next_token = data.get("meta", {}).get("next_token")
+            if not next_token:
+                return
+            params["pagination_token"] = next_token
 
 
 class InstagramFetcher(BaseFetcher):
@@ -357,7 +615,9 @@ class InstagramFetcher(BaseFetcher):
     See: https://developers.facebook.com/docs/instagram-api/
     """
 
+    PLATFORM = "instagram"
     BASE_URL = "https://graph.facebook.com/v18.0"
+    CACHE_TTLS = {"*/me": 3600, "*/:id": 3600}
 
     def __init__(self):
         super().__init__()
@@ -390,28 +650,26 @@ class InstagramFetcher(BaseFetcher):
             location=None,
         )
 
-    def fetch_posts(self, user_id: str, limit: int = 50) -> List[Post]:
+    def iter_posts(
+        self, user_id: str, page_size: int = 100, since: Optional[Watermark] = None
+    ) -> Iterator[Post]:
         """
-        Fetch Instagram media posts.
+        Iterate Instagram media posts.
         """
         if not self.access_token:
             logger.warning("Instagram token not configured")
-            return []
+            return
 
-        posts: List[Post] = []
         fields = "id,caption,timestamp,permalink,username"
-        url = f"{self.BASE_URL}/{user_id}/media?fields={fields}&limit={limit}&access_token={self.access_token}"
-
-        resp = self._safe_request("GET", url)
-        if not resp:
-            return posts
+        url = f"{self.BASE_URL}/{user_id}/media?fields={fields}&limit={page_size}&access_token={self.access_token}"
+        if since and since.since_ts is not None:
+            url += f"&since={int(since.since_ts)}"
 
-        data = resp.json()
-        for item in data.get("data", []):
+        for item in self._iter_graph_pages(url):
             caption = item.get("caption", "")
             if not caption:
                 continue
-            posts.append(Post(
+            yield Post(
                 id=item.get("id", ""),
                 platform="instagram",
                 author=item.get("username", user_id),
@@ -419,9 +677,7 @@ class InstagramFetcher(BaseFetcher):
                 text=caption,
                 timestamp=item.get("timestamp"),
                 url=item.get("permalink"),
-            ))
-
-        return posts
+            )
 
 
 class ThreadsFetcher(BaseFetcher):
@@ -431,7 +687,9 @@ class ThreadsFetcher(BaseFetcher):
     See: https://developers.facebook.com/docs/threads/
     """
 
+    PLATFORM = "threads"
     BASE_URL = "https://graph.threads.net/v1.0"
+    CACHE_TTLS = {"*/me": 3600, "*/:id": 3600}
 
     def __init__(self):
         super().__init__()
@@ -464,28 +722,26 @@ class ThreadsFetcher(BaseFetcher):
             location=None,
         )
 
-    def fetch_posts(self, user_id: str, limit: int = 50) -> List[Post]:
+    def iter_posts(
+        self, user_id: str, page_size: int = 100, since: Optional[Watermark] = None
+    ) -> Iterator[Post]:
         """
-        Fetch Threads posts.
+        Iterate Threads posts.
         """
         if not self.access_token:
             logger.warning("Threads token not configured")
-            return []
+            return
 
-        posts: List[Post] = []
         fields = "id,text,timestamp,permalink,username"
-        url = f"{self.BASE_URL}/{user_id}/threads?fields={fields}&limit={limit}&access_token={self.access_token}"
+        url = f"{self.BASE_URL}/{user_id}/threads?fields={fields}&limit={page_size}&access_token={self.access_token}"
+        if since and since.since_ts is not None:
+            url += f"&since={int(since.since_ts)}"
 
-        resp = self._safe_request("GET", url)
-        if not resp:
-            return posts
-
-        data = resp.json()
-        for item in data.get("data", []):
+        for item in self._iter_graph_pages(url):
             text = item.get("text", "")
             if not text:
                 continue
-            posts.append(Post(
+            yield Post(
                 id=item.get("id", ""),
                 platform="threads",
                 author=item.get("username", user_id),
@@ -493,9 +749,7 @@ class ThreadsFetcher(BaseFetcher):
                 text=text,
                 timestamp=item.get("timestamp"),
                 url=item.get("permalink"),
-            ))
-
-        return posts
+            )
 
 
 class TelegramFetcher(BaseFetcher):
@@ -505,11 +759,16 @@ class TelegramFetcher(BaseFetcher):
     See: https://core.telegram.org/bots/api
     """
 
+    PLATFORM = "telegram"
     BASE_URL = "https://api.telegram.org"
+    # getUpdates is a queue, never a cacheable resource
+    CACHE_TTLS = {"*/getUpdates": 0, "*/getChat": 3600}
 
-    def __init__(self):
+    def __init__(self, buffer: Optional[ChatBuffer] = None):
         super().__init__()
         self.bot_token = os.getenv("TELEGRAM_BOT_TOKEN")
+        # Filled by the ingestion worker while it runs
+        self.buffer = buffer if buffer is not None else telegram_chats
 
     def _api_url(self, method: str) -> str:
         return f"{self.BASE_URL}/bot{self.bot_token}/{method}"
@@ -548,60 +807,93 @@ class TelegramFetcher(BaseFetcher):
             location=None,
         )
 
-    def fetch_posts(self, user_id: str, limit: int = 50) -> List[Post]:
+    def get_updates(
+        self, offset: Optional[int] = None, limit: int = 100, timeout: int = 0
+    ) -> Optional[List[dict]]:
+        """
+        Make one getUpdates call; None if it failed.
+
+        Passing ``offset`` acknowledges (and makes Telegram discard) every
+        update below it. With ``timeout`` > 0 the call long-polls for up to
+        that many seconds until an update arrives.
+        """
+        url = self._api_url("getUpdates")
+        params = {
+            "limit": limit,
+            "timeout": timeout,
+            "allowed_updates": json.dumps(["message", "channel_post"]),
+        }
+        if offset is not None:
+            params["offset"] = offset
+
+        resp = self._safe_request("GET", url, params=params, timeout=timeout + 10)
+        if not resp:
+            return None
+
+        result = resp.json()
+        if not result.get("ok"):
+            return None
+        return result.get("result", [])
+
+    @staticmethod
+    def update_post(update: dict) -> Optional[Tuple[str, Post]]:
+        """The (chat_id, Post) carried by an update, if it is a text message."""
+        message = update.get("message") or update.get("channel_post")
+        if not message or not message.get("text"):
+            return None
+
+        from_user = message.get("from", {})
+        return str(message.get("chat", {}).get("id", "")), Post(
+            id=str(message.get("message_id", "")),
+            platform="telegram",
+            author=from_user.get(
+                "username") or f"{from_user.get('first_name', '')} {from_user.get('last_name', '')}".strip(),
+            author_id=str(from_user.get("id", "")),
+            text=message["text"],
+            timestamp=datetime.fromtimestamp(message.get(
+                "date", 0), tz=timezone.utc).isoformat() if message.get("date") else None,
+            url=None,
+        )
+
+    def iter_posts(
+        self, user_id: str, page_size: int = 100, since: Optional[Watermark] = None
+    ) -> Iterator[Post]:
         """
-        Fetch messages from a Telegram group/channel.
+        Iterate messages from a Telegram group/channel.
         user_id should be the chat_id of the group.
         Note: Bot must be admin to access message history.
+
+        While the ingestion worker is running it owns getUpdates, and this
+        serves the chat's recent messages from the worker's buffer. Otherwise
+        it reads a single getUpdates page without acknowledging it.
         """
         if not self.bot_token:
             logger.warning("Telegram bot token not configured")
-            return []
+            return
 
-        posts: List[Post] = []
+        if self.buffer.live:
+            for post in self.buffer.recent(str(user_id)):
+                if not is_newer(post, since):
+                    return
+                yield post
+            return
 
         # getUpdates only returns recent messages for the bot
         # For full history, you need to use MTProto API (pyrogram/telethon)
-        url = self._api_url("getUpdates")
-        params = {"limit": limit, "allowed_updates": [
-            "message", "channel_post"]}
-
-        resp = self._safe_request("GET", url, params=params)
-        if not resp:
-            return posts
-
-        result = resp.json()
-        if not result.get("ok"):
-            return posts
-
-        for update in result.get("result", []):
-            message = update.get("message") or update.get("channel_post")
-            if not message:
+        for update in self.get_updates(limit=page_size) or []:
+            found = self.update_post(update)
+            if not found:
                 continue
 
             # Filter by chat_id if specified
-            chat_id = str(message.get("chat", {}).get("id", ""))
+            chat_id, post = found
             if user_id and chat_id != str(user_id):
                 continue
 
-            text = message.get("text", "")
-            if not text:
+            # Message ids increase per chat
+            if not is_newer(post, since):
                 continue
-
-            from_user = message.get("from", {})
-            posts.append(Post(
-                id=str(message.get("message_id", "")),
-                platform="telegram",
-                author=from_user.get(
-                    "username") or f"{from_user.get('first_name', '')} {from_user.get('last_name', '')}".strip(),
-                author_id=str(from_user.get("id", "")),
-                text=text,
-                timestamp=datetime.fromtimestamp(message.get(
-                    "date", 0)).isoformat() if message.get("date") else None,
-                url=None,
-            ))
-
-        return posts[:limit]
+            yield post
 
 
 class WhatsAppFetcher(BaseFetcher):
@@ -614,12 +906,15 @@ class WhatsAppFetcher(BaseFetcher):
     Message history retrieval is limited and requires webhook integration.
     """
 
+    PLATFORM = "whatsapp"
     BASE_URL = "https://graph.facebook.com/v18.0"
 
-    def __init__(self):
+    def __init__(self, store: Optional[WhatsAppIngest] = None):
         super().__init__()
         self.access_token = os.getenv("WHATSAPP_API_KEY")
         self.phone_number_id = os.getenv("WHATSAPP_PHONE_NUMBER_ID")
+        # Messages captured by the webhook receiver
+        self.store = store if store is not None else whatsapp_ingest
 
     def fetch_user_profile(self, user_id: str) -> Optional[UserProfile]:
         """
@@ -643,29 +938,18 @@ class WhatsAppFetcher(BaseFetcher):
             location=None,
         )
 
-    def fetch_posts(self, user_id: str, limit: int = 50) -> List[Post]:
+    def iter_posts(
+        self, user_id: str, page_size: int = 100, since: Optional[Watermark] = None
+    ) -> Iterator[Post]:
         """
-        WhatsApp Cloud API doesn't support fetching message history.
-        Messages must be captured via webhooks in real-time.
+        Iterate stored messages from a sender (phone number / wa_id).
 
-        This is a placeholder - implement webhook handler separately.
+        WhatsApp Cloud API doesn't support fetching message history, so this
+        reads the messages captured by the webhook receiver
+        (/api/v1/whatsapp/webhook) from the local buffer.
         """
-        if not self.access_token:
-            logger.warning("WhatsApp API key not configured")
-            return []
-
-        # WhatsApp doesn't support fetching historical messages via API
-        # You need to:
-        # 1. Set up a webhook endpoint
-        # 2. Configure it in Meta Business settings
-        # 3. Store incoming messages in your database
-        # 4. Query your database here
-
-        logger.info(
-            "WhatsApp message history requires webhook integration. "
-            "See: https://developers.facebook.com/docs/whatsapp/cloud-api/webhooks/"
-        )
-        return []
+        yield from self.store.iter_messages(
+            user_id, page_size=page_size, since_ts=since.since_ts if since else None)
 
 
 # Factory function to get the appropriate fetcher
@@ -696,6 +980,114 @@ def get_fetcher(platform: str) -> Optional[BaseFetcher]:
     return None
 
 
+# Per-platform request slots shared by every concurrent fetch_all_* call
+_platform_slots: Dict[str, threading.BoundedSemaphore] = {}
+_platform_slots_lock = threading.Lock()
+
+
+def _platform_slot(platform: str) -> threading.BoundedSemaphore:
+    with _platform_slots_lock:
+        slot = _platform_slots.get(platform)
+        if slot is None:
+            slot = threading.BoundedSemaphore(settings.fetch_platform_concurrency)
+            _platform_slots[platform] = slot
+        return slot
+
+
+def _fetch_one(
+    platform: str, user_id: str, limit: int, incremental: bool = False
+) -> Tuple[PlatformFetchStatus, List[Post], Optional[Callable[[], None]]]:
+    started = time.perf_counter()
+    fetcher = get_fetcher(platform)
+    if fetcher is None:
+        return PlatformFetchStatus(
+            platform=platform, user_id=user_id, status="unsupported"), [], None
+    commit = None
+    with _platform_slot(platform.lower()):
+        try:
+            if incremental:
+                # The caller advances the watermark, and only if this finishes in time
+                posts = fetcher.fetch_new_posts(user_id, limit, commit=False)
+                commit = lambda: fetcher.commit_watermark(user_id, posts)
+            else:
+                posts = fetcher.fetch_posts(user_id, limit)
+        except Exception as e:
+            logger.error(f"Error fetching from {platform}: {e}")
+            return PlatformFetchStatus(
+                platform=platform, user_id=user_id, status="error", error=str(e),
+                elapsed_ms=(time.perf_counter() - started) * 1000), [], None
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    logger.info(f"Fetched {len(posts)} posts from {platform} in {elapsed_ms:.0f} ms")
+    return PlatformFetchStatus(
+        platform=platform, user_id=user_id, status="ok",
+        posts=len(posts), elapsed_ms=elapsed_ms), posts, commit
+
+
+def fetch_all(
+    user_ids: Dict[str, Union[str, List[str]]],
+    limit: int = 50,
+    deadline: Optional[float] = None,
+    incremental: bool = False,
+) -> MultiFetchResult:
+    """
+    Fetch posts from multiple platforms concurrently.
+
+    Each (platform, user_id) pair runs in a thread pool, with at most
+    settings.fetch_platform_concurrency requests in flight per platform.
+    Platforms that fail or are still running at the deadline are reported
+    in the result instead of failing the whole fetch.
+
+    Args:
+        user_ids: Dict mapping platform name to a user_id or list of user_ids
+        limit: Max posts per user
+        deadline: Seconds to wait overall (defaults to settings.fetch_deadline)
+        incremental: Only fetch posts newer than each account's watermark.
+            The watermarks are not advanced here: call
+            result.commit_watermarks() once the posts are processed. Accounts
+            that missed the deadline are never advanced, so their posts are
+            fetched again next time.
+
+    Returns:
+        Posts from every platform that finished, plus per-platform status
+        and timing
+    """
+    tasks = [
+        (platform, user_id)
+        for platform, ids in user_ids.items()
+        for user_id in ([ids] if isinstance(ids, str) else ids)
+    ]
+    result = MultiFetchResult()
+    if not tasks:
+        return result
+
+    pool = ThreadPoolExecutor(
+        max_workers=min(settings.fetch_max_workers, len(tasks)),
+        thread_name_prefix="fetch",
+    )
+    started = time.perf_counter()
+    futures = {
+        pool.submit(_fetch_one, platform, user_id, limit, incremental): (platform, user_id)
+        for platform, user_id in tasks
+    }
+    done, _ = wait(futures, timeout=settings.fetch_deadline if deadline is None else deadline)
+    # Don't wait for stragglers; their own request timeout ends them.
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    for future, (platform, user_id) in futures.items():
+        if future in done:
+            status, posts, commit = future.result()
+            result.posts.extend(posts)
+            if commit is not None:
+                result._watermark_commits.append(commit)
+        else:
+            logger.warning(f"Fetching from {platform} exceeded the deadline")
+            status = PlatformFetchStatus(
+                platform=platform, user_id=user_id, status="timeout",
+                elapsed_ms=(time.perf_counter() - started) * 1000)
+        result.platforms.append(status)
+    return result
+
+
 # Convenience function to fetch from all platforms
 def fetch_all_posts(user_ids: Dict[str, str], limit: int = 50) -> List[Post]:
     """
@@ -707,18 +1099,6 @@ def fetch_all_posts(user_ids: Dict[str, str], limit: int = 50) -> List[Post]:
         limit: Max posts per platform
 
     Returns:
-        Combined list of posts from all platforms
+        Combined list of posts from all platforms that answered in time
     """
-    all_posts: List[Post] = []
-
-    for platform, user_id in user_ids.items():
-        fetcher = get_fetcher(platform)
-        if fetcher:
-            try:
-                posts = fetcher.fetch_posts(user_id, limit)
-                all_posts.extend(posts)
-                logger.info(f"Fetched {len(posts)} posts from {platform}")
-            except Exception as e:
-                logger.error(f"Error fetching from {platform}: {e}")
-
-    return all_posts
+    return fetch_all(user_ids, limit).posts
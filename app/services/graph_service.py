@@ -1,7 +1,9 @@
 """
 Neo4j Graph Service for persistent knowledge graph storage.
 """
-from typing import List, Optional
+import base64
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from contextlib import contextmanager
 
 from neo4j import GraphDatabase, Driver
@@ -13,8 +15,272 @@ from app.schemas.analysis_result import (
     GraphNode,
     GraphEdge,
     AnalysisResponse,
+    PostAnalysis,
 )
 
+# Node labels written by build_knowledge_graph, in pagination order
+NODE_LABELS = ("User", "Post", "Platform", "Entity")
+REL_TYPES = ("POSTED", "ON", "MENTIONS")
+
+
+# Cypher shared by the sync and async graph services
+WRITE_CHUNK_QUERY = """
+UNWIND $rows AS row
+MERGE (p:Post {id: row.post_id})
+SET p.text = row.text, p.sentiment = row.sentiment, p.score = row.score
+MERGE (u:User {id: row.user_id})
+SET u.name = row.author
+MERGE (u)-[:POSTED]->(p)
+MERGE (pl:Platform {id: row.platform_id})
+SET pl.name = row.platform
+MERGE (p)-[:ON]->(pl)
+WITH p, row
+UNWIND row.entities AS ent
+MERGE (e:Entity {id: ent.id})
+SET e.text = ent.text, e.label = ent.label
+MERGE (p)-[:MENTIONS]->(e)
+"""
+
+
+def nodes_page_query(node_label: str, after: bool = False, label: bool = False) -> str:
+    """
+    Keyset page of one label's nodes.
+
+    Predicates are only emitted when used: an ``$x IS NULL OR ...`` guard
+    stops the planner from range-seeking the unique id index, turning every
+    page into a label scan plus sort.
+    """
+    where = ["n.id > $after" if after else "n.id IS NOT NULL"]
+    if label:
+        where.append("n.label = $label")
+    return f"""
+    MATCH (n:`{node_label}`)
+    WHERE {" AND ".join(where)}
+    RETURN n.id AS id, COALESCE(n.name, n.text, n.id) AS label
+    ORDER BY n.id
+    LIMIT $limit
+    """
+
+
+def edges_page_query(node_label: str, after: bool = False, rel_type: bool = False) -> str:
+    """
+    Keyset page of relationships leaving one label's nodes, in (source,
+    type, target) order. Resuming seeks ``a.id >= $a`` on the id index and
+    only filters the ties on the cursor's source node.
+    """
+    where = [
+        "a.id >= $a AND (a.id > $a OR type(r) > $t OR (type(r) = $t AND b.id > $b))"
+        if after else "a.id IS NOT NULL"
+    ]
+    if rel_type:
+        where.append("type(r) = $rel_type")
+    return f"""
+    MATCH (a:`{node_label}`)-[r]->(b)
+    WHERE {" AND ".join(where)}
+    RETURN a.id AS source, type(r) AS label, b.id AS target
+    ORDER BY source, label, target
+    LIMIT $limit
+    """
+
+
+def node_label_for_id(node_id: str) -> str:
+    """
+    Label of a node from its id prefix ("entity:PERSON:..." -> Entity), so
+    lookups seek the label's unique id index instead of scanning every node.
+    """
+    prefix = node_id.split(":", 1)[0]
+    for label in NODE_LABELS:
+        if label.lower() == prefix:
+            return label
+    raise ValueError(f"Unknown node id {node_id!r}")
+
+
+def _rel_pattern(rel_types: Optional[List[str]]) -> str:
+    if not rel_types:
+        return ""
+    unknown = set(rel_types) - set(REL_TYPES)
+    if unknown:
+        raise ValueError(f"Unknown relationship type(s): {', '.join(sorted(unknown))}")
+    return ":" + "|".join(dict.fromkeys(rel_types))
+
+
+_NODE_MAP = "{id: n.id, label: COALESCE(n.name, n.text, n.id), type: labels(n)[0]}"
+_EDGE_MAP = "{source: startNode(r).id, target: endNode(r).id, label: type(r)}"
+
+
+def node_query(node_id: str) -> str:
+    """One node by id, seeking its label's id index."""
+    return f"""
+    MATCH (n:`{node_label_for_id(node_id)}` {{id: $node_id}})
+    RETURN n.id AS id,
+           COALESCE(n.name, n.text, n.id) AS label,
+           labels(n)[0] AS type
+    """
+
+
+def subgraph_query(node_id: str, depth: int, rel_types: Optional[List[str]] = None) -> str:
+    """
+    Breadth-first walk of ``depth`` hops from one node in a single query.
+
+    Each hop follows at most $fanout new relationships per frontier node
+    (a LIMIT inside a per-node subquery, so hubs like platforms can't blow
+    up the walk) and stops adding nodes at $limit in total. Returns the
+    nodes reached and the relationships walked to reach them.
+    """
+    if depth < 1:
+        raise ValueError("depth must be at least 1")
+    rel = _rel_pattern(rel_types)
+    hop = f"""
+    CALL {{
+        WITH seen, frontier
+        UNWIND frontier AS f
+        CALL {{
+            WITH f, seen
+            MATCH (f)-[r{rel}]-(m)
+            WHERE NOT m IN seen
+            RETURN r, m
+            LIMIT $fanout
+        }}
+        RETURN collect(DISTINCT m) AS found, collect(r) AS walked
+    }}
+    WITH seen, rels + walked AS rels, found[..$limit - size(seen)] AS frontier
+    WITH seen + frontier AS seen, frontier, rels"""
+    return f"""
+    MATCH (start:`{node_label_for_id(node_id)}` {{id: $node_id}})
+    WITH [start] AS seen, [start] AS frontier, [] AS rels{hop * depth}
+    RETURN [n IN seen | {_NODE_MAP}] AS nodes,
+           [r IN rels WHERE startNode(r) IN seen AND endNode(r) IN seen | {_EDGE_MAP}] AS edges
+    """
+
+
+def shortest_path_query(
+    source: str,
+    target: str,
+    max_depth: int,
+    rel_types: Optional[List[str]] = None,
+) -> str:
+    """
+    One shortest path of at most ``max_depth`` hops, found by Neo4j's
+    bidirectional breadth-first search; restricting ``rel_types`` prunes the
+    search itself rather than filtering paths afterwards.
+    """
+    if max_depth < 1:
+        raise ValueError("max_depth must be at least 1")
+    return f"""
+    MATCH (a:`{node_label_for_id(source)}` {{id: $source}}), (b:`{node_label_for_id(target)}` {{id: $target}})
+    MATCH p = shortestPath((a)-[{_rel_pattern(rel_types)}*..{max_depth}]-(b))
+    RETURN [n IN nodes(p) | {_NODE_MAP}] AS nodes,
+           [r IN relationships(p) | {_EDGE_MAP}] AS edges
+    """
+
+
+def graph_from_record(record) -> GraphResponse:
+    """GraphResponse from a subgraph or path query's nodes/edges maps."""
+    return GraphResponse(
+        nodes=[GraphNode(id=n["id"], label=n["label"], type=n["type"].lower()) for n in record["nodes"]],
+        edges=[GraphEdge(**e) for e in record["edges"]],
+    )
+
+
+def encode_cursor(key: Dict[str, Any]) -> str:
+    """Encode a keyset position as an opaque, URL-safe cursor."""
+    raw = json.dumps(key, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a cursor produced by encode_cursor; raises ValueError if invalid."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    if not isinstance(key, dict) or key.get("l") not in NODE_LABELS:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return key
+
+
+def _labels_for(node_type: Optional[str]) -> Tuple[str, ...]:
+    if node_type is None:
+        return NODE_LABELS
+    for label in NODE_LABELS:
+        if label.lower() == node_type.lower():
+            return (label,)
+    raise ValueError(f"Unknown node type {node_type!r}")
+
+
+class NodePager:
+    """
+    Keyset walk over NODE_LABELS for one page of nodes, shared by the sync
+    and async services: the caller runs each planned query and feeds the
+    records back until the page is full.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        node_type: Optional[str] = None,
+        label: Optional[str] = None,
+    ):
+        self.limit = limit
+        self.label = label
+        self.labels = _labels_for(node_type)
+        self.key = decode_cursor(cursor) if cursor else {"l": self.labels[0], "id": None}
+        if self.key["l"] not in self.labels:
+            raise ValueError(f"Cursor does not match node type {node_type!r}")
+        self.nodes: List[GraphNode] = []
+        self.next_cursor: Optional[str] = None
+
+    def steps(self) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        """Yield (node label, query, params) until the page is full."""
+        for node_label in self.labels[self.labels.index(self.key["l"]):]:
+            after = self.key["id"] if node_label == self.key["l"] else None
+            query = nodes_page_query(node_label, after=after is not None, label=self.label is not None)
+            yield node_label, query, {
+                "after": after, "label": self.label, "limit": self.limit - len(self.nodes)}
+            if len(self.nodes) >= self.limit:
+                self.next_cursor = encode_cursor({"l": node_label, "id": self.nodes[-1].id})
+                return
+
+    def add(self, node_label: str, records) -> None:
+        for record in records:
+            self.nodes.append(GraphNode(
+                id=record["id"], label=record["label"], type=node_label.lower()))
+
+
+class EdgePager:
+    """Keyset walk for one page of relationships; see NodePager."""
+
+    def __init__(self, limit: int, cursor: Optional[str] = None, rel_type: Optional[str] = None):
+        self.limit = limit
+        self.rel_type = rel_type
+        self.key = decode_cursor(cursor) if cursor else {"l": NODE_LABELS[0], "a": None}
+        self.edges: List[GraphEdge] = []
+        self.next_cursor: Optional[str] = None
+
+    def steps(self) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+        for node_label in NODE_LABELS[NODE_LABELS.index(self.key["l"]):]:
+            resume = node_label == self.key["l"] and self.key.get("a") is not None
+            query = edges_page_query(node_label, after=resume, rel_type=self.rel_type is not None)
+            yield node_label, query, {
+                "rel_type": self.rel_type,
+                "a": self.key["a"] if resume else None,
+                "t": self.key.get("t") if resume else None,
+                "b": self.key.get("b") if resume else None,
+                "limit": self.limit - len(self.edges),
+            }
+            if len(self.edges) >= self.limit:
+                last = self.edges[-1]
+                self.next_cursor = encode_cursor(
+                    {"l": node_label, "a": last.source, "t": last.label, "b": last.target})
+                return
+
+    def add(self, node_label: str, records) -> None:
+        for record in records:
+            self.edges.append(GraphEdge(
+                source=record["source"], target=record["target"], label=record["label"]))
+
 
 class Neo4jGraphService:
     """Service for managing knowledge graph in Neo4j."""
@@ -28,6 +294,7 @@ class Neo4jGraphService:
             cls._driver = GraphDatabase.driver(
                 settings.neo4j_uri,
                 auth=(settings.neo4j_user, settings.neo4j_password),
+                max_connection_pool_size=settings.neo4j_max_connection_pool_size,
             )
         return cls._driver
     
@@ -83,19 +350,70 @@ class Neo4jGraphService:
             session.run("MATCH (n) DETACH DELETE n")
     
     @classmethod
-    def build_knowledge_graph(cls, analysis: AnalysisResponse, clear_existing: bool = True) -> None:
+    def build_knowledge_graph(
+        cls,
+        analysis: AnalysisResponse,
+        clear_existing: bool = True,
+        batch_size: Optional[int] = None,
+    ) -> None:
         """
         Build knowledge graph from analysis response.
         
         Args:
             analysis: The analysis response containing posts and entities
             clear_existing: Whether to clear existing graph data first
+            batch_size: Posts per UNWIND transaction (defaults to
+                settings.neo4j_write_batch_size)
         """
         if clear_existing:
             cls.clear_graph()
         
+        if not settings.neo4j_bulk_write:
+            cls._write_rows(analysis.items)
+            return
+        
+        rows = cls._post_rows(analysis.items)
+        size = max(1, batch_size or settings.neo4j_write_batch_size)
         with cls.get_session() as session:
-            for item in analysis.items:
+            for start in range(0, len(rows), size):
+                chunk = rows[start:start + size]
+                session.execute_write(cls._write_chunk, chunk)
+    
+    @staticmethod
+    def _post_rows(items: List[PostAnalysis]) -> List[Dict[str, Any]]:
+        """Flatten analysed posts into UNWIND parameter rows."""
+        rows: List[Dict[str, Any]] = []
+        for item in items:
+            rows.append({
+                "post_id": f"post:{item.post_id}",
+                "text": item.text,
+                "sentiment": item.sentiment.label,
+                "score": item.sentiment.score,
+                "user_id": f"user:{item.author}",
+                "author": item.author,
+                "platform_id": f"platform:{item.platform}",
+                "platform": item.platform,
+                "entities": [
+                    {
+                        "id": f"entity:{ent.label}:{ent.text}",
+                        "text": ent.text,
+                        "label": ent.label,
+                    }
+                    for ent in item.entities
+                ],
+            })
+        return rows
+    
+    @staticmethod
+    def _write_chunk(tx, rows: List[Dict[str, Any]]) -> None:
+        """Write a chunk of post rows in a single UNWIND statement."""
+        tx.run(WRITE_CHUNK_QUERY, rows=rows).consume()
+    
+    @classmethod
+    def _write_rows(cls, items: List[PostAnalysis]) -> None:
+        """Per-row write path: 3 + N_entities round trips per post."""
+        with cls.get_session() as session:
+            for item in items:
                 # Create Post node
                 session.run(
                     """
@@ -153,70 +471,122 @@ class Neo4jGraphService:
                     )
     
     @classmethod
-    def get_graph_response(cls) -> GraphResponse:
+    def get_nodes_page(
+        cls,
+        limit: int = 500,
+        cursor: Optional[str] = None,
+        node_type: Optional[str] = None,
+        label: Optional[str] = None,
+    ) -> Tuple[List[GraphNode], Optional[str]]:
         """
-        Retrieve the entire graph and return as GraphResponse.
+        Fetch one page of nodes in (label, id) keyset order.
+        
+        Each label is range-seeked on its unique id constraint from the
+        cursor, so a page costs the same however deep into the graph the
+        cursor points.
+        
+        Args:
+            limit: Maximum nodes to return
+            cursor: next_cursor from the previous page, or None to start
+            node_type: Only nodes of this type (user | post | platform | entity)
+            label: Only entities with this NER label (e.g. PERSON)
         
         Returns:
-            GraphResponse containing all nodes and edges
+            The nodes and the cursor for the next page (None when done)
+        
+        Raises:
+            ValueError: invalid cursor or node type
         """
-        nodes: List[GraphNode] = []
-        edges: List[GraphEdge] = []
+        pager = NodePager(limit, cursor, node_type, label)
+        with cls.get_session() as session:
+            for node_label, query, params in pager.steps():
+                pager.add(node_label, session.run(query, **params))
+        return pager.nodes, pager.next_cursor
+    
+    @classmethod
+    def get_edges_page(
+        cls,
+        limit: int = 500,
+        cursor: Optional[str] = None,
+        rel_type: Optional[str] = None,
+    ) -> Tuple[List[GraphEdge], Optional[str]]:
+        """
+        Fetch one page of relationships in (source label, source, type, target)
+        keyset order.
+        
+        Args:
+            limit: Maximum edges to return
+            cursor: next_cursor from the previous page, or None to start
+            rel_type: Only relationships of this type (e.g. MENTIONS)
+        
+        Returns:
+            The edges and the cursor for the next page (None when done)
         
+        Raises:
+            ValueError: invalid cursor
+        """
+        pager = EdgePager(limit, cursor, rel_type)
         with cls.get_session() as session:
-            # Get all nodes
-            result = session.run(
-                """
-                MATCH (n)
-                RETURN n.id AS id, 
-                       COALESCE(n.name, n.text, n.id) AS label,
-                       labels(n)[0] AS type
-                """
-            )
-            for record in result:
-                node_type = record["type"].lower() if record["type"] else "entity"
-                nodes.append(GraphNode(
-                    id=record["id"],
-                    label=record["label"],
-                    type=node_type,
-                ))
-            
-            # Get all relationships
-            result = session.run(
-                """
-                MATCH (a)-[r]->(b)
-                RETURN a.id AS source, b.id AS target, type(r) AS label
-                """
-            )
-            for record in result:
-                edges.append(GraphEdge(
-                    source=record["source"],
-                    target=record["target"],
-                    label=record["label"],
-                ))
+            for node_label, query, params in pager.steps():
+                pager.add(node_label, session.run(query, **params))
+        return pager.edges, pager.next_cursor
+    
+    @classmethod
+    def iter_nodes(cls, page_size: int = 1000, **filters) -> Iterator[List[GraphNode]]:
+        """Yield every matching node, one page at a time."""
+        cursor = None
+        while True:
+            nodes, cursor = cls.get_nodes_page(limit=page_size, cursor=cursor, **filters)
+            if nodes:
+                yield nodes
+            if cursor is None:
+                return
+    
+    @classmethod
+    def iter_edges(cls, page_size: int = 1000, **filters) -> Iterator[List[GraphEdge]]:
+        """Yield every matching relationship, one page at a time."""
+        cursor = None
+        while True:
+            edges, cursor = cls.get_edges_page(limit=page_size, cursor=cursor, **filters)
+            if edges:
+                yield edges
+            if cursor is None:
+                return
+    
+    @classmethod
+    def get_graph_response(cls) -> GraphResponse:
+        """
+        Retrieve the entire graph and return as GraphResponse.
+        
+        This materialises every node and edge; prefer get_nodes_page /
+        get_edges_page or the NDJSON export for large graphs.
         
+        Returns:
+            GraphResponse containing all nodes and edges
+        """
+        nodes = [node for page in cls.iter_nodes() for node in page]
+        edges = [edge for page in cls.iter_edges() for edge in page]
         return GraphResponse(nodes=nodes, edges=edges)
     
     @classmethod
     def get_node_by_id(cls, node_id: str) -> Optional[GraphNode]:
         """Get a specific node by its ID."""
         with cls.get_session() as session:
-            result = session.run(
-                """
-                MATCH (n {id: $node_id})
-                RETURN n.id AS id,
-                       COALESCE(n.name, n.text, n.id) AS label,
-                       labels(n)[0] AS type
-                """,
-                node_id=node_id,
+            return cls._node(session, node_id)
+    
+    @staticmethod
+    def _node(session, node_id: str) -> Optional[GraphNode]:
+        try:
+            query = node_query(node_id)
+        except ValueError:
+            return None
+        record = session.run(query, node_id=node_id).single()
+        if record:
+            return GraphNode(
+                id=record["id"],
+                label=record["label"],
+                type=record["type"].lower(),
             )
-            record = result.single()
-            if record:
-                return GraphNode(
-                    id=record["id"],
-                    label=record["label"],
-                    type=record["type"].lower(),
-                )
         return None
     
     @classmethod
@@ -226,15 +596,16 @@ class Neo4jGraphService:
         edges: List[GraphEdge] = []
         
         with cls.get_session() as session:
-            # Get the center node
-            center = cls.get_node_by_id(node_id)
-            if center:
-                nodes.append(center)
+            # Get the center node (on this session, not a second one)
+            center = cls._node(session, node_id)
+            if center is None:
+                return GraphResponse(nodes=nodes, edges=edges)
+            nodes.append(center)
             
             # Get neighbors and edges
             result = session.run(
-                """
-                MATCH (n {id: $node_id})-[r]-(m)
+                f"""
+                MATCH (n:`{node_label_for_id(node_id)}` {{id: $node_id}})-[r]-(m)
                 RETURN m.id AS id,
                        COALESCE(m.name, m.text, m.id) AS label,
                        labels(m)[0] AS type,
@@ -265,6 +636,62 @@ class Neo4jGraphService:
                     ))
         
         return GraphResponse(nodes=nodes, edges=edges)
+    
+    @classmethod
+    def get_subgraph(
+        cls,
+        node_id: str,
+        depth: int = 2,
+        limit: int = 500,
+        fanout: int = 50,
+        rel_types: Optional[List[str]] = None,
+    ) -> Optional[GraphResponse]:
+        """
+        The neighbourhood of a node up to ``depth`` hops, in one bounded
+        traversal (see subgraph_query).
+        
+        Args:
+            node_id: Center node, e.g. "entity:PERSON:Joko Widodo"
+            depth: Hops to walk
+            limit: Maximum nodes returned, the center included
+            fanout: Maximum new relationships followed per node per hop
+            rel_types: Only walk these relationship types (default: all)
+        
+        Returns:
+            The subgraph, or None if the node doesn't exist
+        
+        Raises:
+            ValueError: bad depth, node id or relationship type
+        """
+        query = subgraph_query(node_id, depth, rel_types)
+        with cls.get_session() as session:
+            record = session.run(query, node_id=node_id, limit=limit, fanout=fanout).single()
+        return graph_from_record(record) if record else None
+    
+    @classmethod
+    def get_shortest_path(
+        cls,
+        source: str,
+        target: str,
+        max_depth: int = 4,
+        rel_types: Optional[List[str]] = None,
+    ) -> Optional[GraphResponse]:
+        """
+        Nodes and relationships of one shortest path between two nodes, or
+        None if either node is missing or they're more than ``max_depth``
+        hops apart. A node's path to itself is just the node.
+        
+        Raises:
+            ValueError: bad max_depth, node id or relationship type
+        """
+        query = shortest_path_query(source, target, max_depth, rel_types)
+        with cls.get_session() as session:
+            if source == target:
+                # shortestPath() raises when both ends are the same node
+                node = cls._node(session, source)
+                return GraphResponse(nodes=[node], edges=[]) if node else None
+            record = session.run(query, source=source, target=target).single()
+        return graph_from_record(record) if record else None
 
 
 # Singleton instance for convenience
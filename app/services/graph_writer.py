@@ -0,0 +1,276 @@
+"""
+Background persistence of analyses into the Neo4j knowledge graph.
+
+Endpoints hand their AnalysisResponse to a bounded queue and return at once.
+A single worker thread drains the queue, coalescing consecutive analyses into
+one batched build_knowledge_graph call, and records a per-job status that
+clients can poll. A full queue applies backpressure to the submitter.
+Submitters that must not act before the write lands (e.g. advancing a fetch
+watermark) pass an ``on_done`` callback, run once the job's batch is written.
+"""
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+from app.core.config import settings
+from app.schemas.analysis_result import (
+    AnalysisResponse,
+    AnalysisStats,
+    GraphWriteJob,
+    GraphWriteQueueStats,
+)
+from app.services.graph_service import graph_service
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class GraphQueueFull(Exception):
+    """Raised when the write queue stays full past the put timeout."""
+
+
+class GraphQueueClosed(GraphQueueFull):
+    """Raised when writes are submitted after the queue has been stopped."""
+
+
+class _Pending:
+    __slots__ = ("job_id", "analysis", "clear_existing", "on_done")
+
+    def __init__(
+        self,
+        job_id: str,
+        analysis: AnalysisResponse,
+        clear_existing: bool,
+        on_done: Optional[Callable[[], None]] = None,
+    ):
+        self.job_id = job_id
+        self.analysis = analysis
+        self.clear_existing = clear_existing
+        self.on_done = on_done
+
+
+class GraphWriteQueue:
+    """Bounded queue + worker thread for knowledge-graph writes."""
+
+    # Finished job statuses kept for polling
+    MAX_TRACKED_JOBS = 10_000
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = None,
+        put_timeout: Optional[float] = None,
+        coalesce_max_posts: Optional[int] = None,
+        writer=None,
+    ):
+        self.capacity = maxsize or settings.graph_queue_size
+        self.put_timeout = settings.graph_queue_put_timeout if put_timeout is None else put_timeout
+        self.coalesce_max_posts = coalesce_max_posts or settings.graph_coalesce_max_posts
+        self._writer = writer or graph_service.build_knowledge_graph
+        self._queue: "queue.Queue" = queue.Queue(maxsize=self.capacity)
+        self._jobs: "OrderedDict[str, GraphWriteJob]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._carry: Optional[_Pending] = None
+        self._closed = False
+        self.processed_jobs = 0
+        self.failed_jobs = 0
+        self.batches = 0
+
+    def start(self) -> None:
+        """Start (or restart after stop) the worker."""
+        with self._lock:
+            self._closed = False
+            self._ensure_worker()
+
+    def _ensure_worker(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name="graph-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Finish every queued write, then stop the worker. Later submits are
+        rejected until start() is called again.
+        """
+        with self._lock:
+            self._closed = True
+        thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        self._thread = None
+
+    def _track(self, analysis: AnalysisResponse) -> GraphWriteJob:
+        job = GraphWriteJob(
+            job_id=uuid.uuid4().hex,
+            status="queued",
+            posts=len(analysis.items),
+            enqueued_at=time.time(),
+        )
+        with self._lock:
+            self._jobs[job.job_id] = job
+            while len(self._jobs) > self.MAX_TRACKED_JOBS:
+                self._jobs.popitem(last=False)
+        return job
+
+    def run_inline(
+        self,
+        analysis: AnalysisResponse,
+        clear_existing: bool = False,
+        on_done: Optional[Callable[[], None]] = None,
+    ) -> str:
+        """Write an analysis synchronously, still recording it as a job."""
+        job = self._track(analysis)
+        self._write([_Pending(job.job_id, analysis, clear_existing, on_done)])
+        return job.job_id
+
+    def submit(
+        self,
+        analysis: AnalysisResponse,
+        clear_existing: bool = False,
+        on_done: Optional[Callable[[], None]] = None,
+    ) -> str:
+        """
+        Queue an analysis for persistence and return its job id.
+
+        ``on_done`` runs on the worker thread after the job is written; it is
+        not called if the write fails or the job is superseded.
+        """
+        with self._lock:
+            if self._closed:
+                raise GraphQueueClosed("Graph write queue is shut down")
+            # Auto-start until the first stop()
+            self._ensure_worker()
+        job = self._track(analysis)
+        try:
+            self._queue.put(
+                _Pending(job.job_id, analysis, clear_existing, on_done), timeout=self.put_timeout)
+        except queue.Full:
+            with self._lock:
+                self._jobs.pop(job.job_id, None)
+            raise GraphQueueFull(
+                f"Graph write queue is full ({self.capacity} pending analyses)")
+        return job.job_id
+
+    def get_job(self, job_id: str) -> Optional[GraphWriteJob]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.model_copy() if job else None
+
+    def stats(self) -> GraphWriteQueueStats:
+        now = time.time()
+        with self._lock:
+            queued = [j.enqueued_at for j in self._jobs.values() if j.status == "queued"]
+        return GraphWriteQueueStats(
+            depth=self._queue.qsize(),
+            capacity=self.capacity,
+            lag_seconds=now - min(queued) if queued else 0.0,
+            processed_jobs=self.processed_jobs,
+            failed_jobs=self.failed_jobs,
+            batches=self.batches,
+        )
+
+    def _next_batch(self, first: _Pending) -> List[_Pending]:
+        """
+        Collect queued jobs to write together with ``first``.
+
+        A clear_existing job would wipe everything queued before it, so when
+        one arrives the jobs collected so far are marked superseded instead of
+        written, and the batch restarts from it. Runs of /analyze calls (which
+        clear) therefore collapse into one clear plus the posts of the last.
+        """
+        batch = [first]
+        posts = len(first.analysis.items)
+        while posts < self.coalesce_max_posts:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._carry = item
+                break
+            if item.clear_existing:
+                self._supersede(batch)
+                batch, posts = [item], 0
+            else:
+                batch.append(item)
+            posts += len(item.analysis.items)
+        return batch
+
+    def _supersede(self, pending: List[_Pending]) -> None:
+        finished = time.time()
+        with self._lock:
+            for p in pending:
+                job = self._jobs.get(p.job_id)
+                if job is not None:
+                    job.status = "superseded"
+                    job.finished_at = finished
+            self.processed_jobs += len(pending)
+
+    def _write(self, batch: List[_Pending]) -> None:
+        started = time.time()
+        with self._lock:
+            for pending in batch:
+                job = self._jobs.get(pending.job_id)
+                if job is not None:
+                    job.status = "running"
+                    job.started_at = started
+
+        stats = [pending.analysis.stats for pending in batch]
+        merged = AnalysisResponse(
+            items=[item for pending in batch for item in pending.analysis.items],
+            stats=AnalysisStats(
+                total_posts=sum(s.total_posts for s in stats),
+                positive=sum(s.positive for s in stats),
+                neutral=sum(s.neutral for s in stats),
+                negative=sum(s.negative for s in stats),
+            ),
+        )
+        error = None
+        try:
+            self._writer(merged, clear_existing=batch[0].clear_existing)
+        except Exception as e:
+            logger.error(f"Graph write failed for {len(batch)} job(s): {e}")
+            error = str(e)
+
+        finished = time.time()
+        with self._lock:
+            self.batches += 1
+            for pending in batch:
+                job = self._jobs.get(pending.job_id)
+                if job is not None:
+                    job.status = "failed" if error else "done"
+                    job.error = error
+                    job.finished_at = finished
+            if error:
+                self.failed_jobs += len(batch)
+            else:
+                self.processed_jobs += len(batch)
+
+        if error:
+            return
+        for pending in batch:
+            if pending.on_done is not None:
+                try:
+                    pending.on_done()
+                except Exception as e:
+                    logger.error(f"Completion callback failed for job {pending.job_id}: {e}")
+
+    def _run(self) -> None:
+        while True:
+            item, self._carry = self._carry, None
+            if item is None:
+                item = self._queue.get()
+            if item is _STOP:
+                return
+            self._write(self._next_batch(item))
+
+
+graph_write_queue = GraphWriteQueue()
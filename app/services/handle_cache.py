@@ -0,0 +1,65 @@
+"""
+Persistent Twitter handle -> user id mapping.
+
+User ids never change and handles rarely do, so resolutions are kept for a
+long time. Handles the API reports as missing or suspended are cached as
+negative entries (user_id None) for a shorter period so they don't keep
+costing lookups.
+"""
+import time
+from typing import Dict, Iterable, Optional
+
+from app.core.config import settings
+from app.db.models import TwitterHandleEntry
+from app.db.store import SQLiteStore
+
+# Keep IN (...) lists under SQLite's bound-parameter limit
+_LOOKUP_CHUNK = 500
+
+
+def normalize_handle(handle: str) -> str:
+    return handle.strip().lstrip("@").lower()
+
+
+class HandleCache(SQLiteStore):
+    """SQLite-backed handle resolution cache."""
+
+    def get_many(self, handles: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Cached resolutions for ``handles`` (normalized). Handles that are absent
+        from the result are unknown; a None value is a cached miss.
+        """
+        keys = list(dict.fromkeys(normalize_handle(h) for h in handles))
+        now = time.time()
+        found: Dict[str, Optional[str]] = {}
+        with self._session() as db:
+            for i in range(0, len(keys), _LOOKUP_CHUNK):
+                rows = db.query(TwitterHandleEntry).filter(
+                    TwitterHandleEntry.handle.in_(keys[i:i + _LOOKUP_CHUNK]),
+                    TwitterHandleEntry.expires_at > now,
+                )
+                for row in rows:
+                    found[row.handle] = row.user_id
+        return found
+
+    def put_many(self, resolved: Dict[str, Optional[str]]) -> None:
+        """Store resolutions; None values are stored as negative entries."""
+        if not resolved:
+            return
+        now = time.time()
+        with self._session() as db:
+            for handle, user_id in resolved.items():
+                ttl = (
+                    settings.twitter_handle_ttl if user_id
+                    else settings.twitter_handle_negative_ttl
+                )
+                db.merge(TwitterHandleEntry(
+                    handle=normalize_handle(handle),
+                    user_id=user_id,
+                    resolved_at=now,
+                    expires_at=now + ttl,
+                ))
+            db.commit()
+
+
+handle_cache = HandleCache()
@@ -0,0 +1,157 @@
+"""
+Persistent response cache for the platform fetchers.
+
+GET responses are stored in the local SQLite store keyed by credential,
+method, URL and params. Fresh entries are served without touching the
+network (and without spending rate-limit budget); expired entries are
+revalidated with If-None-Match / If-Modified-Since when the platform sent an
+ETag or Last-Modified, and are served stale when the platform is rate
+limiting us. Entries more than settings.http_cache_stale_grace seconds past
+expiry are dropped, and the table is pruned to the newest
+settings.http_cache_max_entries responses.
+"""
+import hashlib
+import json
+import time
+from typing import Dict, Optional
+from urllib.parse import urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from app.core.config import settings
+from app.db.models import HttpCacheEntry
+from app.db.store import SQLiteStore
+
+# Hop-by-hop/volatile headers that should not be replayed from cache
+_DROP_HEADERS = {"connection", "transfer-encoding", "content-encoding", "set-cookie"}
+
+
+def cache_key(credential: str, method: str, url: str, params=None) -> str:
+    query = urlencode(sorted((params or {}).items()), doseq=True)
+    raw = "\n".join((credential, method.upper(), url, query))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class CachedResponse:
+    """A cache entry detached from its database session."""
+
+    def __init__(self, entry: HttpCacheEntry):
+        self.key = entry.key
+        self.status_code = entry.status_code
+        self.headers = json.loads(entry.headers)
+        self.body = entry.body
+        self.etag = entry.etag
+        self.last_modified = entry.last_modified
+        self.expires_at = entry.expires_at
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_response(self, url: str) -> requests.Response:
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.body
+        response.url = url
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.from_cache = True
+        return response
+
+
+class HttpResponseCache(SQLiteStore):
+    """SQLite-backed store of upstream responses."""
+
+    _PRUNE_EVERY = 500
+
+    def __init__(
+        self,
+        session_factory=None,
+        bind=None,
+        max_size: Optional[int] = None,
+        stale_grace: Optional[float] = None,
+    ):
+        super().__init__(session_factory, bind)
+        self.max_size = max_size or settings.http_cache_max_entries
+        self.stale_grace = settings.http_cache_stale_grace if stale_grace is None else stale_grace
+        # Prune on the first write too, so short-lived processes still trim
+        self._writes = self._PRUNE_EVERY - 1
+        self.hits = 0
+        self.revalidated = 0
+        self.stale_served = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """The entry for ``key``, unless it expired more than stale_grace ago."""
+        with self._session() as db:
+            entry = db.get(HttpCacheEntry, key)
+            if entry is None or entry.expires_at + self.stale_grace < time.time():
+                return None
+            return CachedResponse(entry)
+
+    def store(self, key: str, endpoint: str, response: requests.Response, ttl: float) -> None:
+        now = time.time()
+        headers = {
+            k: v for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS
+        }
+        with self._session() as db:
+            db.merge(HttpCacheEntry(
+                key=key,
+                endpoint=endpoint,
+                status_code=response.status_code,
+                headers=json.dumps(headers),
+                body=response.content,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                stored_at=now,
+                expires_at=now + ttl,
+            ))
+            self._wrote(db, now)
+            db.commit()
+
+    def refresh(self, key: str, ttl: float) -> None:
+        """Extend an entry after a 304 Not Modified."""
+        now = time.time()
+        with self._session() as db:
+            entry = db.get(HttpCacheEntry, key)
+            if entry is not None:
+                entry.stored_at = now
+                entry.expires_at = now + ttl
+                self._wrote(db, now)
+                db.commit()
+
+    def _wrote(self, db, now: float) -> None:
+        self._writes += 1
+        if self._writes >= self._PRUNE_EVERY:
+            self._writes = 0
+            self._prune(db, now)
+
+    def _prune(self, db, now: float) -> None:
+        db.query(HttpCacheEntry).filter(
+            HttpCacheEntry.expires_at < now - self.stale_grace
+        ).delete(synchronize_session=False)
+        newest = db.query(HttpCacheEntry.key).order_by(
+            HttpCacheEntry.stored_at.desc()).limit(self.max_size)
+        db.query(HttpCacheEntry).filter(
+            HttpCacheEntry.key.not_in(newest.scalar_subquery())
+        ).delete(synchronize_session=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "stale_served": self.stale_served,
+            "misses": self.misses,
+        }
+
+
+http_cache = HttpResponseCache()
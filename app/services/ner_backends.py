@@ -0,0 +1,233 @@
+"""
+Registry of named-entity recognition backends.
+
+Backends trade accuracy for speed:
+
+- ``regex``: email/phone/URL patterns and runs of capitalized words. No
+  dependencies, by far the fastest.
+- ``rules``: spaCy's tokenizer plus a compiled EntityRuler (token patterns
+  for the same entity kinds, plus any patterns in ``ner_rule_patterns``).
+  Needs spaCy but no trained model.
+- ``spacy_ner``: the statistical model with every component NER doesn't
+  depend on removed at load time.
+- ``spacy_sm``: the full ``en_core_web_sm`` pipeline (tagger, parser,
+  lemmatizer, NER). Same entities as ``spacy_ner``, several times slower.
+
+The deployment default is ``settings.ner_backend``. "auto" picks spacy_ner
+when the model is installed and regex otherwise. Requests can name a
+backend explicitly.
+
+``posts_per_second`` is a nominal single-core figure for ~25-word posts.
+Measure real numbers with ``python -m benchmarks.ner_backends``.
+"""
+import importlib.util
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+
+# (text, label). Entities stay plain tuples through scoring and caching;
+# analyze_posts turns them into NEREntity models for the response.
+Entity = Tuple[str, str]
+
+# Backends "auto" tries, in order
+_AUTO_ORDER = ("spacy_ner", "regex")
+
+
+class NERBackendError(ValueError):
+    """An unknown backend was requested, or its dependencies are missing."""
+
+
+class NERBackend:
+    """Base class: extracts entities for a batch of texts, in input order."""
+
+    name = ""
+    description = ""
+    posts_per_second = 0
+
+    def __init__(self):
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        """Whether the dependencies are installed; doesn't load anything."""
+        return True
+
+    def load(self) -> None:
+        """Load models once; safe to call repeatedly and from several threads."""
+        if self._loaded:
+            return
+        with self._lock:
+            if not self._loaded:
+                self._load()
+                self._loaded = True
+
+    def _load(self) -> None:
+        pass
+
+    def extract(
+        self,
+        texts: Iterable[str],
+        batch_size: Optional[int] = None,
+        n_process: Optional[int] = None,
+    ) -> List[List[Entity]]:
+        raise NotImplementedError
+
+
+class RegexBackend(NERBackend):
+    name = "regex"
+    description = "Email, phone, URL patterns and capitalized-word runs as PERSON"
+    posts_per_second = 120_000
+
+    # One pass over the text; the first alternative that matches at a
+    # position wins, so entities don't overlap (a URL's digits are not also
+    # a PHONE). Matches only start at a word boundary or a "+", which keeps
+    # the engine from retrying every alternative inside every word.
+    SCANNER = re.compile(
+        r"(?:\b|(?=\+))(?:"
+        r"(?P<URL>https?://\S+)"
+        r"|(?P<EMAIL>[\w.-]+@[\w.-]+)"
+        r"|(?P<PHONE>\+?\d[\d\-\s]{7,}\d)"
+        # Naive PERSON: consecutive capitalized words (very rough)
+        r"|(?P<PERSON>[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)"
+        r")"
+    )
+
+    def extract(self, texts, batch_size=None, n_process=None):
+        finditer = self.SCANNER.finditer
+        return [[(m.group(), m.lastgroup) for m in finditer(text)] for text in texts]
+
+
+class _SpacyPipelineBackend(NERBackend):
+    """Runs texts through a spaCy pipeline with nlp.pipe."""
+
+    def __init__(self):
+        super().__init__()
+        self.nlp = None
+
+    def available(self) -> bool:
+        return importlib.util.find_spec("spacy") is not None
+
+    def extract(self, texts, batch_size=None, n_process=None):
+        self.load()
+        docs = self.nlp.pipe(
+            texts,
+            batch_size=batch_size or settings.nlp_batch_size,
+            n_process=n_process or settings.nlp_n_process,
+        )
+        return [[(ent.text, ent.label_) for ent in doc.ents] for doc in docs]
+
+
+def _non_ner_pipes(nlp) -> List[str]:
+    """Names of pipeline components that NER does not depend on."""
+    keep = {"ner", "entity_ruler"}
+    if "tok2vec" in nlp.pipe_names:
+        listeners = getattr(nlp.get_pipe("tok2vec"), "listening_components", [])
+        if "ner" in listeners:
+            keep.add("tok2vec")
+    return [name for name in nlp.pipe_names if name not in keep]
+
+
+class SpacyModelBackend(_SpacyPipelineBackend):
+    """A trained spaCy model, optionally stripped down to NER."""
+
+    def __init__(self, name: str, description: str, posts_per_second: int, ner_only: bool):
+        super().__init__()
+        self.name = name
+        self.description = description
+        self.posts_per_second = posts_per_second
+        self.ner_only = ner_only
+
+    def available(self) -> bool:
+        return (
+            super().available()
+            and importlib.util.find_spec(settings.ner_spacy_model) is not None
+        )
+
+    def _load(self) -> None:
+        try:
+            import spacy  # type: ignore
+            nlp = spacy.load(settings.ner_spacy_model)
+        except Exception as e:
+            raise NERBackendError(f"NER backend {self.name!r} is not available: {e}")
+        if self.ner_only:
+            for name in _non_ner_pipes(nlp):
+                nlp.remove_pipe(name)
+        self.nlp = nlp
+
+
+class RuleMatcherBackend(_SpacyPipelineBackend):
+    name = "rules"
+    description = "spaCy tokenizer with a compiled EntityRuler; no trained model"
+    posts_per_second = 8_000
+
+    PATTERNS = [
+        {"label": "EMAIL", "pattern": [{"LIKE_EMAIL": True}]},
+        {"label": "URL", "pattern": [{"LIKE_URL": True, "TEXT": {"REGEX": r"^https?://"}}]},
+        {"label": "PHONE", "pattern": [{"TEXT": {"REGEX": r"^\+?\d{9,}$"}}]},
+        # The tokenizer splits "+62 812-3456" into digit groups and dashes
+        {"label": "PHONE", "pattern": [
+            {"TEXT": {"REGEX": r"^\+\d{1,3}$"}},
+            {"TEXT": {"REGEX": r"^(-|\d{2,4})$"}, "OP": "+"},
+            {"TEXT": {"REGEX": r"^\d{3,4}$"}},
+        ]},
+        {"label": "PERSON", "pattern": [
+            {"IS_TITLE": True, "IS_ALPHA": True},
+            {"IS_TITLE": True, "IS_ALPHA": True, "OP": "+"},
+        ]},
+    ]
+
+    def _load(self) -> None:
+        try:
+            import spacy  # type: ignore
+        except ImportError as e:
+            raise NERBackendError(f"NER backend {self.name!r} is not available: {e}")
+        nlp = spacy.blank("en")
+        ruler = nlp.add_pipe("entity_ruler")
+        if settings.ner_rule_patterns:
+            ruler.from_disk(settings.ner_rule_patterns)
+        ruler.add_patterns(self.PATTERNS)
+        self.nlp = nlp
+
+
+_backends: Dict[str, NERBackend] = {}
+
+
+def register_ner_backend(backend: NERBackend) -> None:
+    _backends[backend.name] = backend
+
+
+def list_ner_backends() -> List[NERBackend]:
+    return list(_backends.values())
+
+
+def get_ner_backend(name: Optional[str] = None) -> NERBackend:
+    """
+    The backend called ``name``, or the deployment default.
+
+    Raises:
+        NERBackendError: the backend is unknown or not installed
+    """
+    name = name or settings.ner_backend
+    if name == "auto":
+        for candidate in _AUTO_ORDER:
+            if _backends[candidate].available():
+                return _backends[candidate]
+    backend = _backends.get(name)
+    if backend is None:
+        raise NERBackendError(
+            f"Unknown NER backend {name!r}; choose from {', '.join(_backends)} or auto")
+    if not backend.available():
+        raise NERBackendError(f"NER backend {name!r} is not installed")
+    return backend
+
+
+register_ner_backend(RegexBackend())
+register_ner_backend(RuleMatcherBackend())
+register_ner_backend(SpacyModelBackend(
+    "spacy_ner", "en_core_web_sm with only the NER components loaded",
+    posts_per_second=1_500, ner_only=True))
+register_ner_backend(SpacyModelBackend(
+    "spacy_sm", "Full en_core_web_sm pipeline (tagger, parser, lemmatizer, NER)",
+    posts_per_second=400, ner_only=False))
@@ -0,0 +1,129 @@
+"""
+Executors for sentiment + NER scoring.
+
+``InlineExecutor`` scores in the calling process. ``ProcessPoolNLPExecutor``
+spreads large batches across a pool of worker processes; each worker loads its
+own VADER analyzer and default NER backend once, in the pool initializer, and
+then scores chunks of texts. Results cross the process boundary as plain tuples and
+come back in input order.
+"""
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+from app.schemas.analysis_result import SentimentResult
+from app.services.ner_backends import Entity
+
+logger = logging.getLogger(__name__)
+
+# (sentiments, entities) for a list of texts, aligned with the input
+ScoreResult = Tuple[List[SentimentResult], List[List[Entity]]]
+_RawChunk = Tuple[List[Tuple[str, float]], List[List[Entity]]]
+
+
+class InlineExecutor:
+    """Score texts in the current process."""
+
+    def score(self, texts: List[str], ner_backend: Optional[str] = None) -> ScoreResult:
+        from app.services import nlp_service
+
+        sentiments = [nlp_service._sentiment(text) for text in texts]
+        entities = nlp_service._ner_batch(texts, ner_backend)
+        return sentiments, entities
+
+    def shutdown(self) -> None:
+        pass
+
+
+def _init_worker() -> None:
+    """Pool initializer: load the NLP models once per worker process."""
+    from app.services import nlp_service
+
+    # Each worker is already one of N processes; don't let spaCy fork again.
+    settings.nlp_n_process = 1
+    nlp_service.load_models()
+
+
+def _score_chunk(texts: List[str], ner_backend: Optional[str]) -> _RawChunk:
+    from app.services import nlp_service
+
+    sentiments = [(s.label, s.score) for s in map(nlp_service._sentiment, texts)]
+    return sentiments, nlp_service._ner_batch(texts, ner_backend)
+
+
+class ProcessPoolNLPExecutor:
+    """Score large batches across a pool of pre-initialised worker processes."""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        threshold: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+    ):
+        self.workers = workers or settings.nlp_workers or os.cpu_count() or 1
+        self.threshold = settings.nlp_parallel_threshold if threshold is None else threshold
+        self.chunk_size = max(1, chunk_size or settings.nlp_chunk_size)
+        self._inline = InlineExecutor()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: forking a threaded ASGI server is not safe
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        return self._pool
+
+    def score(self, texts: List[str], ner_backend: Optional[str] = None) -> ScoreResult:
+        if len(texts) < self.threshold:
+            return self._inline.score(texts, ner_backend)
+
+        chunks = [
+            texts[i:i + self.chunk_size]
+            for i in range(0, len(texts), self.chunk_size)
+        ]
+        sentiments: List[SentimentResult] = []
+        entities: List[List[Entity]] = []
+        for raw_sentiments, raw_entities in self._get_pool().map(
+                _score_chunk, chunks, repeat(ner_backend)):
+            sentiments.extend(
+                SentimentResult(label=label, score=score)
+                for label, score in raw_sentiments
+            )
+            entities.extend(raw_entities)
+        return sentiments, entities
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+_executor = None
+
+
+def get_executor():
+    """Return the executor selected by ``settings.nlp_executor``."""
+    global _executor
+    if _executor is None:
+        if settings.nlp_executor == "process":
+            _executor = ProcessPoolNLPExecutor()
+        else:
+            if settings.nlp_executor != "inline":
+                logger.warning(f"Unknown NLP executor {settings.nlp_executor!r}, using inline")
+            _executor = InlineExecutor()
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Stop worker processes, if any were started."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
@@ -1,6 +1,8 @@
-from typing import List
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-import re
 
 from app.schemas.data_ingestion import Post
 from app.schemas.analysis_result import (
@@ -11,29 +13,59 @@ from app.schemas.analysis_result import (
     AnalysisResponse,
     GraphResponse,
 )
+from app.core.config import settings
 from app.services.graph_service import graph_service
+from app.services.graph_writer import graph_write_queue
+from app.services.nlp_executor import get_executor
+from app.services.analysis_cache import get_analysis_cache, text_key
+from app.services.ner_backends import Entity, get_ner_backend
+from app.services.post_repository import post_repository
+from app.services.post_store import post_store
+from app.services.search_index import search_index
+from app.services.sentiment_stats import sentiment_stats
 
-# Sentiment analyzer
-_vader = SentimentIntensityAnalyzer()
+logger = logging.getLogger(__name__)
+
+# Models are loaded on first use (or by load_models() during app startup),
+# so importing this module stays cheap: spaCy alone takes most of a second.
+_vader: Optional[SentimentIntensityAnalyzer] = None
+_models_loaded = False
+_models_lock = threading.Lock()
+model_load_seconds: Optional[float] = None
+
+
+def load_models() -> None:
+    """
+    Load VADER and the default NER backend (settings.ner_backend). Other
+    backends load on first use. Safe to call repeatedly and from several
+    threads.
+    """
+    global _vader, _models_loaded, model_load_seconds
+    if _models_loaded:
+        return
+    with _models_lock:
+        if _models_loaded:
+            return
+        started = time.perf_counter()
+        _vader = SentimentIntensityAnalyzer()
+        backend = get_ner_backend()
+        backend.load()
+        model_load_seconds = time.perf_counter() - started
+        _models_loaded = True
+        logger.info(f"NLP models loaded in {model_load_seconds:.2f}s (NER: {backend.name})")
+
+
+def models_ready() -> bool:
+    return _models_loaded
 
-# Try spaCy for NER, else fallback to regex-based extraction
-_spacy_nlp = None
-try:
-    import spacy  # type: ignore
-    try:
-        _spacy_nlp = spacy.load("en_core_web_sm")
-    except Exception:
-        _spacy_nlp = None
-except Exception:
-    _spacy_nlp = None
 
-EMAIL_RE = re.compile(r"[\w\.-]+@[\w\.-]+", re.IGNORECASE)
-PHONE_RE = re.compile(r"\+?\d[\d\-\s]{7,}\d")
-URL_RE = re.compile(r"https?://\S+")
+def _get_vader() -> SentimentIntensityAnalyzer:
+    load_models()
+    return _vader
 
 
 def _sentiment(text: str) -> SentimentResult:
-    scores = _vader.polarity_scores(text)
+    scores = _get_vader().polarity_scores(text)
     comp = scores["compound"]
     if comp >= 0.05:
         label = "positive"
@@ -44,51 +76,102 @@ def _sentiment(text: str) -> SentimentResult:
     return SentimentResult(label=label, score=comp)
 
 
-def _ner(text: str) -> List[NEREntity]:
-    entities: List[NEREntity] = []
-    if _spacy_nlp:
-        doc = _spacy_nlp(text)
-        for ent in doc.ents:
-            entities.append(NEREntity(text=ent.text, label=ent.label_))
-        return entities
-
-    # Fallback: simple pattern-based entities
-    for m in EMAIL_RE.findall(text):
-        entities.append(NEREntity(text=m, label="EMAIL"))
-    for m in PHONE_RE.findall(text):
-        entities.append(NEREntity(text=m, label="PHONE"))
-    for m in URL_RE.findall(text):
-        entities.append(NEREntity(text=m, label="URL"))
-    # Naive PERSON: consecutive capitalized words (very rough)
-    for m in re.findall(r"(?:[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)", text):
-        entities.append(NEREntity(text=m, label="PERSON"))
-    return entities
-
-
-def analyze_posts(posts: List[Post]) -> AnalysisResponse:
+def _ner(text: str, backend: Optional[str] = None) -> List[Entity]:
+    return _ner_batch([text], backend)[0]
+
+
+def _ner_batch(
+    texts: Iterable[str],
+    backend: Optional[str] = None,
+    batch_size: Optional[int] = None,
+    n_process: Optional[int] = None,
+) -> List[List[Entity]]:
+    """
+    Extract (text, label) entities for many texts at once with the named NER
+    backend (the default one if None), preserving input order. spaCy backends stream the
+    texts through ``nlp.pipe``, so batching and multiprocessing are used.
+    """
+    return get_ner_backend(backend).extract(texts, batch_size=batch_size, n_process=n_process)
+
+
+def _score_texts(
+    texts: List[str], backend: str,
+) -> Tuple[List[SentimentResult], List[List[Entity]]]:
+    """
+    Sentiment and entities for each text, consulting the analysis cache.
+
+    Only texts that miss the cache are scored, and each distinct text is
+    scored once even if it repeats within the batch. Cache entries are per
+    NER backend.
+    """
+    cache = get_analysis_cache()
+    if cache is None:
+        return get_executor().score(texts, backend)
+
+    keys = [text_key(t, backend) for t in texts]
+    known = cache.get_many(keys)
+    pending: Dict[str, str] = {}
+    for key, text in zip(keys, texts):
+        if key not in known and key not in pending:
+            pending[key] = text
+    if pending:
+        sentiments, entity_lists = get_executor().score(list(pending.values()), backend)
+        fresh = dict(zip(pending, zip(sentiments, entity_lists)))
+        cache.put_many(fresh)
+        known.update(fresh)
+    return [known[k][0] for k in keys], [known[k][1] for k in keys]
+
+
+def analyze_posts(posts: List[Post], ner_backend: Optional[str] = None) -> AnalysisResponse:
+    """
+    Sentiment and entities for each post. ``ner_backend`` names a backend in
+    app.services.ner_backends; None uses settings.ner_backend.
+
+    Raises:
+        NERBackendError: the backend is unknown or not installed
+    """
+    backend = get_ner_backend(ner_backend).name
     items: List[PostAnalysis] = []
     pos = neu = neg = 0
-    for p in posts:
-        s = _sentiment(p.text)
+    sentiments, entity_lists = _score_texts([p.text for p in posts], backend)
+    for p, s, ents in zip(posts, sentiments, entity_lists):
         if s.label == "positive":
             pos += 1
         elif s.label == "negative":
             neg += 1
         else:
             neu += 1
-        ents = _ner(p.text)
         items.append(
             PostAnalysis(
                 post_id=p.id,
                 platform=p.platform,
                 author=p.author,
                 sentiment=s,
-                entities=ents,
+                entities=[NEREntity(text=text, label=label) for text, label in ents],
                 text=p.text,
             )
         )
     stats = AnalysisStats(total_posts=len(
         posts), positive=pos, neutral=neu, negative=neg)
+    if settings.stats_enabled:
+        sentiment_stats.add(posts, sentiments)
+    try:
+        post_store.append(posts, items)
+    except Exception as e:
+        # Unwritten rows stay buffered for the next flush
+        logger.error(f"Post store write failed: {e}")
+    if settings.search_enabled:
+        try:
+            search_index.add(posts, items)
+        except Exception as e:
+            # Unindexed analyses stay buffered for the next flush
+            logger.error(f"Search indexing failed: {e}")
+    if settings.post_repository_enabled:
+        try:
+            post_repository.upsert(posts, items, ner_backend=backend)
+        except Exception as e:
+            # The analysis itself succeeded; don't fail the request over it
+            logger.error(f"Post repository write failed: {e}")
     return AnalysisResponse(items=items, stats=stats)
 
 
@@ -103,6 +186,29 @@ def build_knowledge_graph(analysis: AnalysisResponse, clear_existing: bool = Tru
     graph_service.build_knowledge_graph(analysis, clear_existing=clear_existing)
 
 
+def persist_knowledge_graph(
+    analysis: AnalysisResponse,
+    clear_existing: bool = True,
+    on_done: Optional[Callable[[], None]] = None,
+) -> str:
+    """
+    Persist an analysis into the knowledge graph without blocking the caller.
+
+    With settings.graph_async_writes the write is queued for the background
+    graph writer; otherwise it runs inline. Either way the returned job id
+    can be polled via the graph write queue, and ``on_done`` runs only once
+    the write has succeeded.
+
+    Raises:
+        GraphQueueFull: the write queue stayed full past its put timeout
+    """
+    if settings.graph_async_writes:
+        return graph_write_queue.submit(
+            analysis, clear_existing=clear_existing, on_done=on_done)
+    return graph_write_queue.run_inline(
+        analysis, clear_existing=clear_existing, on_done=on_done)
+
+
 def get_graph_response() -> GraphResponse:
     """
     Retrieve the entire graph from Neo4j.
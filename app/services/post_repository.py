@@ -0,0 +1,242 @@
+"""
+Relational repository of posts, author profiles and analyses.
+
+analyze_posts upserts every batch into the database at settings.database_url
+(PostgreSQL, or SQLite on a single node): the posts, their authors' profiles
+and each post's latest analysis, as one transaction of multi-row INSERT ...
+ON CONFLICT statements. Reads share the same pooled engine and are index
+lookups - (platform, author, posted_at) for an author's latest posts,
+text_hash for copies of a text - instead of graph scans.
+"""
+import hashlib
+import json
+import threading
+import time
+from typing import List, Optional, Sequence
+
+from sqlalchemy import and_, case, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.database import create_repository_engine, init_repository
+from app.db.models import AuthorProfileRecord, PostAnalysisRecord, PostRecord
+from app.schemas.analysis_result import (
+    AuthorProfile,
+    NEREntity,
+    PostAnalysis,
+    SentimentResult,
+    StoredPost,
+)
+from app.schemas.data_ingestion import Post
+from app.services.analysis_cache import normalize_text
+from app.services.watermarks import post_epoch
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def text_hash(text: str) -> str:
+    """SHA-256 of the normalized text, so reposts and copy-paste match."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class PostRepository:
+    """
+    Like SQLiteStore, tables are created on first use and tests can pass
+    their own ``session_factory``/``bind``; otherwise the engine is built
+    from settings the first time it's needed.
+    """
+
+    def __init__(self, session_factory=None, bind=None):
+        self._session_factory = session_factory
+        self._bind = bind
+        self._ready = False
+        self._ready_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return settings.post_repository_enabled
+
+    def _session(self):
+        if not self._ready:
+            with self._ready_lock:
+                if not self._ready:
+                    if self._bind is None:
+                        self._bind = create_repository_engine()
+                    if self._session_factory is None:
+                        self._session_factory = sessionmaker(bind=self._bind, autoflush=False)
+                    init_repository(self._bind)
+                    self._ready = True
+        return self._session_factory()
+
+    def close(self) -> None:
+        """Release pooled connections; the next call reconnects."""
+        if self._ready and self._bind is not None:
+            self._bind.dispose()
+
+    def upsert(
+        self,
+        posts: Sequence[Post],
+        items: Optional[Sequence[PostAnalysis]] = None,
+        ner_backend: Optional[str] = None,
+    ) -> int:
+        """
+        Insert or update posts, their authors and (aligned with ``posts``)
+        their analyses. Returns the number of distinct posts written.
+
+        Raises:
+            ValueError: the database is neither PostgreSQL nor SQLite
+        """
+        if not posts:
+            return 0
+        now = time.time()
+        post_rows, profiles, analyses = {}, {}, {}
+        for post, item in zip(posts, items or [None] * len(posts)):
+            posted_at = post_epoch(post) or now
+            # Last occurrence wins: one statement can't update a row twice
+            post_rows[(post.platform, post.id)] = {
+                "platform": post.platform,
+                "id": post.id,
+                "author": post.author,
+                "author_id": post.author_id,
+                "text": post.text,
+                "text_hash": text_hash(post.text),
+                "url": post.url,
+                "timestamp": post.timestamp,
+                "posted_at": posted_at,
+                "ingested_at": now,
+            }
+            profile = profiles.setdefault((post.platform, post.author), {
+                "platform": post.platform,
+                "author": post.author,
+                "author_id": None,
+                "first_seen_at": now,
+                "last_post_at": posted_at,
+                "updated_at": now,
+            })
+            profile["author_id"] = post.author_id or profile["author_id"]
+            profile["last_post_at"] = max(profile["last_post_at"], posted_at)
+            if item is not None:
+                analyses[(post.platform, post.id)] = {
+                    "platform": post.platform,
+                    "post_id": post.id,
+                    "sentiment_label": item.sentiment.label,
+                    "sentiment_score": item.sentiment.score,
+                    "entities": json.dumps([[e.text, e.label] for e in item.entities]),
+                    "ner_backend": ner_backend,
+                    "analyzed_at": now,
+                }
+
+        with self._session() as db:
+            insert = _INSERTS.get(db.get_bind().dialect.name)
+            if insert is None:
+                raise ValueError(
+                    f"The post repository needs PostgreSQL or SQLite, not {db.get_bind().dialect.name}")
+
+            stmt = insert(PostRecord)
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=["platform", "id"],
+                set_={c: stmt.excluded[c] for c in _columns(PostRecord) if c not in ("platform", "id")},
+            ), list(post_rows.values()))
+
+            stmt = insert(AuthorProfileRecord)
+            table, new = AuthorProfileRecord, stmt.excluded
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=["platform", "author"],
+                set_={
+                    "author_id": func.coalesce(new.author_id, table.author_id),
+                    "last_post_at": case(
+                        (new.last_post_at > table.last_post_at, new.last_post_at),
+                        else_=func.coalesce(table.last_post_at, new.last_post_at),
+                    ),
+                    "updated_at": new.updated_at,
+                },
+            ), list(profiles.values()))
+
+            if analyses:
+                stmt = insert(PostAnalysisRecord)
+                db.execute(stmt.on_conflict_do_update(
+                    index_elements=["platform", "post_id"],
+                    set_={c: stmt.excluded[c] for c in _columns(PostAnalysisRecord)
+                          if c not in ("platform", "post_id")},
+                ), list(analyses.values()))
+            db.commit()
+        return len(post_rows)
+
+    def latest_posts(
+        self,
+        platform: str,
+        author: str,
+        limit: int = 50,
+        before: Optional[float] = None,
+    ) -> List[StoredPost]:
+        """An author's posts, newest first; page on with ``before`` = the last posted_at."""
+        with self._session() as db:
+            query = self._with_analyses(db).filter(
+                PostRecord.platform == platform, PostRecord.author == author)
+            if before is not None:
+                query = query.filter(PostRecord.posted_at < before)
+            rows = query.order_by(PostRecord.posted_at.desc()).limit(limit).all()
+            return [_stored_post(post, analysis) for post, analysis in rows]
+
+    def copies(self, text: str, limit: int = 100) -> List[StoredPost]:
+        """Posts on any platform with the same normalized text, newest first."""
+        with self._session() as db:
+            rows = (
+                self._with_analyses(db)
+                .filter(PostRecord.text_hash == text_hash(text))
+                .order_by(PostRecord.posted_at.desc())
+                .limit(limit)
+                .all()
+            )
+            return [_stored_post(post, analysis) for post, analysis in rows]
+
+    def get_profile(self, platform: str, author: str) -> Optional[AuthorProfile]:
+        with self._session() as db:
+            profile = db.get(AuthorProfileRecord, (platform, author))
+            if profile is None:
+                return None
+            count = db.query(func.count()).select_from(PostRecord).filter(
+                PostRecord.platform == platform, PostRecord.author == author).scalar()
+            return AuthorProfile(
+                platform=profile.platform,
+                author=profile.author,
+                author_id=profile.author_id,
+                post_count=count,
+                first_seen_at=profile.first_seen_at,
+                last_post_at=profile.last_post_at,
+            )
+
+    @staticmethod
+    def _with_analyses(db):
+        return db.query(PostRecord, PostAnalysisRecord).outerjoin(
+            PostAnalysisRecord,
+            and_(
+                PostAnalysisRecord.platform == PostRecord.platform,
+                PostAnalysisRecord.post_id == PostRecord.id,
+            ),
+        )
+
+
+def _columns(model) -> List[str]:
+    return [c.name for c in model.__table__.columns]
+
+
+def _stored_post(post: PostRecord, analysis: Optional[PostAnalysisRecord]) -> StoredPost:
+    return StoredPost(
+        id=post.id,
+        platform=post.platform,
+        author=post.author,
+        author_id=post.author_id,
+        text=post.text,
+        timestamp=post.timestamp,
+        url=post.url,
+        posted_at=post.posted_at,
+        sentiment=None if analysis is None else SentimentResult(
+            label=analysis.sentiment_label, score=analysis.sentiment_score),
+        entities=[] if analysis is None else [
+            NEREntity(text=t, label=l) for t, l in json.loads(analysis.entities)],
+    )
+
+
+post_repository = PostRepository()
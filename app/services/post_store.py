@@ -0,0 +1,287 @@
+"""
+Columnar history of analyzed posts, as Parquet files.
+
+analyze_posts appends every PostAnalysis (with the post's author id, URL and
+timestamp) to an in-memory buffer. A worker thread writes the buffer out
+every post_store_flush_interval seconds, or as soon as it holds
+post_store_flush_rows rows, as one file per partition:
+
+    <post_store_dir>/platform=twitter/date=2025-01-01/part-<ms>-<uuid>.parquet
+
+Files are written under a dot-prefixed name and renamed into place, so
+readers never see a partial file. Reads go through a pyarrow dataset over
+memory-mapped files, pruned to the platform/date partitions asked for, and
+come back in record batches, so bulk reanalysis, exports and the /stats
+seed at startup scan history without touching Neo4j. Every analysis is
+kept; iter_posts/iter_analyses return only each post's newest one.
+
+pyarrow is optional: without it (or with post_store_enabled off) nothing
+is stored and scans are empty.
+"""
+import importlib.util
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence
+from urllib.parse import quote
+
+from app.core.config import settings
+from app.schemas.analysis_result import NEREntity, PostAnalysis, SentimentResult
+from app.schemas.data_ingestion import Post
+from app.services.background_worker import BackgroundWorker
+from app.services.watermarks import post_epoch
+
+
+def _schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("post_id", pa.string()),
+        ("author", pa.string()),
+        ("author_id", pa.string()),
+        ("text", pa.string()),
+        ("url", pa.string()),
+        ("timestamp", pa.string()),  # as the platform sent it
+        # Post time (analysis time if the post had none); what since/until filter on
+        ("time", pa.timestamp("ms", tz="UTC")),
+        ("analyzed_at", pa.timestamp("ms", tz="UTC")),
+        ("sentiment_label", pa.dictionary(pa.int8(), pa.string())),
+        ("sentiment_score", pa.float32()),
+        ("entities", pa.list_(pa.struct([("text", pa.string()), ("label", pa.string())]))),
+    ])
+
+
+def _partitioning():
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    return ds.partitioning(
+        pa.schema([("platform", pa.string()), ("date", pa.string())]), flavor="hive")
+
+
+class PostStore(BackgroundWorker):
+    thread_name = "post-store"
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        flush_rows: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+    ):
+        BackgroundWorker.__init__(self)
+        self.root = Path(root or settings.post_store_dir)
+        self.flush_rows = flush_rows or settings.post_store_flush_rows
+        self.flush_interval = flush_interval or settings.post_store_flush_interval
+        self._buffer: List[dict] = []
+        self._buffer_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self.rows_written = 0
+        self.files_written = 0
+        self._last_stamp = 0
+        self._last_analyzed = datetime.min.replace(tzinfo=timezone.utc)
+
+    @property
+    def enabled(self) -> bool:
+        return settings.post_store_enabled and importlib.util.find_spec("pyarrow") is not None
+
+    def append(self, posts: Sequence[Post], items: Sequence[PostAnalysis]) -> None:
+        """Buffer analyses (aligned with their posts) for the next flush."""
+        if not self.enabled or not posts:
+            return
+        with self._buffer_lock:
+            # Stored to the millisecond; a later analysis must sort after an earlier one
+            now = datetime.now(timezone.utc)
+            now = max(now.replace(microsecond=now.microsecond // 1000 * 1000),
+                      self._last_analyzed + timedelta(milliseconds=1))
+            self._last_analyzed = now
+        rows = []
+        for post, item in zip(posts, items):
+            epoch = post_epoch(post)
+            rows.append({
+                "post_id": post.id,
+                "platform": post.platform,
+                "author": post.author,
+                "author_id": post.author_id,
+                "text": post.text,
+                "url": post.url,
+                "timestamp": post.timestamp,
+                "time": now if epoch is None else datetime.fromtimestamp(epoch, tz=timezone.utc),
+                "analyzed_at": now,
+                "sentiment_label": item.sentiment.label,
+                "sentiment_score": item.sentiment.score,
+                "entities": [{"text": e.text, "label": e.label} for e in item.entities],
+            })
+        with self._buffer_lock:
+            self._buffer.extend(rows)
+            full = len(self._buffer) >= self.flush_rows
+        if full:
+            if self.running:
+                self._wake.set()
+            else:
+                self.flush()
+
+    def flush(self) -> int:
+        """
+        Write the buffered rows now; returns how many were written. On a
+        failed write the partitions not yet written go back in the buffer
+        for the next flush, and the error is raised.
+        """
+        with self._flush_lock:
+            with self._buffer_lock:
+                rows, self._buffer = self._buffer, []
+            if not rows:
+                return 0
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            partitions = defaultdict(list)
+            for row in rows:
+                partitions[(row["platform"], row["time"].date().isoformat())].append(row)
+            schema = _schema()
+            # File names sort oldest first, even for flushes in the same millisecond
+            stamp = self._last_stamp = max(int(time.time() * 1000), self._last_stamp + 1)
+            written = 0
+            pending = list(partitions.items())
+            try:
+                while pending:
+                    (platform, date), part = pending[0]
+                    directory = self._partition_dir(platform, date)
+                    directory.mkdir(parents=True, exist_ok=True)
+                    name = f"part-{stamp}-{uuid.uuid4().hex[:8]}.parquet"
+                    tmp = directory / f".{name}"
+                    # platform is a partition column, not stored in the file
+                    pq.write_table(pa.Table.from_pylist(part, schema=schema), tmp)
+                    os.replace(tmp, directory / name)
+                    pending.pop(0)
+                    written += len(part)
+                    self.files_written += 1
+            except BaseException:
+                with self._buffer_lock:
+                    self._buffer[:0] = [row for _, part in pending for row in part]
+                raise
+            finally:
+                self.rows_written += written
+            return written
+
+    def _partition_dir(self, platform: str, date: str) -> Path:
+        """
+        Directory of one partition. The platform comes from client input, so
+        it's percent-encoded the way hive partitioning decodes it on read.
+        """
+        directory = self.root / f"platform={quote(platform, safe='')}" / f"date={date}"
+        root = self.root.resolve()
+        if root not in directory.resolve().parents:
+            raise ValueError(f"Partition for platform {platform!r} falls outside {self.root}")
+        return directory
+
+    def scan(
+        self,
+        platform: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        columns: Optional[List[str]] = None,
+        batch_size: int = 65_536,
+    ) -> Iterator["pyarrow.RecordBatch"]:  # noqa: F821
+        """
+        Stored rows (optionally only some columns) in record batches, in
+        file order: by partition, then oldest first. ``platform`` and
+        ``date`` are columns too.
+        """
+        if not self.enabled or not self.root.exists():
+            return
+        import pyarrow.dataset as ds
+        from pyarrow import fs
+
+        dataset = ds.dataset(
+            str(self.root),
+            format="parquet",
+            partitioning=_partitioning(),
+            filesystem=fs.LocalFileSystem(use_mmap=True),
+        )
+        condition = None
+        for clause in _filters(platform, since, until):
+            condition = clause if condition is None else condition & clause
+        # Ordered scan: the /stats seed relies on later rows being newer
+        yield from dataset.to_batches(
+            columns=columns, filter=condition, batch_size=batch_size, use_threads=False)
+
+    def iter_posts(self, **filters) -> Iterator[Post]:
+        """Stored posts, each once, e.g. to submit them for reanalysis."""
+        columns = ["post_id", "platform", "author", "author_id", "text", "timestamp", "url"]
+        for row in self._iter_latest(columns, **filters):
+            row["id"] = row.pop("post_id")
+            yield Post(**row)
+
+    def iter_analyses(self, **filters) -> Iterator[PostAnalysis]:
+        """The latest stored analysis of each post."""
+        columns = ["post_id", "platform", "author", "text", "sentiment_label", "sentiment_score", "entities"]
+        for row in self._iter_latest(columns, **filters):
+            yield PostAnalysis(
+                post_id=row["post_id"],
+                platform=row["platform"],
+                author=row["author"],
+                text=row["text"],
+                sentiment=SentimentResult(label=row["sentiment_label"], score=row["sentiment_score"]),
+                entities=[NEREntity(**e) for e in row["entities"]],
+            )
+
+    def _iter_latest(self, columns: List[str], **filters) -> Iterator[dict]:
+        """
+        Rows of the newest analysis per (platform, post_id). The store keeps
+        every analysis, so a reanalyzed post has older rows too; a first pass
+        over the key columns finds which row is the newest.
+        """
+        latest = {}
+        for batch in self.scan(columns=["platform", "post_id", "analyzed_at"], **filters):
+            keys = zip(batch.column("platform").to_pylist(), batch.column("post_id").to_pylist())
+            for key, analyzed_at in zip(keys, batch.column("analyzed_at").to_pylist()):
+                if key not in latest or analyzed_at > latest[key]:
+                    latest[key] = analyzed_at
+        for batch in self.scan(columns=columns + ["analyzed_at"], **filters):
+            for row in batch.to_pylist():
+                key = (row["platform"], row["post_id"])
+                if latest.get(key) == row.pop("analyzed_at"):
+                    # Yielded once even if two rows share the newest time
+                    del latest[key]
+                    yield row
+
+    def run_once(self) -> int:
+        self._wake.clear()
+        return self.flush()
+
+    def _idle(self) -> None:
+        self._wake.wait(self.flush_interval)
+
+    def _interrupt(self) -> None:
+        self._wake.set()
+
+    def _after_stop(self) -> None:
+        self.flush()
+
+
+def _filters(platform, since, until):
+    import pyarrow.dataset as ds
+
+    if platform:
+        yield ds.field("platform") == platform
+    # Whole-day partitions prune first; the time bounds then trim the edges
+    if since:
+        since = _utc(since)
+        yield ds.field("date") >= since.date().isoformat()
+        yield ds.field("time") >= since
+    if until:
+        until = _utc(until)
+        yield ds.field("date") <= until.date().isoformat()
+        yield ds.field("time") < until
+
+
+def _utc(dt: datetime) -> datetime:
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+post_store = PostStore()
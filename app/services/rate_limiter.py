@@ -0,0 +1,236 @@
+"""
+Rate-limit-aware request scheduling shared by all platform fetchers.
+
+Every outgoing request first reserves a slot in two token buckets: one per
+credential (token) and one per endpoint template. Buckets start from a local
+default rate and are then steered by what the platform reports:
+
+- Twitter/X ``x-rate-limit-remaining`` / ``x-rate-limit-reset`` re-pace the
+  endpoint bucket so the remaining calls are spread evenly until the reset,
+  and block it entirely once the window is exhausted.
+- Meta Graph API ``X-App-Usage`` / ``X-Business-Use-Case-Usage`` /
+  ``X-Ad-Account-Usage`` percentages slow the token bucket as usage climbs
+  and pause it at 100% (for ``estimated_time_to_regain_access`` if given).
+- ``Retry-After`` (and Telegram's ``parameters.retry_after``) pause the
+  endpoint bucket outright.
+
+Requests are delayed rather than sent when the budget is known to be spent,
+so no calls are wasted on guaranteed 429s. Because buckets are per endpoint,
+callers waiting on an exhausted endpoint don't hold up other endpoints.
+"""
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from app.core.config import settings
+
+_VERSION_SEGMENT = re.compile(r"^v\d+(\.\d+)?$")
+_GRAPH_USAGE_HEADERS = ("x-app-usage", "x-business-use-case-usage", "x-ad-account-usage")
+
+
+class TokenBucket:
+    """Token bucket whose rate can be re-steered by server feedback."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.default_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.paced_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        if self.paced_until and now >= self.paced_until:
+            # Server window has reset; back to the local default pace
+            self.rate = self.default_rate
+            self.paced_until = 0.0
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now: float) -> float:
+        """How long a reservation made now would have to wait, without taking it."""
+        self._refill(now)
+        wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+        return max(wait, self.blocked_until - now)
+
+    def reserve(self, now: float) -> float:
+        """Take one token and return how long the caller must wait for it."""
+        wait = self.wait_time(now)
+        self.tokens -= 1
+        return wait
+
+    def pace(self, remaining: int, reset_in: float, now: float) -> None:
+        """Spread ``remaining`` calls evenly over the next ``reset_in`` seconds."""
+        self._refill(now)
+        if remaining <= 0:
+            self.block(reset_in, now)
+            return
+        self.tokens = min(self.tokens, 1.0)
+        self.rate = remaining / max(reset_in, 1.0)
+        self.paced_until = now + reset_in
+
+    def throttle(self, usage_pct: float, now: float) -> None:
+        """Scale the rate down linearly once usage passes the slow-down mark."""
+        self._refill(now)
+        start = settings.rate_limit_slowdown_pct
+        if usage_pct <= start:
+            self.rate = self.default_rate
+        else:
+            headroom = max(0.0, (100.0 - usage_pct) / (100.0 - start))
+            self.rate = max(self.default_rate * headroom, self.default_rate * 0.01)
+
+    def block(self, seconds: float, now: float) -> None:
+        self.blocked_until = max(self.blocked_until, now + seconds)
+
+
+class RateLimitScheduler:
+    """Shared per-token and per-endpoint request budget."""
+
+    def __init__(self):
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, key: Tuple[str, str]) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(settings.rate_limit_default_rps, settings.rate_limit_burst)
+            self._buckets[key] = bucket
+        return bucket
+
+    def reserve(self, token: str, endpoint: str, max_wait: Optional[float] = None) -> float:
+        """
+        Reserve a request slot; returns the seconds to wait before sending.
+
+        If the wait would exceed ``max_wait``, nothing is reserved and the
+        wait is returned so the caller can give up without spending budget.
+        """
+        now = time.monotonic()
+        with self._lock:
+            buckets = (self._bucket(("token", token)), self._bucket((token, endpoint)))
+            wait = max(bucket.wait_time(now) for bucket in buckets)
+            if max_wait is None or wait <= max_wait:
+                for bucket in buckets:
+                    bucket.reserve(now)
+            return wait
+
+    def observe(self, token: str, endpoint: str, response: requests.Response) -> None:
+        """Update the buckets from a response's rate-limit headers/body."""
+        headers = response.headers
+        now = time.monotonic()
+        with self._lock:
+            endpoint_bucket = self._bucket((token, endpoint))
+            token_bucket = self._bucket(("token", token))
+
+            remaining = headers.get("x-rate-limit-remaining")
+            reset = headers.get("x-rate-limit-reset")
+            if remaining is not None and reset is not None:
+                try:
+                    reset_in = float(reset) - time.time()
+                    endpoint_bucket.pace(int(remaining), max(reset_in, 0.0), now)
+                except ValueError:
+                    pass
+
+            usage, regain = _graph_usage(headers)
+            if usage is not None:
+                if usage >= 100:
+                    token_bucket.block(regain or settings.rate_limit_usage_cooldown, now)
+                else:
+                    token_bucket.throttle(usage, now)
+
+            retry_after = _retry_after(response)
+            if retry_after is not None:
+                endpoint_bucket.block(retry_after, now)
+
+    def penalize(self, token: str, endpoint: str, seconds: float) -> None:
+        """Pause an endpoint for at least ``seconds`` (e.g. after a bare 429)."""
+        with self._lock:
+            self._bucket((token, endpoint)).block(seconds, time.monotonic())
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for retry ``attempt`` (0-based)."""
+        ceiling = min(settings.rate_limit_max_wait, settings.rate_limit_backoff_base * 2 ** attempt)
+        return random.uniform(0, ceiling)
+
+
+def _graph_usage(headers) -> Tuple[Optional[float], Optional[float]]:
+    """Highest Graph API usage percentage and regain time (seconds), if any."""
+    usage: Optional[float] = None
+    regain: Optional[float] = None
+    for name in _GRAPH_USAGE_HEADERS:
+        raw = headers.get(name)
+        if not raw:
+            continue
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            continue
+        # X-App-Usage is a flat dict; the business/ad headers nest lists of dicts
+        entries = [data] if "call_count" in data else [
+            e for v in data.values() for e in (v if isinstance(v, list) else [v])
+        ]
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            for field in ("call_count", "total_cputime", "total_time", "acc_id_util_pct"):
+                if isinstance(entry.get(field), (int, float)):
+                    usage = max(usage or 0.0, float(entry[field]))
+            minutes = entry.get("estimated_time_to_regain_access")
+            if isinstance(minutes, (int, float)) and minutes > 0:
+                regain = max(regain or 0.0, minutes * 60.0)
+    return usage, regain
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    value = response.headers.get("retry-after")
+    if value is not None:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    if response.status_code == 429:
+        # Telegram reports it in the body: {"parameters": {"retry_after": N}}
+        try:
+            params = response.json().get("parameters", {})
+            if isinstance(params.get("retry_after"), (int, float)):
+                return float(params["retry_after"])
+        except Exception:
+            return None
+    return None
+
+
+def credential_key(session: requests.Session, url: str, params=None) -> str:
+    """Stable, non-reversible id of the credential a request is sent with."""
+    query = parse_qs(urlparse(url).query)
+    secret = (
+        session.headers.get("Authorization")
+        or (params or {}).get("access_token")
+        or (query.get("access_token") or [None])[0]
+    )
+    path = urlparse(url).path
+    if not secret and "/bot" in path:
+        # Telegram embeds the bot token in the path
+        secret = path.split("/bot", 1)[1].split("/", 1)[0]
+    if not secret:
+        return urlparse(url).netloc
+    return hashlib.sha256(str(secret).encode("utf-8")).hexdigest()[:16]
+
+
+def endpoint_key(url: str) -> str:
+    """Endpoint template for a URL: host + path with id-like segments masked."""
+    parsed = urlparse(url)
+    segments = [
+        ":id" if re.search(r"\d", seg) and not _VERSION_SEGMENT.match(seg) else seg
+        for seg in parsed.path.split("/")
+    ]
+    return parsed.netloc + "/".join(segments)
+
+
+rate_limiter = RateLimitScheduler()
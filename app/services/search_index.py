@@ -0,0 +1,293 @@
+"""
+Full-text search over analyzed posts and their entities.
+
+Analyses are buffered and written in one transaction per flush to the
+search_documents table in the local store. Triggers mirror each row into
+post_search, an SQLite FTS5 inverted index (external content, unicode61
+tokens without diacritics) over three columns:
+
+    text           the post text
+    entity_terms   "PERSON Joko Widodo ; GPE Jakarta": each entity after its label
+    entity_labels  "PERSON GPE"
+
+A re-analyzed post updates its row in place. Posts are searchable once the
+worker flushes, within search_refresh_interval seconds of being analyzed.
+Hits are ranked by BM25, with entity matches weighted above text, or newest
+first. FTS5 walks matches in rowid (indexing) order, so newest-first stops
+after a page; BM25 needs every match scored, so it only ranks the newest
+search_rank_window of them.
+"""
+import json
+import threading
+import time
+from typing import List, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.dialects.sqlite import insert
+
+from app.core.config import settings
+from app.db.models import SearchDocument
+from app.db.store import SQLiteStore
+from app.schemas.analysis_result import (
+    NEREntity,
+    PostAnalysis,
+    SearchHit,
+    SearchResponse,
+    SentimentResult,
+)
+from app.schemas.data_ingestion import Post
+from app.services.background_worker import BackgroundWorker
+from app.services.watermarks import post_epoch
+
+_FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS post_search USING fts5(
+        text, entity_terms, entity_labels,
+        content='search_documents', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS search_documents_ai AFTER INSERT ON search_documents BEGIN
+        INSERT INTO post_search(rowid, text, entity_terms, entity_labels)
+        VALUES (new.id, new.text, new.entity_terms, new.entity_labels);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS search_documents_ad AFTER DELETE ON search_documents BEGIN
+        INSERT INTO post_search(post_search, rowid, text, entity_terms, entity_labels)
+        VALUES ('delete', old.id, old.text, old.entity_terms, old.entity_labels);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS search_documents_au AFTER UPDATE ON search_documents BEGIN
+        INSERT INTO post_search(post_search, rowid, text, entity_terms, entity_labels)
+        VALUES ('delete', old.id, old.text, old.entity_terms, old.entity_labels);
+        INSERT INTO post_search(rowid, text, entity_terms, entity_labels)
+        VALUES (new.id, new.text, new.entity_terms, new.entity_labels);
+    END""",
+]
+
+SORTS = ("relevance", "recent")
+# Matches newest first; bm25() is only worth computing under sort=relevance
+_MATCHES_SQL = """
+    SELECT post_search.rowid AS id, {score} AS score,
+           d.platform, d.post_id, d.author, d.text, d.entities,
+           d.sentiment_label, d.sentiment_score, d.posted_at
+    FROM post_search JOIN search_documents AS d ON d.id = post_search.rowid
+    WHERE post_search MATCH :match {filters}
+    ORDER BY post_search.rowid DESC
+"""
+_BM25 = "bm25(post_search, 1.0, 2.0, 0.5)"  # column weights: text, entity_terms, entity_labels
+
+
+def _quote(term: str) -> str:
+    """An FTS5 string: user input is never parsed as query syntax."""
+    return '"' + term.replace('"', '""') + '"'
+
+
+def build_match(
+    q: Optional[str] = None,
+    phrase: Optional[str] = None,
+    entity: Optional[str] = None,
+    label: Optional[str] = None,
+) -> str:
+    """
+    The FTS5 MATCH expression for a search; all given parts must match.
+
+    ``q`` is keywords (a trailing * makes one a prefix) over text and
+    entities, ``phrase`` an exact phrase in the text, ``entity`` an entity's
+    words (with ``label``, only as that label) and ``label`` alone any
+    entity with that label.
+
+    Raises:
+        ValueError: nothing searchable was given
+    """
+    clauses = []
+    keywords = []
+    for term in (q or "").split():
+        prefix = term.endswith("*")
+        term = term.rstrip("*")
+        if any(ch.isalnum() for ch in term):
+            keywords.append(_quote(term) + ("*" if prefix else ""))
+    if keywords:
+        clauses.append("{text entity_terms} : (" + " AND ".join(keywords) + ")")
+    if phrase and any(ch.isalnum() for ch in phrase):
+        clauses.append(f"text : {_quote(phrase)}")
+    if entity and any(ch.isalnum() for ch in entity):
+        clauses.append(f"entity_terms : {_quote(f'{label} {entity}' if label else entity)}")
+    elif label:
+        clauses.append(f"entity_labels : {_quote(label)}")
+    if not clauses:
+        raise ValueError("Give at least one of q, phrase, entity or label")
+    return " AND ".join(clauses)
+
+
+class SearchIndex(SQLiteStore, BackgroundWorker):
+    thread_name = "search-index"
+
+    def __init__(
+        self,
+        session_factory=None,
+        bind=None,
+        flush_rows: Optional[int] = None,
+        refresh_interval: Optional[float] = None,
+        rank_window: Optional[int] = None,
+    ):
+        SQLiteStore.__init__(self, session_factory, bind)
+        BackgroundWorker.__init__(self)
+        self.flush_rows = flush_rows or settings.search_flush_rows
+        self.refresh_interval = refresh_interval or settings.search_refresh_interval
+        self.rank_window = rank_window or settings.search_rank_window
+        self._buffer: dict = {}
+        self._buffer_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self.indexed = 0
+
+    def _create_tables(self) -> None:
+        super()._create_tables()
+        with self._session_factory() as db:
+            for statement in _FTS_DDL:
+                db.execute(text(statement))
+            db.commit()
+
+    def add(self, posts: Sequence[Post], items: Sequence[PostAnalysis]) -> None:
+        """Buffer analyses (aligned with their posts) for the next flush."""
+        if not posts:
+            return
+        now = time.time()
+        rows = {}
+        for post, item in zip(posts, items):
+            rows[(post.platform, post.id)] = {
+                "platform": post.platform,
+                "post_id": post.id,
+                "author": post.author,
+                "text": post.text,
+                "entities": json.dumps([[e.text, e.label] for e in item.entities]),
+                "entity_terms": " ; ".join(f"{e.label} {e.text}" for e in item.entities),
+                "entity_labels": " ".join(dict.fromkeys(e.label for e in item.entities)),
+                "sentiment_label": item.sentiment.label,
+                "sentiment_score": item.sentiment.score,
+                "posted_at": post_epoch(post) or now,
+            }
+        with self._buffer_lock:
+            # A post analyzed twice before a flush is indexed once, as its latest analysis
+            self._buffer.update(rows)
+            full = len(self._buffer) >= self.flush_rows
+        if full:
+            if self.running:
+                self._wake.set()
+            else:
+                self.flush()
+
+    def flush(self) -> int:
+        """
+        Index the buffered analyses now; returns how many were written. If
+        the write fails (e.g. the database is locked) they go back in the
+        buffer for the next flush, and the error is raised.
+        """
+        with self._flush_lock:
+            with self._buffer_lock:
+                buffered, self._buffer = self._buffer, {}
+            if not buffered:
+                return 0
+            rows = list(buffered.values())
+            stmt = insert(SearchDocument)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["platform", "post_id"],
+                set_={c: stmt.excluded[c] for c in rows[0] if c not in ("platform", "post_id")},
+            )
+            try:
+                with self._session() as db:
+                    db.execute(stmt, rows)
+                    db.commit()
+            except BaseException:
+                with self._buffer_lock:
+                    # Analyses added meanwhile are newer than the ones put back
+                    buffered.update(self._buffer)
+                    self._buffer = buffered
+                raise
+            self.indexed += len(rows)
+            return len(rows)
+
+    def search(
+        self,
+        q: Optional[str] = None,
+        phrase: Optional[str] = None,
+        entity: Optional[str] = None,
+        label: Optional[str] = None,
+        platform: Optional[str] = None,
+        author: Optional[str] = None,
+        sort: str = "relevance",
+        limit: int = 20,
+        offset: int = 0,
+    ) -> SearchResponse:
+        """
+        Hits for a search (see build_match), optionally only on one platform
+        or by one author.
+
+        ``relevance`` ranks the newest ``rank_window`` matches by BM25: exact
+        for selective queries, and it keeps a query matching most of the
+        index from scoring every match. ``recent`` is newest first.
+
+        Raises:
+            ValueError: nothing searchable was given, or an unknown sort
+        """
+        if sort not in SORTS:
+            raise ValueError(f"sort must be one of {', '.join(SORTS)}")
+        started = time.perf_counter()
+        match = build_match(q=q, phrase=phrase, entity=entity, label=label)
+        params = {"match": match, "limit": limit + 1, "offset": offset}
+        filters = ""
+        if platform:
+            filters += " AND d.platform = :platform"
+            params["platform"] = platform
+        if author:
+            filters += " AND d.author = :author"
+            params["author"] = author
+        if sort == "relevance":
+            params["window"] = max(self.rank_window, offset + limit + 1)
+            sql = (f"SELECT * FROM ({_MATCHES_SQL.format(score=_BM25, filters=filters)} LIMIT :window) "
+                   "ORDER BY score LIMIT :limit OFFSET :offset")
+        else:
+            sql = _MATCHES_SQL.format(score="0.0", filters=filters) + " LIMIT :limit OFFSET :offset"
+        with self._session() as db:
+            rows = db.execute(text(sql), params).mappings().all()
+            page = rows[:limit]
+            snippets = {}
+            if page:
+                ids = {f"id{i}": row["id"] for i, row in enumerate(page)}
+                snippets = dict(db.execute(text(
+                    "SELECT rowid, snippet(post_search, 0, '[', ']', '…', 16) FROM post_search "
+                    f"WHERE post_search MATCH :match AND rowid IN ({', '.join(':' + k for k in ids)})"
+                ), {"match": match, **ids}).all())
+        hits = [
+            SearchHit(
+                post_id=row["post_id"],
+                platform=row["platform"],
+                author=row["author"],
+                text=row["text"],
+                snippet=snippets.get(row["id"]) or row["text"],
+                sentiment=SentimentResult(label=row["sentiment_label"], score=row["sentiment_score"]),
+                entities=[NEREntity(text=t, label=l) for t, l in json.loads(row["entities"])],
+                posted_at=row["posted_at"],
+                score=round(-row["score"], 4),
+            )
+            for row in page
+        ]
+        return SearchResponse(
+            query=match,
+            hits=hits,
+            next_offset=offset + limit if len(rows) > limit else None,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 3),
+        )
+
+    def run_once(self) -> int:
+        self._wake.clear()
+        return self.flush()
+
+    def _idle(self) -> None:
+        self._wake.wait(self.refresh_interval)
+
+    def _interrupt(self) -> None:
+        self._wake.set()
+
+    def _after_stop(self) -> None:
+        self.flush()
+
+
+search_index = SearchIndex()
@@ -0,0 +1,332 @@
+"""
+Columnar sentiment statistics over every analyzed post.
+
+analyze_posts appends each post's score, label, platform, author and
+timestamp to NumPy arrays, with platform and author dictionary-encoded as
+integer codes. The /stats aggregations are then a few vectorized passes
+(bincount over group codes) instead of Python loops, and stay in the
+milliseconds over millions of posts. Percentiles are read off a per-group
+histogram with 0.001 resolution rather than by sorting.
+
+A re-analyzed post (same platform and id) overwrites its row; posts are
+found by a 64-bit hash of their key, so the per-post index is an int-to-int
+dict rather than string tuples. Posts without a parseable timestamp are
+bucketed at the time they were analyzed. Past ``max_posts`` the oldest rows
+are dropped. At startup the arrays are
+seeded from the Parquet post store (load()).
+"""
+import hashlib
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+from app.schemas.analysis_result import SentimentResult, SentimentStatsResponse, StatsGroup
+from app.schemas.data_ingestion import Post
+from app.services.watermarks import post_epoch
+
+GROUP_BY = ("none", "platform", "author", "time")
+_LABELS = ("positive", "neutral", "negative")
+_LABEL_CODES = {label: code for code, label in enumerate(_LABELS)}
+# Scores are VADER compounds in [-1, 1]
+_PCT_BINS = 2000
+# Longest span of time buckets one query may cover
+_MAX_BUCKETS = 1_000_000
+_COLUMNS = {
+    "score": np.float32,
+    "bin": np.int16,  # score's 0.001-wide bin in [0, _PCT_BINS)
+    "label": np.int8,
+    "platform": np.int32,
+    "author": np.int32,
+    "time": np.float64,
+    "key": np.int64,  # _key_hash(platform, post_id)
+}
+
+
+def _key_hash(platform: str, post_id: str) -> int:
+    digest = hashlib.blake2b(f"{platform}\x00{post_id}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+class _Codes:
+    """Dictionary encoding of a string column."""
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+        self.names: List[str] = []
+
+    def encode(self, name: str) -> int:
+        code = self.codes.get(name)
+        if code is None:
+            code = self.codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+
+class SentimentStats:
+    def __init__(self, max_posts: Optional[int] = None):
+        self.max_posts = max_posts or settings.stats_max_posts
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._n = 0
+            self._cols = {name: np.empty(1024, dtype) for name, dtype in _COLUMNS.items()}
+            # Key hash -> row number; rows are numbered from _base, the
+            # number of rows evicted so far
+            self._rows: Dict[int, int] = {}
+            self._base = 0
+            self._platforms = _Codes()
+            self._authors = _Codes()
+            # Keys written by an in-progress load(), which later stored rows may replace
+            self._seeding: Optional[set] = None
+
+    def __len__(self) -> int:
+        return self._n
+
+    def add(self, posts: Sequence[Post], sentiments: Sequence[SentimentResult]) -> None:
+        if not posts:
+            return
+        now = time.time()
+        self._write(
+            keys=[(p.platform, p.id) for p in posts],
+            authors=[p.author for p in posts],
+            scores=np.array([s.score for s in sentiments], dtype=np.float64),
+            labels=[_LABEL_CODES[s.label] for s in sentiments],
+            times=[post_epoch(p) or now for p in posts],
+        )
+
+    def load(self, batches: Iterable) -> int:
+        """
+        Seed from stored history: record batches with platform, post_id,
+        author, sentiment_label, sentiment_score and time columns, oldest
+        first. Rows added by add() meanwhile are newer and are kept.
+        """
+        loaded = 0
+        with self._lock:
+            self._seeding = set()
+        try:
+            for batch in batches:
+                column = batch.column
+                millis = column("time").to_numpy().astype("datetime64[ms]").astype(np.int64)
+                self._write(
+                    keys=list(zip(column("platform").to_pylist(), column("post_id").to_pylist())),
+                    authors=column("author").to_pylist(),
+                    scores=column("sentiment_score").to_numpy().astype(np.float64),
+                    labels=[_LABEL_CODES[label] for label in column("sentiment_label").to_pylist()],
+                    times=millis / 1000,
+                    seed=True,
+                )
+                loaded += batch.num_rows
+        finally:
+            with self._lock:
+                self._seeding = None
+        return loaded
+
+    def _write(self, keys, authors, scores, labels, times, seed: bool = False) -> None:
+        with self._lock:
+            rows, keep, hashes = [], [], []
+            size = self._n
+            for i, key in enumerate(keys):
+                h = _key_hash(*key)
+                row = self._rows.get(h)
+                if seed:
+                    if row is not None and h not in self._seeding:
+                        continue
+                    self._seeding.add(h)
+                elif self._seeding:
+                    self._seeding.discard(h)
+                if row is None:
+                    row = self._rows[h] = self._base + size
+                    size += 1
+                rows.append(row)
+                keep.append(i)
+                hashes.append(h)
+            if not rows:
+                return
+            if len(keep) < len(keys):
+                scores = scores[keep]
+                keys, authors, labels, times = (
+                    [values[i] for i in keep] for values in (keys, authors, labels, times))
+            self._reserve(size)
+            idx = np.array(rows, dtype=np.int64) - self._base
+            cols = self._cols
+            cols["score"][idx] = scores
+            cols["bin"][idx] = np.clip(((scores + 1) / 2 * _PCT_BINS).astype(np.int64), 0, _PCT_BINS - 1)
+            cols["label"][idx] = labels
+            cols["platform"][idx] = [self._platforms.encode(platform) for platform, _ in keys]
+            cols["author"][idx] = [self._authors.encode(author) for author in authors]
+            cols["time"][idx] = times
+            cols["key"][idx] = hashes
+            self._n = size
+            if self._n > self.max_posts:
+                # Drop a tenth at a time so eviction isn't paid on every add
+                self._evict(self._n - self.max_posts + self.max_posts // 10)
+
+    def _reserve(self, n: int) -> None:
+        capacity = len(self._cols["score"])
+        if n <= capacity:
+            return
+        while capacity < n:
+            capacity *= 2
+        for name, col in self._cols.items():
+            grown = np.empty(capacity, col.dtype)
+            grown[:self._n] = col[:self._n]
+            self._cols[name] = grown
+
+    def _evict(self, k: int) -> None:
+        for h in self._cols["key"][:k].tolist():
+            del self._rows[h]
+        for name, col in self._cols.items():
+            self._cols[name] = col[k:].copy()
+        self._base += k
+        self._n -= k
+
+    def query(
+        self,
+        group_by: str = "platform",
+        bucket_seconds: int = 3600,
+        window: int = 1,
+        platform: Optional[str] = None,
+        author: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        top: int = 50,
+        bins: int = 20,
+        percentiles: Sequence[float] = (50, 90, 99),
+    ) -> SentimentStatsResponse:
+        """
+        Counts, mean score, histogram and percentiles per group.
+
+        Groups are platforms or authors (the ``top`` largest), time buckets
+        of ``bucket_seconds`` (the ``top`` latest, each with the mean score
+        over the trailing ``window`` buckets), or one group of everything.
+
+        Raises:
+            ValueError: unknown group_by, ``bins`` doesn't divide 2000, or the
+                time range spans too many buckets
+        """
+        if group_by not in GROUP_BY:
+            raise ValueError(f"group_by must be one of {', '.join(GROUP_BY)}")
+        started = time.perf_counter()
+        with self._lock:
+            n = self._n
+            cols = {name: col[:n] for name, col in self._cols.items()}
+            platform_code = self._platforms.codes.get(platform) if platform else None
+            author_code = self._authors.codes.get(author) if author else None
+            names = {"platform": list(self._platforms.names), "author": list(self._authors.names)}
+
+        if bins <= 0 or _PCT_BINS % bins:
+            raise ValueError(f"bins must divide {_PCT_BINS}")
+        filters = []
+        if platform:
+            filters.append(cols["platform"] == (-1 if platform_code is None else platform_code))
+        if author:
+            filters.append(cols["author"] == (-1 if author_code is None else author_code))
+        if since:
+            filters.append(cols["time"] >= _epoch(since))
+        if until:
+            filters.append(cols["time"] < _epoch(until))
+        if filters:
+            mask = np.logical_and.reduce(filters)
+            needed = {"score", "bin", "label", group_by}
+            cols = {name: col[mask] for name, col in cols.items() if name in needed}
+        score, label, score_bin = cols["score"], cols["label"], cols["bin"]
+
+        # Group codes 0..n_groups-1 for each selected row
+        first_bucket = 0
+        if group_by == "time":
+            buckets = np.floor(cols["time"] / bucket_seconds).astype(np.int64)
+            first_bucket = int(buckets.min()) if len(buckets) else 0
+            codes = buckets - first_bucket
+            n_groups = int(codes.max()) + 1 if len(codes) else 0
+            if n_groups > _MAX_BUCKETS:
+                raise ValueError(
+                    f"{n_groups} time buckets; use a larger bucket or a narrower since/until")
+        elif group_by == "none":
+            codes = np.zeros(len(score), dtype=np.int64)
+            n_groups = 1 if len(score) else 0
+        else:
+            codes = cols[group_by].astype(np.int64)
+            n_groups = len(names[group_by])
+
+        by_label = np.bincount(codes * 3 + label, minlength=n_groups * 3).reshape(n_groups, 3)
+        count = by_label.sum(axis=1)
+        total = np.bincount(codes, weights=score, minlength=n_groups)
+
+        if group_by == "time":
+            selected = np.flatnonzero(count)[-top:]
+        else:
+            selected = np.argsort(-count, kind="stable")[:top]
+            selected = selected[count[selected] > 0]
+
+        # Score distributions only for the selected groups
+        if len(selected) == n_groups:
+            row_slot, row_bin = codes, score_bin
+        else:
+            slot = np.full(n_groups, -1, dtype=np.int64)
+            slot[selected] = np.arange(len(selected))
+            row_slot = slot[codes]
+            keep = row_slot >= 0
+            row_slot, row_bin = row_slot[keep], score_bin[keep]
+        fine = np.bincount(
+            row_slot * _PCT_BINS + row_bin, minlength=len(selected) * _PCT_BINS,
+        ).reshape(len(selected), _PCT_BINS)
+        histograms = fine.reshape(len(selected), bins, _PCT_BINS // bins).sum(axis=2)
+        cumulative = fine.cumsum(axis=1)
+        quantiles = {}
+        for q in percentiles:
+            # Nearest rank; the value is the center of that rank's bin
+            rank = np.maximum(np.ceil(q / 100 * count[selected]), 1)
+            index = (cumulative < rank[:, None]).sum(axis=1)
+            quantiles[f"p{q:g}"] = -1 + (index + 0.5) * 2 / _PCT_BINS
+
+        rolling = None
+        if group_by == "time" and n_groups:
+            sums = np.concatenate(([0.0], np.cumsum(total)))
+            counts = np.concatenate(([0], np.cumsum(count)))
+            lo = np.maximum(selected + 1 - window, 0)
+            rolling_count = counts[selected + 1] - counts[lo]
+            rolling = (sums[selected + 1] - sums[lo]) / np.maximum(rolling_count, 1)
+
+        groups = []
+        for i, code in enumerate(selected.tolist()):
+            if group_by == "time":
+                key = datetime.fromtimestamp(
+                    (first_bucket + code) * bucket_seconds, tz=timezone.utc).isoformat()
+            elif group_by == "none":
+                key = "all"
+            else:
+                key = names[group_by][code]
+            positive, neutral, negative = by_label[code].tolist()
+            groups.append(StatsGroup(
+                key=key,
+                count=int(count[code]),
+                positive=positive,
+                neutral=neutral,
+                negative=negative,
+                mean_score=round(float(total[code] / count[code]), 4),
+                rolling_mean=None if rolling is None else round(float(rolling[i]), 4),
+                percentiles={name: round(float(values[i]), 4) for name, values in quantiles.items()},
+                histogram=histograms[i].tolist(),
+            ))
+        return SentimentStatsResponse(
+            group_by=group_by,
+            total_posts=len(score),
+            histogram_edges=np.linspace(-1, 1, bins + 1).round(4).tolist(),
+            groups=groups,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 3),
+        )
+
+
+def _epoch(dt: datetime) -> float:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+sentiment_stats = SentimentStats()
@@ -0,0 +1,134 @@
+"""
+Incremental NDJSON analysis for /analyze/stream.
+
+The upload is first spooled to a temporary file (kept in memory only while
+small), since the request body can't be read once the streaming response has
+started. Posts are then parsed line by line from the spool and analyzed in
+micro-batches; each batch's results are written out before the next batch is
+read. Memory is bounded by the batch size and the longest line, not by the
+size of the upload.
+"""
+import json
+from tempfile import SpooledTemporaryFile
+from typing import IO, AsyncIterator, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+
+from app.schemas.analysis_result import AnalysisStats
+from app.schemas.data_ingestion import Post
+from app.services.graph_writer import GraphQueueFull
+from app.services.nlp_service import analyze_posts, persist_knowledge_graph
+
+# Longest accepted NDJSON line; longer lines are reported and skipped
+MAX_LINE_BYTES = 1 << 20
+# Uploads larger than this are spooled to disk
+SPOOL_MAX_MEMORY = 8 << 20
+READ_CHUNK_BYTES = 64 << 10
+
+
+def _line(kind: str, **fields) -> str:
+    return json.dumps({"kind": kind, **fields}) + "\n"
+
+
+async def spool_body(chunks: AsyncIterator[bytes]) -> IO[bytes]:
+    """Copy a request body into a rewound temporary file."""
+    spool = SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    async for chunk in chunks:
+        await run_in_threadpool(spool.write, chunk)
+    spool.seek(0)
+    return spool
+
+
+async def iter_file_chunks(f: IO[bytes]) -> AsyncIterator[bytes]:
+    while True:
+        chunk = await run_in_threadpool(f.read, READ_CHUNK_BYTES)
+        if not chunk:
+            return
+        yield chunk
+
+
+async def iter_ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Split a byte stream into lines without buffering more than one line."""
+    # Pieces of the current line from earlier chunks, joined once it ends
+    head: List[bytes] = []
+    size = 0
+    skipping = False
+    async for chunk in chunks:
+        *complete, tail = chunk.split(b"\n")
+        for line in complete:
+            if skipping:
+                skipping = False
+                continue
+            if head:
+                head.append(line)
+                line = b"".join(head)
+                head, size = [], 0
+            yield line
+        if tail and not skipping:
+            head.append(tail)
+            size += len(tail)
+            if size > MAX_LINE_BYTES:
+                # Yield the oversized prefix so it is reported, drop the rest of the line
+                yield b"".join(head)
+                head, size = [], 0
+                skipping = True
+    if head:
+        yield b"".join(head)
+
+
+async def analyze_ndjson(
+    chunks: AsyncIterator[bytes],
+    batch_size: int,
+    persist_graph: bool = True,
+    ner_backend: Optional[str] = None,
+) -> AsyncIterator[str]:
+    """
+    Analyze an NDJSON stream of posts, yielding NDJSON output lines.
+
+    Emits a ``post`` line per PostAnalysis, an ``error`` line for each input
+    line that isn't a valid Post (and for graph batches that couldn't be
+    queued), and a final ``stats`` line with the AnalysisStats totals and the
+    graph job ids.
+    """
+    stats = AnalysisStats(total_posts=0, positive=0, neutral=0, negative=0)
+    graph_job_ids: List[str] = []
+    batch: List[Post] = []
+    line_no = 0
+
+    async def flush() -> AsyncIterator[str]:
+        result = await run_in_threadpool(analyze_posts, batch, ner_backend)
+        stats.total_posts += result.stats.total_posts
+        stats.positive += result.stats.positive
+        stats.neutral += result.stats.neutral
+        stats.negative += result.stats.negative
+        for item in result.items:
+            yield _line("post", **item.model_dump())
+        if persist_graph:
+            try:
+                graph_job_ids.append(await run_in_threadpool(
+                    persist_knowledge_graph, result, False))
+            except GraphQueueFull as e:
+                yield _line("error", line=line_no, detail=str(e))
+
+    async for raw in iter_ndjson_lines(chunks):
+        line_no += 1
+        if not raw.strip():
+            continue
+        if len(raw) > MAX_LINE_BYTES:
+            yield _line("error", line=line_no, detail="Line too long")
+            continue
+        try:
+            batch.append(Post.model_validate_json(raw))
+        except ValidationError as e:
+            yield _line("error", line=line_no, detail=str(e.errors()[0].get("msg", e)))
+            continue
+        if len(batch) >= batch_size:
+            async for out in flush():
+                yield out
+            batch = []
+
+    if batch:
+        async for out in flush():
+            yield out
+    yield _line("stats", **stats.model_dump(), graph_job_ids=graph_job_ids)
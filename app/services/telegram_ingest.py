@@ -0,0 +1,140 @@
+"""
+Long-polling Telegram ingestion worker.
+
+A single thread calls getUpdates with a long-poll ``timeout`` and the
+persisted update offset, so each update is read once instead of the whole
+backlog being rescanned per request. Each round's messages are grouped by
+chat, analyzed and queued for the knowledge graph per chat. They are also
+kept in the per-chat ChatBuffer that TelegramFetcher serves while the worker
+runs.
+
+The offset is stored (and so acknowledged to Telegram) only after a round
+has been handed to the pipeline; a crash redelivers that round instead of
+dropping it.
+"""
+import logging
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.schemas.data_ingestion import Post, TelegramIngestStats
+from app.services.background_worker import BackgroundWorker
+from app.services.chat_buffer import ChatBuffer, telegram_chats
+from app.services.data_fetcher import TelegramFetcher
+from app.services.rate_limiter import credential_key
+from app.services.watermarks import Watermark, advance, is_newer, watermark_store
+
+logger = logging.getLogger(__name__)
+
+ChatHandler = Callable[[str, List[Post]], None]
+
+
+def analyze_chat(chat_id: str, posts: List[Post]) -> None:
+    """Default handler: analyze a chat's new messages and queue them for the graph."""
+    from app.services.nlp_service import analyze_posts, persist_knowledge_graph
+
+    persist_knowledge_graph(analyze_posts(posts), clear_existing=False)
+
+
+class TelegramIngestWorker(BackgroundWorker):
+    """Background getUpdates consumer with a persisted offset."""
+
+    thread_name = "telegram-ingest"
+
+    def __init__(
+        self,
+        fetcher: Optional[TelegramFetcher] = None,
+        handler: Optional[ChatHandler] = None,
+        poll_timeout: Optional[int] = None,
+        buffer: Optional[ChatBuffer] = None,
+    ):
+        super().__init__()
+        self._fetcher = fetcher
+        self._handler = handler or analyze_chat
+        self.poll_timeout = settings.telegram_poll_timeout if poll_timeout is None else poll_timeout
+        self.buffer = buffer if buffer is not None else ChatBuffer()
+        self.offset: Optional[int] = None
+        self.updates = 0
+        self.messages = 0
+        self.last_poll_at: Optional[float] = None
+
+    @property
+    def fetcher(self) -> TelegramFetcher:
+        if self._fetcher is None:
+            self._fetcher = TelegramFetcher()
+        return self._fetcher
+
+    def _offset_account(self) -> str:
+        # The offset belongs to the bot, not to a chat
+        return "updates:" + credential_key(self.fetcher.session, self.fetcher._api_url("getUpdates"))
+
+    def _before_start(self) -> bool:
+        if not self.fetcher.bot_token:
+            logger.warning("Telegram bot token not configured; ingestion worker not started")
+            return False
+        mark = watermark_store.get("telegram", self._offset_account())
+        self.offset = mark.update_offset if mark else None
+        self.buffer.live = True
+        return True
+
+    def _after_stop(self) -> None:
+        # The in-flight poll may outlive stop(timeout) by up to poll_timeout
+        self.buffer.live = False
+
+    def run_once(self) -> int:
+        # getUpdates long-polls, so an empty round needs no extra idling
+        return self.poll_once()
+
+    def poll_once(self) -> int:
+        """Run one getUpdates round; returns the number of updates consumed."""
+        updates = self.fetcher.get_updates(
+            offset=self.offset, limit=settings.telegram_poll_limit, timeout=self.poll_timeout)
+        self.last_poll_at = time.time()
+        if updates is None:
+            raise RuntimeError("getUpdates failed")
+        if not updates:
+            return 0
+
+        by_chat: Dict[str, List[Post]] = defaultdict(list)
+        for update in updates:
+            found = self.fetcher.update_post(update)
+            if found:
+                chat_id, post = found
+                by_chat[chat_id].append(post)
+
+        for chat_id, posts in by_chat.items():
+            # Skip messages a failed earlier attempt at this round already handled
+            mark = watermark_store.get("telegram", chat_id)
+            posts = [p for p in posts if is_newer(p, mark)]
+            if not posts:
+                continue
+            self._handler(chat_id, posts)
+            self.buffer.extend(chat_id, posts)
+            moved = advance(mark, posts)
+            if moved is not None:
+                watermark_store.save("telegram", chat_id, moved)
+
+        self.offset = max(u["update_id"] for u in updates) + 1
+        watermark_store.save("telegram", self._offset_account(), Watermark(update_offset=self.offset))
+        self.updates += len(updates)
+        self.messages += sum(len(posts) for posts in by_chat.values())
+        return len(updates)
+
+    def recent(self, chat_id: str) -> List[Post]:
+        """Buffered messages of a chat, newest first."""
+        return self.buffer.recent(chat_id)
+
+    def stats(self) -> TelegramIngestStats:
+        return TelegramIngestStats(
+            running=self.running,
+            offset=self.offset,
+            updates=self.updates,
+            messages=self.messages,
+            chats=len(self.buffer),
+            errors=self.errors,
+            last_poll_at=self.last_poll_at,
+        )
+
+
+telegram_ingest = TelegramIngestWorker(buffer=telegram_chats)
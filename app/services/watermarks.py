@@ -0,0 +1,104 @@
+"""
+Per-account fetch watermarks.
+
+A watermark records the newest item already ingested for a (platform,
+account) pair, so later fetches can ask the platform for newer items only
+(Twitter ``since_id``, Graph API ``since``) or stop paging once they reach
+known items. Telegram's bot-wide getUpdates offset is kept here too.
+"""
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from app.db.models import FetchWatermark
+from app.db.store import SQLiteStore
+from app.schemas.data_ingestion import Post
+
+
+@dataclass(frozen=True)
+class Watermark:
+    since_id: Optional[str] = None
+    since_ts: Optional[float] = None
+    update_offset: Optional[int] = None
+
+
+def post_epoch(post: Post) -> Optional[float]:
+    """Post timestamp as epoch seconds (naive timestamps are taken as UTC)."""
+    if not post.timestamp:
+        return None
+    raw = post.timestamp
+    # Graph API sends "+0000" offsets, which fromisoformat doesn't accept
+    if len(raw) > 5 and raw[-5] in "+-" and raw[-4:].isdigit():
+        raw = f"{raw[:-2]}:{raw[-2:]}"
+    try:
+        parsed = datetime.fromisoformat(raw)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def is_newer(post: Post, mark: Optional[Watermark]) -> bool:
+    """Whether ``post`` is past the watermark (by id when both are numeric)."""
+    if mark is None:
+        return True
+    if mark.since_id and mark.since_id.isdigit() and post.id.isdigit():
+        return int(post.id) > int(mark.since_id)
+    if mark.since_ts is not None:
+        ts = post_epoch(post)
+        return ts is None or ts > mark.since_ts
+    return True
+
+
+def advance(mark: Optional[Watermark], posts: Iterable[Post]) -> Optional[Watermark]:
+    """The watermark after ingesting ``posts``; None if nothing moved it."""
+    since_id = mark.since_id if mark else None
+    since_ts = mark.since_ts if mark else None
+    moved = False
+    for post in posts:
+        if post.id.isdigit() and (
+            not since_id or not since_id.isdigit() or int(post.id) > int(since_id)
+        ):
+            since_id, moved = post.id, True
+        ts = post_epoch(post)
+        if ts is not None and (since_ts is None or ts > since_ts):
+            since_ts, moved = ts, True
+    if not moved:
+        return None
+    return Watermark(since_id, since_ts, mark.update_offset if mark else None)
+
+
+class WatermarkStore(SQLiteStore):
+    """SQLite-backed watermark table."""
+
+    def get(self, platform: str, account: str) -> Optional[Watermark]:
+        with self._session() as db:
+            row = db.get(FetchWatermark, (platform, account))
+            if row is None:
+                return None
+            return Watermark(row.since_id, row.since_ts, row.update_offset)
+
+    def save(self, platform: str, account: str, mark: Watermark) -> None:
+        with self._session() as db:
+            db.merge(FetchWatermark(
+                platform=platform,
+                account=account,
+                since_id=mark.since_id,
+                since_ts=mark.since_ts,
+                update_offset=mark.update_offset,
+                updated_at=time.time(),
+            ))
+            db.commit()
+
+    def reset(self, platform: str, account: str) -> None:
+        """Forget an account's watermark so the next fetch starts over."""
+        with self._session() as db:
+            row = db.get(FetchWatermark, (platform, account))
+            if row is not None:
+                db.delete(row)
+                db.commit()
+
+
+watermark_store = WatermarkStore()
@@ -0,0 +1,205 @@
+"""
+Buffered ingestion of WhatsApp Cloud API webhook messages.
+
+The webhook handler only parses the payload and appends its messages to the
+``whatsapp_messages`` table in one insert, so the acknowledgement Meta waits
+for costs a single local transaction regardless of what happens downstream.
+A worker thread drains unprocessed rows in batches into analyze_posts and the
+graph write queue, marking them processed afterwards. Stored messages double
+as WhatsAppFetcher's history, queried through the (sender, timestamp) index.
+"""
+import hashlib
+import hmac
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import and_, or_
+from sqlalchemy.dialects.sqlite import insert
+
+from app.core.config import settings
+from app.db.models import WhatsAppMessage
+from app.db.store import SQLiteStore
+from app.schemas.data_ingestion import Post, WhatsAppIngestStats
+from app.services.background_worker import BackgroundWorker
+
+BatchHandler = Callable[[List[Post]], None]
+
+# Message types whose text we analyze, and where it lives
+_TEXT_FIELDS = {
+    "text": "body",
+    "image": "caption",
+    "video": "caption",
+    "document": "caption",
+}
+
+
+def verify_signature(body: bytes, header: Optional[str], app_secret: str) -> bool:
+    """Check Meta's X-Hub-Signature-256 (HMAC-SHA256 of the raw body)."""
+    if not header or not header.startswith("sha256="):
+        return False
+    expected = hmac.new(app_secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, header[len("sha256="):])
+
+
+def parse_webhook(payload: Dict[str, Any], received_at: Optional[float] = None) -> List[dict]:
+    """Buffer rows for the text-bearing messages in a webhook payload."""
+    received_at = received_at or time.time()
+    rows = []
+    for entry in payload.get("entry", []):
+        for change in entry.get("changes", []):
+            value = change.get("value", {})
+            names = {
+                c.get("wa_id"): c.get("profile", {}).get("name")
+                for c in value.get("contacts", [])
+            }
+            phone_number_id = value.get("metadata", {}).get("phone_number_id")
+            for message in value.get("messages", []):
+                field = _TEXT_FIELDS.get(message.get("type"))
+                text = message.get(message.get("type"), {}).get(field) if field else None
+                if not text or not message.get("id") or not message.get("from"):
+                    continue
+                rows.append({
+                    "id": message["id"],
+                    "phone_number_id": phone_number_id,
+                    "sender": message["from"],
+                    "sender_name": names.get(message["from"]),
+                    "text": text,
+                    "timestamp": float(message.get("timestamp") or received_at),
+                    "received_at": received_at,
+                    "processed": False,
+                })
+    return rows
+
+
+def to_post(row: WhatsAppMessage) -> Post:
+    return Post(
+        id=row.id,
+        platform="whatsapp",
+        author=row.sender_name or row.sender,
+        author_id=row.sender,
+        text=row.text,
+        timestamp=datetime.fromtimestamp(row.timestamp, tz=timezone.utc).isoformat(),
+        url=None,
+    )
+
+
+def analyze_batch(posts: List[Post]) -> None:
+    """Default handler: analyze a batch and queue it for the graph."""
+    from app.services.nlp_service import analyze_posts, persist_knowledge_graph
+
+    persist_knowledge_graph(analyze_posts(posts), clear_existing=False)
+
+
+class WhatsAppIngest(SQLiteStore, BackgroundWorker):
+    """Durable message buffer plus the worker that drains it."""
+
+    thread_name = "whatsapp-ingest"
+
+    def __init__(
+        self,
+        session_factory=None,
+        bind=None,
+        handler: Optional[BatchHandler] = None,
+        batch_size: Optional[int] = None,
+    ):
+        SQLiteStore.__init__(self, session_factory, bind)
+        BackgroundWorker.__init__(self)
+        self._handler = handler or analyze_batch
+        self.batch_size = batch_size or settings.whatsapp_ingest_batch_size
+        self._wake = threading.Event()
+        self.received = 0
+        self.processed = 0
+        self.batches = 0
+
+    def append(self, rows: List[dict]) -> int:
+        """Durably buffer webhook rows (redeliveries are ignored) and wake the worker."""
+        if not rows:
+            return 0
+        stmt = insert(WhatsAppMessage).on_conflict_do_nothing(index_elements=["id"])
+        with self._session() as db:
+            inserted = db.connection().execute(stmt, rows).rowcount
+            db.commit()
+        self.received += len(rows)
+        self._wake.set()
+        return inserted
+
+    def drain_once(self) -> int:
+        """Hand the oldest batch of unprocessed messages to the pipeline."""
+        with self._session() as db:
+            rows = (
+                db.query(WhatsAppMessage)
+                .filter(WhatsAppMessage.processed.is_(False))
+                .order_by(WhatsAppMessage.received_at, WhatsAppMessage.id)
+                .limit(self.batch_size)
+                .all()
+            )
+            if not rows:
+                return 0
+            posts = [to_post(row) for row in rows]
+            self._handler(posts)
+            db.query(WhatsAppMessage).filter(
+                WhatsAppMessage.id.in_([row.id for row in rows])
+            ).update({"processed": True}, synchronize_session=False)
+            db.commit()
+        self.processed += len(posts)
+        self.batches += 1
+        return len(posts)
+
+    def iter_messages(
+        self,
+        sender: str,
+        page_size: int = 100,
+        since_ts: Optional[float] = None,
+    ) -> Iterator[Post]:
+        """A sender's stored messages, newest first, keyset-paged on the index."""
+        after = None
+        while True:
+            with self._session() as db:
+                query = db.query(WhatsAppMessage).filter(WhatsAppMessage.sender == sender)
+                if since_ts is not None:
+                    query = query.filter(WhatsAppMessage.timestamp > since_ts)
+                if after is not None:
+                    query = query.filter(or_(
+                        WhatsAppMessage.timestamp < after[0],
+                        and_(WhatsAppMessage.timestamp == after[0], WhatsAppMessage.id < after[1]),
+                    ))
+                rows = (
+                    query.order_by(WhatsAppMessage.timestamp.desc(), WhatsAppMessage.id.desc())
+                    .limit(page_size)
+                    .all()
+                )
+                posts = [to_post(row) for row in rows]
+            yield from posts
+            if len(rows) < page_size:
+                return
+            after = (rows[-1].timestamp, rows[-1].id)
+
+    def pending(self) -> int:
+        with self._session() as db:
+            return db.query(WhatsAppMessage).filter(WhatsAppMessage.processed.is_(False)).count()
+
+    def stats(self) -> WhatsAppIngestStats:
+        return WhatsAppIngestStats(
+            running=self.running,
+            pending=self.pending(),
+            received=self.received,
+            processed=self.processed,
+            batches=self.batches,
+            errors=self.errors,
+        )
+
+    def run_once(self) -> int:
+        self._wake.clear()
+        return self.drain_once()
+
+    def _idle(self) -> None:
+        # Buffer empty: sleep until a webhook arrives (or the poll interval passes)
+        self._wake.wait(settings.whatsapp_ingest_interval)
+
+    def _interrupt(self) -> None:
+        self._wake.set()
+
+
+whatsapp_ingest = WhatsAppIngest()
@@ -4,6 +4,7 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import networkx as nx
 import os
+import time
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
@@ -41,6 +42,48 @@ DEFAULT_API_BASE = os.getenv("API_BASE_URL", "http://localhost:8080")
 st.sidebar.title("⚙️ Configuration")
 API_BASE = st.sidebar.text_input("API Base URL", DEFAULT_API_BASE)
 
+# Larger inputs go through the bulk job API instead of one long request
+JOB_THRESHOLD = 200
+
+
+class _JobResult:
+    """Adapts a finished bulk job to the /analyze response shape."""
+
+    def __init__(self, ok, data=None, status_code=200, text=""):
+        self.ok = ok
+        self._data = data
+        self.status_code = status_code
+        self.text = text
+
+    def json(self):
+        return self._data
+
+
+def run_analysis_job(posts):
+    """Submit posts as a bulk job, show its progress and collect the results."""
+    resp = requests.post(f"{API_BASE}/api/v1/jobs", json={"posts": posts}, timeout=30)
+    if not resp.ok:
+        return resp
+    job = resp.json()
+    progress = st.progress(0.0, text="Queued...")
+    while job["status"] in ("queued", "running"):
+        time.sleep(1)
+        job = requests.get(f"{API_BASE}/api/v1/jobs/{job['job_id']}", timeout=10).json()
+        eta = f", ~{job['eta_seconds']:.0f}s left" if job.get("eta_seconds") else ""
+        progress.progress(job["done_posts"] / max(job["total_posts"], 1),
+                          text=f"{job['done_posts']}/{job['total_posts']} posts{eta}")
+    if job["status"] != "done":
+        return _JobResult(False, status_code=500, text=job.get("error") or job["status"])
+
+    items, offset = [], 0
+    while offset is not None:
+        page = requests.get(f"{API_BASE}/api/v1/jobs/{job['job_id']}/results",
+                            params={"offset": offset, "limit": 1000}, timeout=30).json()
+        items.extend(page["items"])
+        offset = page["next_offset"]
+    return _JobResult(True, {"items": items, "stats": job["stats"]})
+
+
 # Check API health
 try:
     health_resp = requests.get(f"{API_BASE}/health", timeout=5)
@@ -113,8 +156,11 @@ with tab1:
             
             with st.spinner("Analyzing posts..."):
                 try:
-                    resp = requests.post(f"{API_BASE}/api/v1/analyze",
-                                       json={"posts": posts}, timeout=30)
+                    if len(posts) > JOB_THRESHOLD:
+                        resp = run_analysis_job(posts)
+                    else:
+                        resp = requests.post(f"{API_BASE}/api/v1/analyze",
+                                           json={"posts": posts}, timeout=30)
                     if resp.ok:
                         data = resp.json()
                         st.session_state.analysis_data = data
@@ -387,6 +433,39 @@ with tab3:
         )
         st.plotly_chart(fig, use_container_width=True)
 
+    # Aggregated on the server over every analyzed post, not just this session
+    st.markdown("---")
+    st.subheader("🌐 All Analyzed Posts")
+    bucket_label = st.selectbox("Time bucket", ["Hour", "Day"], key="stats_bucket")
+    bucket_seconds = 3600 if bucket_label == "Hour" else 86_400
+    try:
+        stats_resp = requests.get(f"{API_BASE}/api/v1/stats", params={
+            "group_by": "time", "bucket_seconds": bucket_seconds, "window": 24 if bucket_label == "Hour" else 7,
+            "top": 500,
+        }, timeout=10)
+        platform_resp = requests.get(f"{API_BASE}/api/v1/stats", params={"group_by": "platform"}, timeout=10)
+    except Exception as e:
+        st.error(f"❌ Could not load stats: {str(e)}")
+    else:
+        if stats_resp.ok and platform_resp.ok and stats_resp.json()["groups"]:
+            buckets = stats_resp.json()["groups"]
+            fig_trend = go.Figure()
+            fig_trend.add_trace(go.Scatter(
+                x=[b["key"] for b in buckets], y=[b["mean_score"] for b in buckets], name="Mean"))
+            fig_trend.add_trace(go.Scatter(
+                x=[b["key"] for b in buckets], y=[b["rolling_mean"] for b in buckets], name="Rolling mean"))
+            fig_trend.update_layout(yaxis_title="Sentiment Score", yaxis_range=[-1, 1])
+            st.plotly_chart(fig_trend, use_container_width=True)
+            st.dataframe([
+                {"platform": g["key"], "posts": g["count"], "positive": g["positive"],
+                 "neutral": g["neutral"], "negative": g["negative"], "mean": g["mean_score"],
+                 **g["percentiles"]}
+                for g in platform_resp.json()["groups"]
+            ], use_container_width=True)
+            st.caption(f"Computed in {stats_resp.json()['elapsed_ms']:.1f} ms")
+        else:
+            st.info("No analyzed posts on the server yet")
+
 # ==================== TAB 4: KNOWLEDGE GRAPH ====================
 with tab4:
     st.header("🕸️ Knowledge Graph")
@@ -0,0 +1,82 @@
+"""
+Load-test the sync and async graph routes against a local Neo4j stand-in.
+
+The stand-in replaces get_nodes_page on both services with a fixed simulated
+query latency, gated by a connection-pool-sized semaphore, so the comparison
+isolates the serving model: sync routes are limited by FastAPI's threadpool
+(40 threads by default), async routes by the driver pool.
+
+    python -m benchmarks.graph_concurrency --requests 2000 --concurrency 200
+"""
+import argparse
+import asyncio
+import threading
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from app.api.v1.endpoints import graph
+from app.core.config import settings
+from app.schemas.analysis_result import GraphNode
+from app.services.async_graph_service import AsyncNeo4jGraphService
+from app.services.graph_service import Neo4jGraphService
+
+PAGE = [GraphNode(id=f"user:{i}", label=f"user {i}", type="user") for i in range(10)]
+
+
+def install_stand_in(latency: float, pool_size: int) -> None:
+    sync_pool = threading.BoundedSemaphore(pool_size)
+    async_pool = asyncio.Semaphore(pool_size)
+
+    def get_nodes_page(*args, **kwargs):
+        with sync_pool:
+            time.sleep(latency)
+        return PAGE, None
+
+    async def get_nodes_page_async(*args, **kwargs):
+        async with async_pool:
+            await asyncio.sleep(latency)
+        return PAGE, None
+
+    Neo4jGraphService.get_nodes_page = staticmethod(get_nodes_page)
+    AsyncNeo4jGraphService.get_nodes_page = staticmethod(get_nodes_page_async)
+
+
+async def run_load(router, n_requests: int, concurrency: int) -> float:
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+    transport = httpx.ASGITransport(app=app)
+    gate = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            async with gate:
+                r = await client.get("/api/v1/graph/nodes")
+                r.raise_for_status()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(n_requests)))
+        return time.perf_counter() - started
+
+
+async def main_async(args) -> None:
+    install_stand_in(args.latency_ms / 1000, args.pool_size)
+    print(f"{args.requests} requests, {args.concurrency} concurrent, "
+          f"{args.latency_ms} ms simulated query, pool size {args.pool_size}")
+    for name, router in (("sync", graph.router), ("async", graph.async_router)):
+        elapsed = await run_load(router, args.requests, args.concurrency)
+        print(f"  {name:<6} {args.requests / elapsed:>8.0f} req/s  ({elapsed:.2f} s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--pool-size", type=int, default=settings.neo4j_max_connection_pool_size)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark Neo4j ingestion: per-row writes vs. UNWIND-batched writes.
+
+By default the driver is replaced by an in-process stand-in that counts Bolt
+round trips and sleeps a fixed simulated RTT per round trip, so the numbers
+are reproducible without a database. Pass --live to run against the Neo4j
+configured in Settings instead (the target graph is cleared first).
+
+    python -m benchmarks.graph_ingest --posts 1000 --rtt-ms 0.5
+"""
+import argparse
+import time
+from contextlib import contextmanager
+
+from app.core.config import settings
+from app.schemas.analysis_result import (
+    AnalysisResponse,
+    AnalysisStats,
+    NEREntity,
+    PostAnalysis,
+    SentimentResult,
+)
+from app.services.graph_service import Neo4jGraphService
+
+
+class _Result:
+    def consume(self):
+        return None
+
+
+class _CountingSession:
+    """Stand-in session: every run/transaction is one simulated round trip."""
+
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+        self.round_trips = 0
+
+    def _trip(self):
+        self.round_trips += 1
+        if self.rtt:
+            time.sleep(self.rtt)
+
+    def run(self, *args, **kwargs):
+        self._trip()
+        return _Result()
+
+    def execute_write(self, fn, *args, **kwargs):
+        # BEGIN is pipelined with the first RUN; COMMIT is one more trip.
+        result = fn(self, *args, **kwargs)
+        self._trip()
+        return result
+
+
+def make_analysis(n_posts: int, entities_per_post: int = 3) -> AnalysisResponse:
+    items = [
+        PostAnalysis(
+            post_id=str(i),
+            platform=("twitter", "facebook", "telegram")[i % 3],
+            author=f"user{i % 50}",
+            sentiment=SentimentResult(label="neutral", score=0.0),
+            entities=[
+                NEREntity(text=f"Entity {(i + j) % 200}", label="ORG")
+                for j in range(entities_per_post)
+            ],
+            text=f"post number {i}",
+        )
+        for i in range(n_posts)
+    ]
+    stats = AnalysisStats(total_posts=n_posts, positive=0, neutral=n_posts, negative=0)
+    return AnalysisResponse(items=items, stats=stats)
+
+
+def run_simulated(analysis: AnalysisResponse, bulk: bool, batch_size: int, rtt: float):
+    session = _CountingSession(rtt)
+
+    @contextmanager
+    def fake_session():
+        yield session
+
+    original_session = Neo4jGraphService.get_session
+    original_bulk = settings.neo4j_bulk_write
+    Neo4jGraphService.get_session = staticmethod(fake_session)
+    settings.neo4j_bulk_write = bulk
+    try:
+        started = time.perf_counter()
+        Neo4jGraphService.build_knowledge_graph(
+            analysis, clear_existing=False, batch_size=batch_size)
+        elapsed = time.perf_counter() - started
+    finally:
+        Neo4jGraphService.get_session = original_session
+        settings.neo4j_bulk_write = original_bulk
+    return session.round_trips, elapsed
+
+
+def run_live(analysis: AnalysisResponse, bulk: bool, batch_size: int):
+    original_bulk = settings.neo4j_bulk_write
+    settings.neo4j_bulk_write = bulk
+    try:
+        Neo4jGraphService.clear_graph()
+        started = time.perf_counter()
+        Neo4jGraphService.build_knowledge_graph(
+            analysis, clear_existing=False, batch_size=batch_size)
+        elapsed = time.perf_counter() - started
+    finally:
+        settings.neo4j_bulk_write = original_bulk
+    return None, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--posts", type=int, default=1000)
+    parser.add_argument("--entities", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=settings.neo4j_write_batch_size)
+    parser.add_argument("--rtt-ms", type=float, default=0.5,
+                        help="simulated round-trip time per Bolt request")
+    parser.add_argument("--live", action="store_true",
+                        help="write to the configured Neo4j instead of the stand-in")
+    args = parser.parse_args()
+
+    analysis = make_analysis(args.posts, args.entities)
+    per_1k = 1000 / max(1, args.posts)
+    print(f"{args.posts} posts, {args.entities} entities/post, batch size {args.batch_size}")
+    for name, bulk in (("per-row", False), ("unwind", True)):
+        if args.live:
+            trips, elapsed = run_live(analysis, bulk, args.batch_size)
+        else:
+            trips, elapsed = run_simulated(analysis, bulk, args.batch_size, args.rtt_ms / 1000)
+        trips_txt = f"{trips * per_1k:>8.0f} round trips/1k" if trips is not None else ""
+        print(f"  {name:<8} {trips_txt}  {elapsed * per_1k * 1000:>9.1f} ms/1k posts")
+
+
+if __name__ == "__main__":
+    main()
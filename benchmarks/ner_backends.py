@@ -0,0 +1,76 @@
+"""
+Benchmark the NER backends on a fixed synthetic corpus: posts per second and
+entity counts per label, next to each backend's declared throughput. Backends
+that aren't installed are listed and skipped.
+
+    python -m benchmarks.ner_backends --posts 5000 --backends regex,rules
+"""
+import argparse
+import random
+import time
+from collections import Counter
+
+from app.services.ner_backends import list_ner_backends
+
+_NAMES = ["Joko Widodo", "Sri Mulyani", "Anies Baswedan", "Alice Smith", "Budi Santoso"]
+_PLACES = ["Jakarta", "Surabaya", "Bandung", "Medan", "Makassar"]
+_TEMPLATES = [
+    "Great product launch in {place}! Congrats to {name} and the team.",
+    "Contact {email} or call {phone} for details about the {place} event.",
+    "{name} said the new policy is terrible, read more at {url}",
+    "nothing much happening today, just coffee and rain in {place}",
+    "Breaking: {name} meets {name2} in {place} to discuss the budget. Live at {url}",
+    "Customer service never answered {email}, very disappointed #fail",
+]
+
+
+def make_corpus(n: int, seed: int = 42) -> list:
+    """The same ``n`` posts for every run and backend."""
+    rng = random.Random(seed)
+    posts = []
+    for i in range(n):
+        name, name2 = rng.sample(_NAMES, 2)
+        posts.append(rng.choice(_TEMPLATES).format(
+            name=name,
+            name2=name2,
+            place=rng.choice(_PLACES),
+            email=f"user{i}@example.com",
+            phone=f"+62 812-{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}",
+            url=f"https://news.example.com/{i}",
+        ))
+    return posts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--posts", type=int, default=5000)
+    parser.add_argument("--backends", default="", help="comma-separated names (default: all)")
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.posts)
+    wanted = [b for b in args.backends.split(",") if b]
+    print(f"{'backend':>10} {'declared':>10} {'measured':>10} {'load s':>7} {'entities':>9}  by label")
+    for backend in list_ner_backends():
+        if wanted and backend.name not in wanted:
+            continue
+        if not backend.available():
+            print(f"{backend.name:>10} {backend.posts_per_second:>10,} {'not installed':>10}")
+            continue
+        started = time.perf_counter()
+        backend.load()
+        loaded = time.perf_counter() - started
+
+        started = time.perf_counter()
+        results = backend.extract(corpus)
+        elapsed = time.perf_counter() - started
+
+        labels = Counter(label for ents in results for _, label in ents)
+        print(
+            f"{backend.name:>10} {backend.posts_per_second:>10,} {len(corpus) / elapsed:>10,.0f} "
+            f"{loaded:>7.2f} {sum(labels.values()):>9,}  "
+            + ", ".join(f"{label}={count}" for label, count in sorted(labels.items()))
+        )
+
+
+if __name__ == "__main__":
+    main()
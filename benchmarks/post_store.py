@@ -0,0 +1,78 @@
+"""
+Benchmark the Parquet post store on a synthetic corpus: write rate, full and
+partition-pruned scans, and seeding /stats from the files.
+
+    python -m benchmarks.post_store --posts 1000000
+"""
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.schemas.analysis_result import NEREntity, PostAnalysis, SentimentResult
+from app.schemas.data_ingestion import Post
+from app.services.post_store import PostStore
+from app.services.sentiment_stats import SentimentStats
+
+_PLATFORMS = ["twitter", "facebook", "instagram", "telegram", "whatsapp", "threads"]
+
+
+def fill(store: PostStore, n: int, batch: int = 10_000, seed: int = 42) -> None:
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for lo in range(0, n, batch):
+        posts, items = [], []
+        for i in range(lo, min(n, lo + batch)):
+            platform = rng.choice(_PLATFORMS)
+            post = Post(
+                id=str(i), platform=platform, author=f"user{rng.randrange(50_000)}",
+                text=f"post {i} about Jakarta", timestamp=(start + timedelta(seconds=i * 30)).isoformat())
+            posts.append(post)
+            items.append(PostAnalysis(
+                post_id=post.id, platform=platform, author=post.author, text=post.text,
+                sentiment=SentimentResult(label="neutral", score=round(rng.uniform(-1, 1), 4)),
+                entities=[NEREntity(text="Jakarta", label="GPE")]))
+        store.append(posts, items)
+    store.flush()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        store = PostStore(root=root, flush_rows=100_000)
+        if not store.enabled:
+            print("pyarrow is not installed")
+            return
+        started = time.perf_counter()
+        fill(store, args.posts)
+        elapsed = time.perf_counter() - started
+        print(f"wrote {store.rows_written:,} rows to {store.files_written:,} files in {elapsed:.1f}s "
+              f"({store.rows_written / elapsed:,.0f} rows/s, including Post construction)")
+
+        day = datetime(2025, 1, 2, tzinfo=timezone.utc)
+        scans = {
+            "full, all columns": dict(),
+            "full, stats columns": dict(
+                columns=["platform", "post_id", "author", "sentiment_label", "sentiment_score", "time"]),
+            "one platform": dict(platform="twitter", columns=["sentiment_score"]),
+            "one platform, one day": dict(
+                platform="twitter", since=day, until=day + timedelta(days=1), columns=["sentiment_score"]),
+        }
+        for name, kwargs in scans.items():
+            started = time.perf_counter()
+            rows = sum(batch.num_rows for batch in store.scan(**kwargs))
+            elapsed = time.perf_counter() - started
+            print(f"{name:>22}: {rows:>10,} rows in {elapsed * 1000:8.1f} ms")
+
+        stats = SentimentStats(max_posts=args.posts)
+        started = time.perf_counter()
+        loaded = stats.load(store.scan(columns=scans["full, stats columns"]["columns"]))
+        print(f"{'seed /stats':>22}: {loaded:>10,} rows in {(time.perf_counter() - started) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
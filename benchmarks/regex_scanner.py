@@ -0,0 +1,64 @@
+"""
+Benchmark the regex NER backend against the original four-pass fallback
+(one findall per entity type, an NEREntity model per hit) on the fixed
+synthetic corpus of benchmarks.ner_backends.
+
+    python -m benchmarks.regex_scanner --posts 100000
+"""
+import argparse
+import re
+import time
+
+from app.schemas.analysis_result import NEREntity
+from app.services.ner_backends import RegexBackend
+from benchmarks.ner_backends import make_corpus
+
+EMAIL_RE = re.compile(r"[\w\.-]+@[\w\.-]+", re.IGNORECASE)
+PHONE_RE = re.compile(r"\+?\d[\d\-\s]{7,}\d")
+URL_RE = re.compile(r"https?://\S+")
+
+
+def four_pass(text: str):
+    entities = []
+    for m in EMAIL_RE.findall(text):
+        entities.append(NEREntity(text=m, label="EMAIL"))
+    for m in PHONE_RE.findall(text):
+        entities.append(NEREntity(text=m, label="PHONE"))
+    for m in URL_RE.findall(text):
+        entities.append(NEREntity(text=m, label="URL"))
+    for m in re.findall(r"(?:[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)", text):
+        entities.append(NEREntity(text=m, label="PERSON"))
+    return entities
+
+
+def _time(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--posts", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.posts)
+    scanner = RegexBackend()
+    cases = {
+        "four-pass + models": lambda: [four_pass(t) for t in corpus],
+        "single-pass tuples": lambda: scanner.extract(corpus),
+        # What /analyze pays: tuples turned into models at the boundary
+        "single-pass + models": lambda: [
+            [NEREntity(text=t, label=l) for t, l in ents] for ents in scanner.extract(corpus)
+        ],
+    }
+    baseline = None
+    for name, fn in cases.items():
+        best = min(_time(fn) for _ in range(args.runs))
+        baseline = baseline or best
+        print(f"{name:>22}: {best:6.3f}s  {len(corpus) / best:>10,.0f} posts/s  x{baseline / best:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark full-text search: indexing rate and query latency per query kind
+over a synthetic corpus, with entities from the regex NER backend.
+
+    python -m benchmarks.search --posts 1000000
+"""
+import argparse
+import random
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.ner_backends import make_corpus
+from app.schemas.analysis_result import NEREntity, PostAnalysis, SentimentResult
+from app.schemas.data_ingestion import Post
+from app.services.ner_backends import get_ner_backend
+from app.services.search_index import SearchIndex
+
+_PLATFORMS = ["twitter", "facebook", "instagram", "telegram", "whatsapp", "threads"]
+
+
+def fill(index: SearchIndex, n: int, batch: int = 20_000) -> None:
+    backend = get_ner_backend("regex")
+    rng = random.Random(42)
+    for lo in range(0, n, batch):
+        texts = make_corpus(min(batch, n - lo), seed=lo)
+        posts, items = [], []
+        for i, (text, ents) in enumerate(zip(texts, backend.extract(texts)), start=lo):
+            post = Post(id=str(i), platform=rng.choice(_PLATFORMS), author=f"user{rng.randrange(50_000)}",
+                        text=f"{text} ref{i}")
+            posts.append(post)
+            items.append(PostAnalysis(
+                post_id=post.id, platform=post.platform, author=post.author, text=post.text,
+                sentiment=SentimentResult(label="neutral", score=0.0),
+                entities=[NEREntity(text=t, label=l) for t, l in ents]))
+        index.add(posts, items)
+        index.flush()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/search.db", connect_args={"check_same_thread": False})
+        index = SearchIndex(session_factory=sessionmaker(bind=engine), bind=engine, flush_rows=10**9)
+        started = time.perf_counter()
+        fill(index, args.posts)
+        elapsed = time.perf_counter() - started
+        print(f"indexed {index.indexed:,} posts in {elapsed:.1f}s ({index.indexed / elapsed:,.0f} posts/s, "
+              "including NER and Post construction)")
+
+        queries = {
+            "rare keyword": dict(q=f"ref{args.posts // 2}"),
+            "keyword + platform": dict(q=f"ref{args.posts // 3}", platform="twitter"),
+            "prefix": dict(q=f"ref{args.posts // 7}*"),
+            "phrase": dict(phrase="customer service never answered"),
+            "entity + label": dict(entity="Sri Mulyani", label="PERSON"),
+            "label only": dict(label="EMAIL"),
+            "common keywords": dict(q="budget jakarta"),
+            "phrase, recent": dict(phrase="customer service never answered", sort="recent"),
+            "label only, recent": dict(label="EMAIL", sort="recent"),
+        }
+        for name, kwargs in queries.items():
+            best = min(index.search(**kwargs).elapsed_ms for _ in range(args.runs))
+            print(f"{name:>20}: {best:8.2f} ms")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Benchmark API worker startup: importing app.main, loading the NLP models and
+the first analysis. Each run is a fresh interpreter, so nothing is warm.
+
+    python -m benchmarks.startup --runs 5
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+_PROBE = """
+import json, time
+t0 = time.perf_counter()
+import app.main
+t1 = time.perf_counter()
+from app.services import nlp_service
+from app.services.ner_backends import get_ner_backend
+nlp_service.load_models()
+t2 = time.perf_counter()
+from app.schemas.data_ingestion import Post
+nlp_service.analyze_posts([Post(id="1", platform="x", author="a", text="Great day in Jakarta")])
+t3 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "load_models": t2 - t1, "first_analysis": t3 - t2,
+                  "ner": get_ner_backend().name}))
+"""
+
+
+def run_once() -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE], check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    print(f"NER backend: {runs[0]['ner']}, median of {args.runs} cold runs")
+    for phase in ("import", "load_models", "first_analysis"):
+        print(f"{phase:>15}: {statistics.median(r[phase] for r in runs) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
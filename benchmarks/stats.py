@@ -0,0 +1,66 @@
+"""
+Benchmark /stats aggregations over a large synthetic corpus: ingest rate of
+SentimentStats.add and query latency per grouping.
+
+    python -m benchmarks.stats --posts 1000000
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.schemas.analysis_result import SentimentResult
+from app.schemas.data_ingestion import Post
+from app.services.sentiment_stats import SentimentStats
+
+_PLATFORMS = ["twitter", "facebook", "instagram", "telegram", "whatsapp", "threads"]
+
+
+def fill(stats: SentimentStats, n: int, authors: int, batch: int = 10_000, seed: int = 42) -> None:
+    rng = random.Random(seed)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for lo in range(0, n, batch):
+        posts, sentiments = [], []
+        for i in range(lo, min(n, lo + batch)):
+            score = round(rng.uniform(-1, 1), 4)
+            posts.append(Post(
+                id=str(i), platform=rng.choice(_PLATFORMS), author=f"user{rng.randrange(authors)}",
+                text="", timestamp=(start + timedelta(seconds=i * 30)).isoformat()))
+            sentiments.append(SentimentResult(label="neutral", score=score))
+        stats.add(posts, sentiments)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--authors", type=int, default=50_000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    stats = SentimentStats(max_posts=args.posts)
+    started = time.perf_counter()
+    fill(stats, args.posts, args.authors)
+    elapsed = time.perf_counter() - started
+    print(f"ingested {len(stats):,} posts in {elapsed:.1f}s ({len(stats) / elapsed:,.0f} posts/s, "
+          "including Post construction)")
+
+    queries = {
+        "overall": dict(group_by="none"),
+        "per platform": dict(group_by="platform"),
+        "top 50 authors": dict(group_by="author"),
+        "hourly, 24h rolling": dict(group_by="time", bucket_seconds=3600, window=24),
+        "one platform, daily": dict(group_by="time", bucket_seconds=86_400, platform="twitter"),
+    }
+    for name, kwargs in queries.items():
+        best = min(_time(stats, kwargs) for _ in range(args.runs))
+        print(f"{name:>20}: {best * 1000:7.1f} ms")
+
+
+def _time(stats, kwargs) -> float:
+    started = time.perf_counter()
+    stats.query(**kwargs)
+    return time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    main()
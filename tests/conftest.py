@@ -1,7 +1,53 @@
+import json
 import os
 import sys
 
+import pytest
+import requests
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
 # Ensure project root is on sys.path so `import app` works
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def engine():
+    """A private in-memory SQLite database shared by every session."""
+    engine = create_engine("sqlite://", poolclass=StaticPool,
+                           connect_args={"check_same_thread": False})
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def store_kwargs(engine):
+    """Constructor arguments pointing a SQLiteStore at the in-memory engine."""
+    return {"session_factory": sessionmaker(bind=engine), "bind": engine}
+
+
+@pytest.fixture
+def threaded_store_kwargs(tmp_path):
+    """
+    Like store_kwargs, but on a file database with a connection per thread,
+    for stores that worker threads write to while the test reads.
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'store.db'}",
+                           connect_args={"check_same_thread": False})
+    yield {"session_factory": sessionmaker(bind=engine), "bind": engine}
+    engine.dispose()
+
+
+@pytest.fixture
+def make_response():
+    """Build a canned requests.Response with a JSON body."""
+    def build(status=200, headers=None, body=None):
+        r = requests.Response()
+        r.status_code = status
+        r.headers.update(headers or {})
+        r._content = json.dumps(body or {}).encode()
+        return r
+    return build
@@ -0,0 +1,61 @@
+from app.schemas.analysis_result import SentimentResult
+from app.schemas.data_ingestion import Post
+from app.services import analysis_cache, nlp_service
+from app.services.analysis_cache import AnalysisCache, MemoryTier, SQLiteTier, text_key
+
+VALUE = (SentimentResult(label="positive", score=0.6), [("Jakarta", "GPE")])
+
+
+def test_text_key_is_exact():
+    assert text_key("Great day") == text_key("Great day")
+    assert text_key("  Great  day\n") != text_key("Great day")
+    assert text_key("Great day") != text_key("great day")
+
+
+def test_memory_tier_evicts_least_recently_used():
+    tier = MemoryTier(max_size=2, ttl=0)
+    tier.put("a", VALUE)
+    tier.put("b", VALUE)
+    tier.get("a")
+    tier.put("c", VALUE)
+    assert tier.get("b") is None
+    assert tier.get("a") == VALUE
+
+
+def test_memory_tier_expires_entries():
+    tier = MemoryTier(max_size=10, ttl=60)
+    tier.put("a", VALUE, stored_at=1.0)
+    assert tier.get("a") is None
+
+
+def test_sqlite_tier_round_trip(store_kwargs):
+    tier = SQLiteTier(10, 3600, **store_kwargs)
+    tier.put_many({"k": VALUE})
+    tier.put_many({"k": VALUE})
+    cache = AnalysisCache(10, 3600, disk=tier)
+    assert cache.get_many(["k", "missing"]) == {"k": VALUE}
+    assert cache.stats()["disk_hits"] == 1
+    assert cache.memory.get("k") == VALUE
+
+
+def test_analyze_posts_scores_repeated_text_once(monkeypatch):
+    cache = AnalysisCache(100, 3600)
+    monkeypatch.setattr(analysis_cache, "_cache", cache)
+    monkeypatch.setattr(analysis_cache.settings, "analysis_cache_enabled", True)
+    scored = []
+    original = nlp_service._sentiment
+
+    def counting_sentiment(text):
+        scored.append(text)
+        return original(text)
+
+    monkeypatch.setattr(nlp_service, "_sentiment", counting_sentiment)
+    posts = [Post(id=str(i), platform="twitter", author="a", text="RT so good!")
+             for i in range(5)]
+    first = nlp_service.analyze_posts(posts)
+    second = nlp_service.analyze_posts(posts)
+    assert scored == ["RT so good!"]
+    assert first == second
+    # Repeats within a batch are served from the first scoring: 1 miss, 9 hits
+    assert (cache.stats()["misses"], cache.stats()["hits"]) == (1, 9)
+    assert cache.stats()["hit_rate"] == 0.9
@@ -0,0 +1,135 @@
+import time
+
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints import jobs
+from app.db.models import AnalysisJob
+from app.main import app
+from app.schemas.analysis_result import (
+    AnalysisResponse,
+    AnalysisStats,
+    PostAnalysis,
+    SentimentResult,
+)
+from app.schemas.data_ingestion import Post
+from app.services.analysis_jobs import AnalysisJobManager
+
+
+def _posts(n):
+    return [Post(id=str(i), platform="twitter", author="a", text=f"post {i}") for i in range(n)]
+
+
+class FakeAnalyzer:
+    def __init__(self, fail_on_call=None):
+        self.calls = []
+        self.fail_on_call = fail_on_call
+
+    def __call__(self, posts, ner_backend=None):
+        self.calls.append([p.id for p in posts])
+        if len(self.calls) == self.fail_on_call:
+            raise RuntimeError("model crashed")
+        items = [
+            PostAnalysis(post_id=p.id, platform=p.platform, author=p.author,
+                         sentiment=SentimentResult(label="positive", score=0.5),
+                         entities=[], text=p.text)
+            for p in posts
+        ]
+        return AnalysisResponse(items=items, stats=AnalysisStats(
+            total_posts=len(items), positive=len(items), neutral=0, negative=0))
+
+
+def _wait(manager, job_id, status):
+    deadline = time.time() + 5
+    while manager.get(job_id).status != status:
+        assert time.time() < deadline, manager.get(job_id)
+        time.sleep(0.01)
+    return manager.get(job_id)
+
+
+def _manager(store_kwargs, analyzer, persisted=None):
+    persisted = [] if persisted is None else persisted
+    return AnalysisJobManager(
+        **store_kwargs, workers=1, analyze=analyzer,
+        persist=lambda result, clear_existing: persisted.append(len(result.items)))
+
+
+def test_job_runs_in_batches_and_pages_results(threaded_store_kwargs):
+    analyzer, persisted = FakeAnalyzer(), []
+    manager = _manager(threaded_store_kwargs, analyzer, persisted)
+    manager.start()
+    job = manager.submit(_posts(5), batch_size=2)
+
+    done = _wait(manager, job.job_id, "done")
+    manager.stop()
+    assert analyzer.calls == [["0", "1"], ["2", "3"], ["4"]]
+    assert persisted == [2, 2, 1]
+    assert (done.done_posts, done.stats.positive, done.eta_seconds) == (5, 5, None)
+
+    page = manager.results(job.job_id, limit=3)
+    assert [i.post_id for i in page.items] == ["0", "1", "2"]
+    page = manager.results(job.job_id, offset=page.next_offset, limit=3)
+    assert [i.post_id for i in page.items] == ["3", "4"]
+    assert page.next_offset is None
+
+
+def test_failed_job_resumes_from_its_checkpoint(threaded_store_kwargs):
+    manager = _manager(threaded_store_kwargs, FakeAnalyzer(fail_on_call=2))
+    manager.start()
+    job = manager.submit(_posts(5), batch_size=2)
+    failed = _wait(manager, job.job_id, "failed")
+    manager.stop()
+    assert failed.done_posts == 2
+    assert "model crashed" in failed.error
+
+    # A new process resumes the job without redoing the first batch
+    analyzer = FakeAnalyzer()
+    restarted = _manager(threaded_store_kwargs, analyzer)
+    assert restarted.start() == 0
+    restarted.resume(job.job_id)
+    _wait(restarted, job.job_id, "done")
+    restarted.stop()
+    assert analyzer.calls == [["2", "3"], ["4"]]
+    assert [i.post_id for i in restarted.results(job.job_id).items] == ["0", "1", "2", "3", "4"]
+
+
+def test_job_deleted_while_running_is_dropped(threaded_store_kwargs):
+    manager = _manager(threaded_store_kwargs, None)
+    job = manager.submit(_posts(3))
+
+    def analyze(posts, ner_backend=None):
+        with manager._session() as db:
+            db.delete(db.get(AnalysisJob, job.job_id))
+            db.commit()
+        raise RuntimeError("model crashed")
+
+    manager._analyze = analyze
+    manager._run_job(job.job_id)  # must not raise on the missing row
+    assert manager.get(job.job_id) is None
+    manager._run_job(job.job_id)
+
+def test_queued_jobs_start_with_the_pool(threaded_store_kwargs):
+    analyzer = FakeAnalyzer()
+    manager = _manager(threaded_store_kwargs, analyzer)
+    job = manager.submit(_posts(3))
+    assert manager.get(job.job_id).status == "queued"
+
+    assert manager.start() == 1
+    _wait(manager, job.job_id, "done")
+    manager.stop()
+
+
+def test_upload_rejects_invalid_lines(threaded_store_kwargs, monkeypatch):
+    manager = _manager(threaded_store_kwargs, FakeAnalyzer())
+    monkeypatch.setattr(jobs, "analysis_jobs", manager)
+    client = TestClient(app)
+
+    body = '{"id": "1", "platform": "x", "author": "a", "text": "hi"}\n{"id": "2"}\n'
+    r = client.post("/api/v1/jobs/upload", content=body)
+    assert r.status_code == 422
+    assert "line 2" in r.json()["detail"]
+
+    r = client.post("/api/v1/jobs/upload?batch_size=1", content=body.splitlines()[0])
+    assert r.status_code == 202
+    assert r.json()["total_posts"] == 1
+    assert client.get(f"/api/v1/jobs/{r.json()['job_id']}").json()["status"] == "queued"
+    assert client.get("/api/v1/jobs/missing").status_code == 404
@@ -1,5 +1,8 @@
+import json
+
 from fastapi.testclient import TestClient
 from app.main import app
+from app.services import nlp_service
 
 client = TestClient(app)
 
@@ -31,3 +34,77 @@ def test_analyze_basic():
     assert "items" in data
     assert len(data["items"]) == 2
     assert "stats" in data
+    job = client.get(f"/api/v1/graph/jobs/{data['graph_job_id']}")
+    assert job.status_code == 200
+    assert job.json()["posts"] == 2
+
+def test_graph_nodes_rejects_bad_cursor():
+    r = client.get("/api/v1/graph/nodes", params={"cursor": "garbage"})
+    assert r.status_code == 400
+
+
+def test_ready_waits_for_models(monkeypatch):
+    monkeypatch.setattr(nlp_service, "_models_loaded", False)
+    assert client.get("/ready").status_code == 503
+    nlp_service.load_models()
+    r = client.get("/ready")
+    assert r.status_code == 200
+    assert r.json()["status"] == "ready"
+
+
+def test_analyze_selects_ner_backend():
+    post = {"id": "p1", "platform": "twitter", "author": "a", "text": "Mail Joko Widodo at joko@example.com"}
+    r = client.post("/api/v1/analyze", json={"posts": [post], "ner_backend": "regex"})
+    assert r.status_code == 200
+    assert {"text": "joko@example.com", "label": "EMAIL"} in r.json()["items"][0]["entities"]
+
+    r = client.post("/api/v1/analyze", json={"posts": [post], "ner_backend": "nope"})
+    assert r.status_code == 422
+
+    backends = {b["name"]: b for b in client.get("/api/v1/analyze/ner-backends").json()}
+    assert backends["regex"]["available"]
+    assert set(backends) >= {"regex", "rules", "spacy_ner", "spacy_sm"}
+
+
+def test_async_graph_routes_reject_bad_cursor():
+    from fastapi import FastAPI
+    from app.api.v1.endpoints import graph
+
+    async_app = FastAPI()
+    async_app.include_router(graph.async_router, prefix="/api/v1")
+    r = TestClient(async_app).get("/api/v1/graph/nodes", params={"cursor": "garbage"})
+    assert r.status_code == 400
+
+
+def test_analyze_stream_ndjson():
+    lines = [
+        json.dumps({"id": str(i), "platform": "twitter", "author": "alice",
+                    "text": "Great launch!" if i % 2 else "Terrible news."})
+        for i in range(5)
+    ]
+    lines.insert(2, "{not json")
+    r = client.post("/api/v1/analyze/stream?batch_size=2&persist_graph=false",
+                    content="\n".join(lines) + "\n")
+    assert r.status_code == 200
+    out = [json.loads(line) for line in r.text.splitlines()]
+    assert [o["post_id"] for o in out if o["kind"] == "post"] == ["0", "1", "2", "3", "4"]
+    assert [o["line"] for o in out if o["kind"] == "error"] == [3]
+    assert out[-1]["kind"] == "stats"
+    assert out[-1]["total_posts"] == 5
+    assert out[-1]["positive"] + out[-1]["neutral"] + out[-1]["negative"] == 5
+
+
+def test_ndjson_lines_span_chunks_and_oversized_lines_are_cut(monkeypatch):
+    import asyncio
+    from app.services import stream_analysis
+
+    monkeypatch.setattr(stream_analysis, "MAX_LINE_BYTES", 8)
+
+    async def lines(*chunks):
+        async def gen():
+            for chunk in chunks:
+                yield chunk
+        return [line async for line in stream_analysis.iter_ndjson_lines(gen())]
+
+    assert asyncio.run(lines(b"ab", b"c\nd", b"e\n\nf")) == [b"abc", b"de", b"", b"f"]
+    assert asyncio.run(lines(b"12345", b"67890", b"xx\nok\n")) == [b"1234567890", b"ok"]
@@ -0,0 +1,122 @@
+import time
+
+from app.schemas.data_ingestion import Post
+from app.services import data_fetcher
+
+
+class FakeFetcher:
+    def __init__(self, platform, delay=0.0, fail=False):
+        self.platform = platform
+        self.delay = delay
+        self.fail = fail
+
+    def fetch_posts(self, user_id, limit=50):
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("boom")
+        return [Post(id=f"{self.platform}-{user_id}", platform=self.platform,
+                     author=user_id, text="hi")]
+
+
+def test_fetch_all_returns_partial_results(monkeypatch):
+    fetchers = {
+        "twitter": FakeFetcher("twitter", delay=0.05),
+        "facebook": FakeFetcher("facebook", fail=True),
+        "telegram": FakeFetcher("telegram", delay=2.0),
+    }
+    monkeypatch.setattr(data_fetcher, "get_fetcher", lambda p: fetchers.get(p))
+
+    started = time.perf_counter()
+    result = data_fetcher.fetch_all(
+        {"twitter": ["a", "b"], "facebook": "c", "telegram": "d", "myspace": "e"},
+        deadline=0.5,
+    )
+    assert time.perf_counter() - started < 1.5
+
+    statuses = {(s.platform, s.user_id): s.status for s in result.platforms}
+    assert statuses == {
+        ("twitter", "a"): "ok",
+        ("twitter", "b"): "ok",
+        ("facebook", "c"): "error",
+        ("telegram", "d"): "timeout",
+        ("myspace", "e"): "unsupported",
+    }
+    assert sorted(p.id for p in result.posts) == ["twitter-a", "twitter-b"]
+    assert all(s.elapsed_ms > 0 for s in result.platforms if s.status == "ok")
+
+
+
+class IncrementalFetcher(FakeFetcher):
+    committed = []
+
+    def fetch_new_posts(self, user_id, limit=50, commit=True):
+        assert commit is False
+        return self.fetch_posts(user_id, limit)
+
+    def commit_watermark(self, user_id, posts):
+        self.committed.append((self.platform, user_id, [p.id for p in posts]))
+
+
+def test_fetch_all_defers_watermarks_to_the_caller(monkeypatch):
+    IncrementalFetcher.committed = []
+    fetchers = {
+        "twitter": IncrementalFetcher("twitter"),
+        "telegram": IncrementalFetcher("telegram", delay=0.5),
+    }
+    monkeypatch.setattr(data_fetcher, "get_fetcher", lambda p: fetchers.get(p))
+
+    result = data_fetcher.fetch_all(
+        {"twitter": "a", "telegram": "d"}, deadline=0.2, incremental=True)
+    assert IncrementalFetcher.committed == []
+
+    time.sleep(0.5)  # the straggler finishes, but missed the deadline
+    result.commit_watermarks()
+    assert IncrementalFetcher.committed == [("twitter", "a", ["twitter-a"])]
+    result.commit_watermarks()
+    assert len(IncrementalFetcher.committed) == 1
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+
+def test_twitter_iter_posts_follows_next_token(monkeypatch):
+    fetcher = data_fetcher.TwitterFetcher()
+    fetcher.bearer_token = "token"
+    pages = {
+        None: {"data": [{"id": "1", "text": "a"}, {"id": "2", "text": "b"}],
+               "meta": {"next_token": "t2"}},
+        "t2": {"data": [{"id": "3", "text": "c"}], "meta": {}},
+    }
+    calls = []
+
+    def fake_request(method, url, params=None, **kwargs):
+        calls.append(dict(params))
+        return FakeResponse(pages[params.get("pagination_token")])
+
+    monkeypatch.setattr(fetcher, "_safe_request", fake_request)
+    assert [p.id for p in fetcher.iter_posts("42", page_size=2)] == ["1", "2", "3"]
+    assert calls[0]["max_results"] == 5
+
+    calls.clear()
+    assert [p.id for p in fetcher.fetch_posts("42", limit=2)] == ["1", "2"]
+    assert len(calls) == 1  # the second page is never requested
+
+
+def test_graph_api_fetchers_follow_paging_next(monkeypatch):
+    fetcher = data_fetcher.FacebookFetcher()
+    fetcher.access_token = "token"
+    pages = {
+        "first": {"data": [{"id": "1", "message": "a"}, {"id": "x"}],
+                  "paging": {"next": "second"}},
+        "second": {"data": [{"id": "2", "message": "b"}], "paging": {}},
+    }
+
+    def fake_request(method, url, **kwargs):
+        return FakeResponse(pages["first" if "/posts?" in url else url])
+
+    monkeypatch.setattr(fetcher, "_safe_request", fake_request)
+    assert [p.id for p in fetcher.iter_posts("me")] == ["1", "2"]
@@ -0,0 +1,206 @@
+from contextlib import contextmanager
+
+import pytest
+
+from app.schemas.analysis_result import (
+    AnalysisResponse,
+    AnalysisStats,
+    NEREntity,
+    PostAnalysis,
+    SentimentResult,
+)
+from app.services.graph_service import (
+    Neo4jGraphService,
+    decode_cursor,
+    edges_page_query,
+    encode_cursor,
+    node_label_for_id,
+    nodes_page_query,
+    shortest_path_query,
+    subgraph_query,
+)
+
+
+class FakeSession:
+    def __init__(self):
+        self.transactions = []
+
+    def run(self, query, **params):
+        self.transactions[-1].append(params)
+        return self
+
+    def consume(self):
+        return None
+
+    def execute_write(self, fn, *args):
+        self.transactions.append([])
+        return fn(self, *args)
+
+
+def _analysis(n):
+    items = [
+        PostAnalysis(
+            post_id=str(i),
+            platform="twitter",
+            author="alice",
+            sentiment=SentimentResult(label="positive", score=0.5),
+            entities=[NEREntity(text="Jakarta", label="GPE")],
+            text=f"post {i}",
+        )
+        for i in range(n)
+    ]
+    return AnalysisResponse(
+        items=items,
+        stats=AnalysisStats(total_posts=n, positive=n, neutral=0, negative=0),
+    )
+
+
+def test_build_knowledge_graph_batches_rows(monkeypatch):
+    session = FakeSession()
+
+    @contextmanager
+    def fake_get_session():
+        yield session
+
+    monkeypatch.setattr(Neo4jGraphService, "get_session", fake_get_session)
+    Neo4jGraphService.build_knowledge_graph(
+        _analysis(1001), clear_existing=False, batch_size=500)
+
+    assert [len(tx) for tx in session.transactions] == [1, 1, 1]
+    chunks = [tx[0]["rows"] for tx in session.transactions]
+    assert [len(rows) for rows in chunks] == [500, 500, 1]
+    first = chunks[0][0]
+    assert first["post_id"] == "post:0"
+    assert first["user_id"] == "user:alice"
+    assert first["platform_id"] == "platform:twitter"
+    assert first["entities"] == [
+        {"id": "entity:GPE:Jakarta", "text": "Jakarta", "label": "GPE"}]
+
+
+def test_cursor_round_trip():
+    key = {"l": "Post", "id": "post:42"}
+    assert decode_cursor(encode_cursor(key)) == key
+
+
+def test_invalid_cursor_rejected():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor({"l": "Unknown", "id": "x"}))
+
+
+def test_nodes_page_follows_labels(monkeypatch):
+    class PagingSession:
+        data = {"User": ["user:a", "user:b"], "Post": ["post:1", "post:2", "post:3"]}
+
+        def run(self, query, after, label, limit):
+            node_label = query.split("(n:`")[1].split("`")[0]
+            ids = [i for i in self.data.get(node_label, []) if after is None or i > after]
+            return [{"id": i, "label": i} for i in ids[:limit]]
+
+    @contextmanager
+    def fake_get_session():
+        yield PagingSession()
+
+    monkeypatch.setattr(Neo4jGraphService, "get_session", fake_get_session)
+    nodes, cursor = Neo4jGraphService.get_nodes_page(limit=3)
+    assert [n.id for n in nodes] == ["user:a", "user:b", "post:1"]
+    assert decode_cursor(cursor) == {"l": "Post", "id": "post:1"}
+    nodes, cursor = Neo4jGraphService.get_nodes_page(limit=3, cursor=cursor)
+    assert [(n.id, n.type) for n in nodes] == [("post:2", "post"), ("post:3", "post")]
+    assert cursor is None
+
+
+def test_page_queries_only_filter_when_resuming():
+    first, resumed = nodes_page_query("User"), nodes_page_query("User", after=True, label=True)
+    assert "IS NULL OR" not in first + resumed
+    assert "$after" not in first and "n.id > $after" in resumed and "$label" in resumed
+    assert "$a" not in edges_page_query("User")
+    assert "a.id >= $a" in edges_page_query("User", after=True)
+
+
+def test_traversal_queries_seek_by_label_and_bound_each_hop():
+    assert node_label_for_id("entity:URL:https://x.com/a") == "Entity"
+    query = subgraph_query("entity:PERSON:Joko Widodo", 3, ["MENTIONS", "POSTED"])
+    assert query.count("LIMIT $fanout") == 3
+    assert "MATCH (start:`Entity` {id: $node_id})" in query
+    assert "-[r:MENTIONS|POSTED]-" in query
+    path = shortest_path_query("user:alice", "entity:GPE:Jakarta", 4, ["POSTED", "MENTIONS"])
+    assert "(a:`User` {id: $source}), (b:`Entity` {id: $target})" in path
+    assert "shortestPath((a)-[:POSTED|MENTIONS*..4]-(b))" in path
+    with pytest.raises(ValueError):
+        subgraph_query("node:1", 2)
+    with pytest.raises(ValueError):
+        subgraph_query("user:a", 2, ["FOLLOWS`]-() DETACH DELETE n //"])
+
+
+def test_neighbors_use_a_single_session(monkeypatch):
+    class NeighborSession:
+        def run(self, query, node_id):
+            assert "(n:`User` {id: $node_id})" in query
+            if "-[r]-" not in query:
+                return self
+            return [{"id": "post:1", "label": "hi", "type": "Post", "source": node_id,
+                     "rel_type": "POSTED", "rel_start": node_id}]
+
+        def single(self):
+            return {"id": "user:alice", "label": "alice", "type": "User"}
+
+    sessions = []
+
+    @contextmanager
+    def fake_get_session():
+        sessions.append(NeighborSession())
+        yield sessions[-1]
+
+    monkeypatch.setattr(Neo4jGraphService, "get_session", fake_get_session)
+    graph = Neo4jGraphService.get_neighbors("user:alice")
+    assert len(sessions) == 1
+    assert [n.id for n in graph.nodes] == ["user:alice", "post:1"]
+    assert [(e.source, e.target, e.label) for e in graph.edges] == [("user:alice", "post:1", "POSTED")]
+
+
+def test_subgraph_route_accepts_ids_with_slashes(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    from app.schemas.analysis_result import GraphNode, GraphResponse
+
+    calls = []
+
+    def fake_subgraph(node_id, **kwargs):
+        calls.append((node_id, kwargs))
+        return GraphResponse(nodes=[GraphNode(id=node_id, label="x", type="entity")], edges=[])
+
+    monkeypatch.setattr(Neo4jGraphService, "get_subgraph", staticmethod(fake_subgraph))
+    client = TestClient(app)
+    r = client.get("/api/v1/graph/nodes/entity:URL:https://x.com/a/subgraph?depth=3&fanout=10&rel_type=MENTIONS")
+    assert r.status_code == 200
+    assert calls == [("entity:URL:https://x.com/a",
+                      {"depth": 3, "limit": 500, "fanout": 10, "rel_types": ["MENTIONS"]})]
+    assert client.get("/api/v1/graph/nodes/user:a/subgraph?depth=9").status_code == 422
+
+
+def test_path_to_itself_is_the_node(monkeypatch):
+    class NodeSession:
+        def __init__(self, found):
+            self.found = found
+
+        def run(self, query, **params):
+            assert "shortestPath" not in query
+            return self
+
+        def single(self):
+            return {"id": "user:alice", "label": "alice", "type": "User"} if self.found else None
+
+    found = True
+
+    @contextmanager
+    def fake_get_session():
+        yield NodeSession(found)
+
+    monkeypatch.setattr(Neo4jGraphService, "get_session", fake_get_session)
+    path = Neo4jGraphService.get_shortest_path("user:alice", "user:alice")
+    assert [n.id for n in path.nodes] == ["user:alice"] and path.edges == []
+    found = False
+    assert Neo4jGraphService.get_shortest_path("user:bob", "user:bob") is None
@@ -0,0 +1,112 @@
+import threading
+import time
+
+import pytest
+
+from app.schemas.analysis_result import (
+    AnalysisResponse,
+    AnalysisStats,
+    PostAnalysis,
+    SentimentResult,
+)
+from app.services.graph_writer import GraphQueueClosed, GraphQueueFull, GraphWriteQueue
+
+
+def _analysis(post_id):
+    item = PostAnalysis(
+        post_id=post_id, platform="twitter", author="alice",
+        sentiment=SentimentResult(label="neutral", score=0.0),
+        entities=[], text="hello",
+    )
+    return AnalysisResponse(
+        items=[item], stats=AnalysisStats(total_posts=1, positive=0, neutral=1, negative=0))
+
+
+def test_queue_coalesces_writes_and_respects_clear():
+    gate = threading.Event()
+    calls = []
+
+    def writer(analysis, clear_existing):
+        gate.wait(5)
+        calls.append(([i.post_id for i in analysis.items], clear_existing))
+
+    q = GraphWriteQueue(maxsize=10, writer=writer)
+    first = q.submit(_analysis("a"))
+    while q.get_job(first).status != "running":
+        time.sleep(0.001)
+    # The worker is now blocked on "a"; these queue up behind it.
+    b = q.submit(_analysis("b"))
+    q.submit(_analysis("c"))
+    q.submit(_analysis("d"), clear_existing=True)
+    q.submit(_analysis("e"))
+    gate.set()
+    q.stop(timeout=5)
+
+    # "d" clears the graph, so "b" and "c" are never written
+    assert calls == [(["a"], False), (["d", "e"], True)]
+    assert q.get_job(first).status == "done"
+    assert q.get_job(b).status == "superseded"
+    assert q.stats().processed_jobs == 5
+
+
+def test_consecutive_clear_jobs_collapse():
+    gate = threading.Event()
+    calls = []
+
+    def writer(analysis, clear_existing):
+        gate.wait(5)
+        calls.append(([i.post_id for i in analysis.items], clear_existing))
+
+    q = GraphWriteQueue(maxsize=10, writer=writer)
+    first = q.submit(_analysis("a"), clear_existing=True)
+    while q.get_job(first).status != "running":
+        time.sleep(0.001)
+    for post_id in "bcd":
+        q.submit(_analysis(post_id), clear_existing=True)
+    gate.set()
+    q.stop(timeout=5)
+
+    assert calls == [(["a"], True), (["d"], True)]
+
+
+def test_submit_after_stop_is_rejected():
+    q = GraphWriteQueue(writer=lambda a, clear_existing: None)
+    q.submit(_analysis("a"))
+    q.stop(timeout=5)
+    with pytest.raises(GraphQueueClosed):
+        q.submit(_analysis("b"))
+    assert q._thread is None
+
+
+def test_queue_applies_backpressure():
+    gate = threading.Event()
+    q = GraphWriteQueue(maxsize=1, put_timeout=0.01, writer=lambda a, clear_existing: gate.wait(5))
+    q.submit(_analysis("a"))
+    q.submit(_analysis("b"))
+    with pytest.raises(GraphQueueFull):
+        for i in range(3):
+            q.submit(_analysis(str(i)))
+    assert q.stats().depth == 1
+    gate.set()
+    q.stop(timeout=5)
+
+
+def test_failed_write_is_reported():
+    def writer(analysis, clear_existing):
+        raise RuntimeError("neo4j down")
+
+    done = []
+    q = GraphWriteQueue(writer=writer)
+    job_id = q.run_inline(_analysis("a"), on_done=lambda: done.append("a"))
+    job = q.get_job(job_id)
+    assert job.status == "failed"
+    assert "neo4j down" in job.error
+    assert done == []
+
+
+def test_on_done_runs_after_the_write():
+    written, done = [], []
+    q = GraphWriteQueue(writer=lambda analysis, clear_existing: written.append(analysis))
+    q.submit(_analysis("a"), on_done=lambda: done.append(len(written)))
+    q.stop(timeout=5)
+    assert done == [1]
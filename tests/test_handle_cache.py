@@ -0,0 +1,66 @@
+import pytest
+import requests
+
+from app.services import data_fetcher
+from app.services.handle_cache import HandleCache
+from app.services.rate_limiter import RateLimitScheduler
+
+
+@pytest.fixture
+def fetcher(monkeypatch, store_kwargs):
+    cache = HandleCache(**store_kwargs)
+    monkeypatch.setattr(data_fetcher, "handle_cache", cache)
+    monkeypatch.setattr(data_fetcher.settings, "http_cache_enabled", False)
+    monkeypatch.setattr(data_fetcher, "rate_limiter", RateLimitScheduler())
+    f = data_fetcher.TwitterFetcher()
+    f.bearer_token = "token"
+    return f
+
+
+def test_batched_resolution_with_negative_caching(fetcher, monkeypatch, make_response):
+    calls = []
+
+    def request(method, url, params=None, **kwargs):
+        calls.append((url, params["usernames"]))
+        return make_response(body={
+            "data": [{"id": "1", "username": "Alice"}, {"id": "2", "username": "bob"}],
+            "errors": [{"value": "ghost", "title": "Not Found Error"}],
+        })
+
+    monkeypatch.setattr(fetcher.session, "request", request)
+    resolved = fetcher.resolve_user_ids(["@alice", "Bob", "ghost"])
+    assert resolved == {"alice": "1", "bob": "2", "ghost": None}
+    assert calls == [("https://api.x.com/2/users/by", "alice,bob,ghost")]
+
+    # Positive and negative entries are both served without a request
+    assert fetcher.resolve_user_id("ALICE") == "1"
+    assert fetcher.resolve_user_id("ghost") is None
+    assert len(calls) == 1
+
+    fetcher.resolve_user_ids(["alice"], refresh=True)
+    assert len(calls) == 2
+
+
+def test_failed_lookup_is_not_cached(fetcher, monkeypatch):
+    monkeypatch.setattr(data_fetcher.settings, "fetch_max_retries", 0)
+
+    def request(method, url, **kwargs):
+        raise requests.ConnectionError("down")
+
+    monkeypatch.setattr(fetcher.session, "request", request)
+    assert fetcher.resolve_user_ids(["alice"]) == {}
+    assert data_fetcher.handle_cache.get_many(["alice"]) == {}
+
+
+def test_lookups_split_into_batches(fetcher, monkeypatch, make_response):
+    batches = []
+
+    def request(method, url, params=None, **kwargs):
+        names = params["usernames"].split(",")
+        batches.append(len(names))
+        return make_response(body={"data": [{"id": str(i), "username": n} for i, n in enumerate(names)]})
+
+    monkeypatch.setattr(fetcher.session, "request", request)
+    handles = [f"user{i}" for i in range(250)]
+    assert len(fetcher.resolve_user_ids(handles)) == 250
+    assert batches == [100, 100, 50]
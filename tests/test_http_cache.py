@@ -0,0 +1,81 @@
+import pytest
+
+from app.services import data_fetcher
+from app.services.handle_cache import HandleCache
+from app.db.models import HttpCacheEntry
+from app.services.http_cache import HttpResponseCache
+from app.services.rate_limiter import RateLimitScheduler
+
+
+@pytest.fixture
+def fetcher(monkeypatch, store_kwargs):
+    cache = HttpResponseCache(**store_kwargs)
+    monkeypatch.setattr(data_fetcher, "http_cache", cache)
+    monkeypatch.setattr(data_fetcher, "handle_cache",
+                        HandleCache(**store_kwargs))
+    monkeypatch.setattr(data_fetcher, "rate_limiter", RateLimitScheduler())
+    monkeypatch.setattr(data_fetcher.time, "sleep", lambda s: None)
+    f = data_fetcher.TwitterFetcher()
+    f.bearer_token = "token"
+    f.session.headers["Authorization"] = "Bearer token"
+    return f
+
+
+def test_profile_served_from_cache(fetcher, monkeypatch, make_response):
+    calls = []
+
+    def request(method, url, **kwargs):
+        calls.append(kwargs.get("headers"))
+        return make_response(body={"data": {"id": "42", "username": "alice"}})
+
+    monkeypatch.setattr(fetcher.session, "request", request)
+    assert fetcher.fetch_user_profile("alice").user_id == "42"
+    assert fetcher.fetch_user_profile("alice").user_id == "42"
+    assert len(calls) == 1
+    assert data_fetcher.http_cache.hits == 1
+
+
+def test_expired_entry_revalidated_with_etag(fetcher, monkeypatch, make_response):
+    responses = [
+        make_response(headers={"ETag": '"v1"'}, body={"data": {"id": "42"}}),
+        make_response(304),
+    ]
+    sent = []
+
+    def request(method, url, **kwargs):
+        sent.append(kwargs.get("headers") or {})
+        return responses.pop(0)
+
+    monkeypatch.setattr(fetcher.session, "request", request)
+    # A tiny TTL: cached, but already expired on the next call
+    monkeypatch.setattr(fetcher, "CACHE_TTLS", {"*": 1e-9})
+    fetcher.fetch_user_profile("alice")
+    assert fetcher.fetch_user_profile("alice").user_id == "42"
+    assert sent[1]["If-None-Match"] == '"v1"'
+    assert data_fetcher.http_cache.revalidated == 1
+
+
+def test_stale_entry_served_when_rate_limited(fetcher, monkeypatch, make_response):
+    responses = [make_response(body={"data": {"id": "42"}})] + [make_response(429)] * 10
+    monkeypatch.setattr(fetcher.session, "request", lambda *a, **k: responses.pop(0))
+    monkeypatch.setattr(fetcher, "CACHE_TTLS", {"*": 1e-9})
+    fetcher.fetch_user_profile("alice")
+    assert fetcher.fetch_user_profile("alice").user_id == "42"
+    assert data_fetcher.http_cache.stale_served == 1
+
+
+def test_store_prunes_old_and_excess_entries(store_kwargs, make_response, monkeypatch):
+    cache = HttpResponseCache(**store_kwargs, max_size=2, stale_grace=60)
+    monkeypatch.setattr(cache, "_PRUNE_EVERY", 1)
+    clock = [1000.0]
+    monkeypatch.setattr("app.services.http_cache.time.time", lambda: clock[0])
+
+    cache.store("expired", "/e", make_response(), ttl=10)
+    clock[0] += 100  # past its expiry plus the stale grace
+    assert cache.get("expired") is None
+    for key in ("a", "b", "c"):
+        clock[0] += 1
+        cache.store(key, "/e", make_response(), ttl=10)
+    assert [k for k in ("expired", "a", "b", "c") if cache.get(k)] == ["b", "c"]
+    with cache._session() as db:
+        assert db.query(HttpCacheEntry).count() == 2
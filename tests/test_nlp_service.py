@@ -0,0 +1,80 @@
+import pytest
+
+from app.schemas.data_ingestion import Post
+from app.services import nlp_service
+from app.services.analysis_cache import text_key
+from app.services.ner_backends import NERBackendError, get_ner_backend
+
+
+def test_ner_batch_preserves_input_order():
+    texts = [
+        "Mail me at alice@example.com",
+        "nothing here",
+        "Visit https://example.com today",
+    ]
+    batched = nlp_service._ner_batch(texts)
+    assert batched == [nlp_service._ner(t) for t in texts]
+
+
+def test_analyze_posts_aligns_entities_with_posts():
+    posts = [
+        Post(id=str(i), platform="twitter", author="alice", text=text)
+        for i, text in enumerate(["Great day!", "Contact bob@example.com now"])
+    ]
+    result = nlp_service.analyze_posts(posts)
+    assert [item.post_id for item in result.items] == ["0", "1"]
+    assert [(e.text, e.label) for e in result.items[1].entities] == nlp_service._ner(posts[1].text)
+
+
+def test_ner_backend_registry():
+    assert get_ner_backend("regex").name == "regex"
+    with pytest.raises(NERBackendError):
+        get_ner_backend("nope")
+    assert text_key("Great day", "regex") != text_key("Great day", "rules")
+
+
+def test_regex_scanner_is_single_pass_in_text_order():
+    text = "Call +62 812-3456-7890, see https://x.com/12345678901 by Joko Widodo or mail a.b@x.com"
+    assert nlp_service._ner(text, "regex") == [
+        ("+62 812-3456-7890", "PHONE"),
+        ("https://x.com/12345678901", "URL"),
+        ("Joko Widodo", "PERSON"),
+        ("a.b@x.com", "EMAIL"),
+    ]
+
+
+def test_rule_matcher_backend_finds_pattern_entities():
+    pytest.importorskip("spacy")
+    text = "Call +62 812-3456-7890 or mail joko@example.com, says Joko Widodo"
+    entities = set(nlp_service._ner(text, "rules"))
+    assert entities == {
+        ("+62 812-3456-7890", "PHONE"),
+        ("joko@example.com", "EMAIL"),
+        ("Joko Widodo", "PERSON"),
+    }
+
+
+def test_process_pool_executor_matches_inline():
+    from app.services.nlp_executor import InlineExecutor, ProcessPoolNLPExecutor
+
+    texts = [f"Post {i}: great news from alice@example.com" for i in range(7)]
+    texts.append("This is terrible.")
+    pool = ProcessPoolNLPExecutor(workers=2, threshold=0, chunk_size=3)
+    try:
+        assert pool.score(texts) == InlineExecutor().score(texts)
+    finally:
+        pool.shutdown()
+
+
+def test_models_load_lazily():
+    import subprocess
+    import sys
+
+    probe = (
+        "import sys, app.main\n"
+        "from app.services import nlp_service\n"
+        "assert not nlp_service.models_ready() and 'spacy' not in sys.modules\n"
+        "nlp_service._sentiment('fine')\n"
+        "assert nlp_service.models_ready()\n"
+    )
+    subprocess.run([sys.executable, "-c", probe], check=True)
@@ -0,0 +1,58 @@
+from datetime import datetime, timezone
+
+from app.schemas.analysis_result import NEREntity, PostAnalysis, SentimentResult
+from app.schemas.data_ingestion import Post
+from app.services.post_repository import PostRepository
+
+
+def _post(i, author="alice", hour=0, text=None, author_id=None):
+    return Post(id=i, platform="twitter", author=author, author_id=author_id, text=text or f"post {i}",
+                timestamp=datetime(2025, 1, 1, hour, tzinfo=timezone.utc).isoformat())
+
+
+def _analysis(post, score):
+    return PostAnalysis(post_id=post.id, platform=post.platform, author=post.author, text=post.text,
+                        sentiment=SentimentResult(label="positive" if score > 0 else "negative", score=score),
+                        entities=[NEREntity(text="Jakarta", label="GPE")])
+
+
+def test_upsert_and_latest_posts_by_author(store_kwargs):
+    repo = PostRepository(**store_kwargs)
+    posts = [_post("1", hour=1), _post("2", hour=3), _post("3", hour=2), _post("4", author="bob")]
+    # Duplicate keys in one batch: the last one wins
+    assert repo.upsert(posts + [_post("1", hour=1, text="edited")],
+                       [_analysis(p, 0.5) for p in posts] + [_analysis(posts[0], -0.5)],
+                       ner_backend="regex") == 4
+
+    latest = repo.latest_posts("twitter", "alice", limit=2)
+    assert [p.id for p in latest] == ["2", "3"]
+    assert latest[0].sentiment == SentimentResult(label="positive", score=0.5)
+    assert latest[0].entities == [NEREntity(text="Jakarta", label="GPE")]
+    older = repo.latest_posts("twitter", "alice", before=latest[-1].posted_at)
+    assert [(p.id, p.text, p.sentiment.score) for p in older] == [("1", "edited", -0.5)]
+
+    # Re-ingesting without analysis keeps the stored analysis
+    repo.upsert([_post("2", hour=3, text="again")])
+    assert repo.latest_posts("twitter", "alice", limit=1)[0].sentiment.score == 0.5
+
+
+def test_profiles_track_count_and_newest_post(store_kwargs):
+    repo = PostRepository(**store_kwargs)
+    repo.upsert([_post("1", hour=5, author_id="42"), _post("2", hour=1)])
+    repo.upsert([_post("3", hour=2)])
+
+    profile = repo.get_profile("twitter", "alice")
+    assert (profile.post_count, profile.author_id) == (3, "42")
+    assert profile.last_post_at == datetime(2025, 1, 1, 5, tzinfo=timezone.utc).timestamp()
+    assert repo.get_profile("twitter", "nobody") is None
+
+
+def test_copies_match_normalized_text(store_kwargs):
+    repo = PostRepository(**store_kwargs)
+    repo.upsert([
+        _post("1", text="Breaking  news\tfrom Jakarta"),
+        Post(id="9", platform="telegram", author="chan", text="Breaking news from Jakarta"),
+        _post("2", text="something else"),
+    ])
+    assert sorted(p.id for p in repo.copies("Breaking news from Jakarta ")) == ["1", "9"]
+
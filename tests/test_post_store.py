@@ -0,0 +1,124 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.schemas.analysis_result import NEREntity, PostAnalysis, SentimentResult
+from app.schemas.data_ingestion import Post
+from app.services.post_store import PostStore
+from app.services.sentiment_stats import SentimentStats
+
+pytest.importorskip("pyarrow")
+
+_STATS_COLUMNS = ["platform", "post_id", "author", "sentiment_label", "sentiment_score", "time"]
+
+
+def _append(store, rows):
+    """rows: (id, platform, day of January 2025, score)"""
+    posts = [
+        Post(id=i, platform=platform, author="a", author_id="1", text=f"post {i}",
+             timestamp=datetime(2025, 1, day, 12, tzinfo=timezone.utc).isoformat())
+        for i, platform, day, _ in rows
+    ]
+    items = [
+        PostAnalysis(post_id=p.id, platform=p.platform, author=p.author, text=p.text,
+                     sentiment=SentimentResult(label="positive" if s > 0 else "negative", score=s),
+                     entities=[NEREntity(text="Jakarta", label="GPE")])
+        for p, (*_, s) in zip(posts, rows)
+    ]
+    store.append(posts, items)
+
+
+def test_flush_writes_partitions_and_scans_prune(tmp_path):
+    store = PostStore(root=str(tmp_path), flush_rows=100)
+    _append(store, [("1", "twitter", 1, 0.5), ("2", "twitter", 2, -0.5), ("3", "telegram", 1, 0.1)])
+    assert list(store.scan()) == []
+    assert store.flush() == 3
+    assert store.files_written == 3
+    assert sorted(p.relative_to(tmp_path).parent.as_posix() for p in tmp_path.rglob("*.parquet")) == [
+        "platform=telegram/date=2025-01-01",
+        "platform=twitter/date=2025-01-01",
+        "platform=twitter/date=2025-01-02",
+    ]
+
+    def ids(**filters):
+        return sorted(a.post_id for a in store.iter_analyses(**filters))
+
+    assert ids() == ["1", "2", "3"]
+    assert ids(platform="twitter") == ["1", "2"]
+    assert ids(since=datetime(2025, 1, 2)) == ["2"]
+    assert ids(platform="twitter", until=datetime(2025, 1, 1, 13, tzinfo=timezone.utc)) == ["1"]
+
+    analysis = next(store.iter_analyses(platform="telegram"))
+    assert analysis.sentiment.score == pytest.approx(0.1)
+    assert analysis.entities == [NEREntity(text="Jakarta", label="GPE")]
+    post = next(store.iter_posts(platform="telegram"))
+    assert (post.id, post.author_id, post.text) == ("3", "1", "post 3")
+
+
+def test_full_buffer_flushes_without_worker(tmp_path):
+    store = PostStore(root=str(tmp_path), flush_rows=2)
+    _append(store, [("1", "x", 1, 0.5)])
+    assert store.rows_written == 0
+    _append(store, [("2", "x", 1, 0.5)])
+    assert store.rows_written == 2
+
+
+def test_stats_load_keeps_latest_and_live_rows(tmp_path):
+    store = PostStore(root=str(tmp_path))
+    _append(store, [("1", "x", 1, 0.5), ("2", "x", 1, 0.5)])
+    store.flush()
+    # Reanalysis of post 1, written later
+    _append(store, [("1", "x", 1, -0.5)])
+    store.flush()
+
+    stats = SentimentStats()
+    # Analyzed while the seed runs: newer than anything stored
+    stats.add([Post(id="2", platform="x", author="a", text="")],
+              [SentimentResult(label="neutral", score=0.0)])
+    assert stats.load(store.scan(columns=_STATS_COLUMNS)) == 3
+    result = stats.query(group_by="none")
+    assert result.total_posts == 2
+    assert result.groups[0].mean_score == pytest.approx(-0.25)
+
+
+def test_platform_is_escaped_inside_the_root(tmp_path):
+    store = PostStore(root=str(tmp_path / "store"))
+    _append(store, [("1", "x/../../escaped", 1, 0.5), ("2", "..", 1, 0.5)])
+    store.flush()
+    assert not (tmp_path / "escaped").exists()
+    assert {p.parent.parent.name for p in tmp_path.rglob("*.parquet")} == {
+        "platform=x%2F..%2F..%2Fescaped", "platform=.."}
+    assert [a.post_id for a in store.iter_analyses(platform="x/../../escaped")] == ["1"]
+
+
+def test_reanalyzed_posts_are_read_once(tmp_path):
+    store = PostStore(root=str(tmp_path))
+    for score in (0.1, 0.2, 0.3):
+        _append(store, [("1", "x", 1, score), ("2", "x", 1, score)])
+        store.flush()
+    # Resubmitting what iter_posts returns adds one version per post, not a copy per row
+    assert sorted(p.id for p in store.iter_posts()) == ["1", "2"]
+    analyses = list(store.iter_analyses())
+    assert [round(a.sentiment.score, 4) for a in analyses] == [0.3, 0.3]
+
+
+def test_failed_flush_keeps_rows_for_the_next_one(tmp_path, monkeypatch):
+    import pyarrow.parquet as pq
+
+    store = PostStore(root=str(tmp_path))
+    _append(store, [("1", "twitter", 1, 0.5), ("2", "telegram", 1, 0.5)])
+    write_table = pq.write_table
+    calls = []
+
+    def flaky_write(table, where):
+        calls.append(where)
+        if len(calls) == 2:
+            raise OSError("disk full")
+        write_table(table, where)
+
+    monkeypatch.setattr(pq, "write_table", flaky_write)
+    with pytest.raises(OSError):
+        store.flush()
+    assert store.rows_written == 1
+    assert store.flush() == 1
+    assert sorted(a.post_id for a in store.iter_analyses()) == ["1", "2"]
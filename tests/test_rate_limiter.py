@@ -0,0 +1,86 @@
+import json
+import time
+
+import requests
+
+from app.services import data_fetcher, rate_limiter as rl
+from app.services.rate_limiter import (
+    RateLimitScheduler,
+    TokenBucket,
+    _graph_usage,
+    credential_key,
+    endpoint_key,
+)
+
+
+def test_endpoint_key_masks_ids_but_keeps_versions():
+    assert endpoint_key("https://graph.facebook.com/v18.0/12345/posts?limit=5") == \
+        "graph.facebook.com/v18.0/:id/posts"
+    assert endpoint_key("https://api.telegram.org/bot123:abc/getUpdates") == \
+        "api.telegram.org/:id/getUpdates"
+
+
+def test_credential_key_hashes_tokens():
+    session = requests.Session()
+    key = credential_key(session, "https://graph.facebook.com/me?access_token=secret")
+    assert "secret" not in key
+    assert key == credential_key(session, "https://graph.facebook.com/x", {"access_token": "secret"})
+
+
+def test_bucket_paces_remaining_calls_until_reset():
+    bucket = TokenBucket(rate=100.0, capacity=10)
+    now = time.monotonic()
+    bucket.pace(remaining=10, reset_in=100.0, now=now)
+    assert bucket.reserve(now) == 0.0
+    assert 9.0 < bucket.reserve(now) <= 10.0
+    bucket.pace(remaining=0, reset_in=30.0, now=now)
+    assert bucket.reserve(now) >= 30.0
+
+
+def test_graph_usage_headers():
+    usage, regain = _graph_usage({
+        "x-app-usage": json.dumps({"call_count": 40, "total_time": 80, "total_cputime": 10}),
+        "x-business-use-case-usage": json.dumps(
+            {"123": [{"type": "pages", "call_count": 100, "estimated_time_to_regain_access": 2}]}),
+    })
+    assert usage == 100
+    assert regain == 120
+
+
+def test_scheduler_blocks_endpoint_after_exhausted_window(make_response):
+    scheduler = RateLimitScheduler()
+    reset = time.time() + 50
+    scheduler.observe("t", "e", make_response(headers={
+        "x-rate-limit-remaining": "0", "x-rate-limit-reset": str(reset)}))
+    assert scheduler.reserve("t", "e") > 45
+    assert scheduler.reserve("t", "other") == 0.0
+
+
+def test_scheduler_abandoned_reservation_spends_no_budget(make_response):
+    scheduler = RateLimitScheduler()
+    reset = time.time() + 50
+    scheduler.observe("t", "e", make_response(headers={
+        "x-rate-limit-remaining": "0", "x-rate-limit-reset": str(reset)}))
+    tokens = scheduler._bucket(("token", "t")).tokens
+    for _ in range(20):
+        assert scheduler.reserve("t", "e", max_wait=10) > 10
+    assert scheduler._bucket(("token", "t")).tokens >= tokens
+    assert scheduler.reserve("t", "other", max_wait=10) == 0.0
+
+
+def test_safe_request_retries_429(monkeypatch, make_response):
+    monkeypatch.setattr(data_fetcher.settings, "http_cache_enabled", False)
+    monkeypatch.setattr(rl, "rate_limiter", RateLimitScheduler())
+    monkeypatch.setattr(data_fetcher, "rate_limiter", rl.rate_limiter)
+    slept = []
+    monkeypatch.setattr(data_fetcher.time, "sleep", slept.append)
+    responses = [
+        make_response(429, {"retry-after": "2"}),
+        make_response(200, body={"data": []}),
+    ]
+    fetcher = data_fetcher.TwitterFetcher()
+    monkeypatch.setattr(fetcher.session, "request", lambda *a, **k: responses.pop(0))
+
+    resp = fetcher._safe_request("GET", "https://api.x.com/2/users/1/tweets")
+    assert resp.status_code == 200
+    assert slept and slept[-1] >= 1.9
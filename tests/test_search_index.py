@@ -0,0 +1,98 @@
+import pytest
+
+from app.schemas.analysis_result import NEREntity, PostAnalysis, SentimentResult
+from app.schemas.data_ingestion import Post
+from app.services.search_index import SearchIndex, build_match
+
+
+def _index(index, rows):
+    """rows: (id, platform, text, [(entity, label)])"""
+    posts = [Post(id=i, platform=platform, author="a", text=text) for i, platform, text, _ in rows]
+    items = [
+        PostAnalysis(post_id=p.id, platform=p.platform, author=p.author, text=p.text,
+                     sentiment=SentimentResult(label="neutral", score=0.0),
+                     entities=[NEREntity(text=t, label=l) for t, l in ents])
+        for p, (*_, ents) in zip(posts, rows)
+    ]
+    index.add(posts, items)
+    index.flush()
+
+
+def _ids(response):
+    return [hit.post_id for hit in response.hits]
+
+
+@pytest.fixture
+def index(store_kwargs):
+    index = SearchIndex(**store_kwargs)
+    _index(index, [
+        ("1", "twitter", "Flooding in Jakarta again, roads closed", [("Jakarta", "GPE")]),
+        ("2", "twitter", "Joko Widodo visits the flood area", [("Joko Widodo", "PERSON")]),
+        ("3", "telegram", "Roads closed near the stadium", []),
+        ("4", "telegram", "Jakarta Jakarta Jakarta traffic", [("Jakarta", "GPE")]),
+    ])
+    return index
+
+
+def test_keyword_phrase_and_prefix(index):
+    assert _ids(index.search(q="jakarta")) == ["4", "1"]  # BM25: more mentions rank first
+    assert _ids(index.search(q="roads closed", platform="telegram")) == ["3"]
+    assert _ids(index.search(phrase="closed near")) == ["3"]
+    assert sorted(_ids(index.search(q="flood*"))) == ["1", "2"]
+    hit = index.search(q="stadium").hits[0]
+    assert hit.snippet == "Roads closed near the [stadium]"
+
+
+def test_entity_and_label_queries(index):
+    assert _ids(index.search(entity="Joko Widodo", label="PERSON")) == ["2"]
+    assert _ids(index.search(entity="Joko Widodo", label="GPE")) == []
+    assert sorted(_ids(index.search(label="GPE"))) == ["1", "4"]
+    assert index.search(label="PERSON").hits[0].entities == [NEREntity(text="Joko Widodo", label="PERSON")]
+
+
+def test_reanalysis_replaces_the_indexed_post(index):
+    _index(index, [("3", "telegram", "Stadium reopened", [])])
+    assert _ids(index.search(q="closed")) == ["1"]
+    assert _ids(index.search(q="reopened")) == ["3"]
+
+
+def test_recent_sort_and_rank_window(index):
+    assert _ids(index.search(q="jakarta", sort="recent")) == ["4", "1"]
+    assert _ids(index.search(q="roads", sort="recent")) == ["3", "1"]
+    _index(index, [("5", "x", "one more post about Jakarta traffic today", []),
+                   ("6", "x", "and another long post mentioning Jakarta", [])])
+    assert _ids(index.search(q="jakarta", limit=1)) == ["4"]
+    # Only the newest two matches are ranked: post 4 scores higher but is older
+    index.rank_window = 2
+    assert _ids(index.search(q="jakarta", limit=1))[0] in ("5", "6")
+    with pytest.raises(ValueError):
+        index.search(q="jakarta", sort="oldest")
+
+
+def test_paging_and_query_syntax_is_escaped(index):
+    page = index.search(q="roads", limit=1)
+    assert len(page.hits) == 1 and page.next_offset == 1
+    assert index.search(q="roads", limit=1, offset=1).next_offset is None
+    # FTS5 operators in user input are just words
+    assert index.search(q='"jakarta OR NEAR(').hits == []
+    with pytest.raises(ValueError):
+        build_match(q="  * - ")
+
+
+def test_failed_flush_keeps_rows_for_the_next_one(store_kwargs):
+    calls = []
+    session_factory = store_kwargs["session_factory"]
+
+    def flaky_sessions():
+        calls.append(1)
+        if len(calls) == 2:  # the first session creates the tables
+            raise RuntimeError("database is locked")
+        return session_factory()
+
+    index = SearchIndex(session_factory=flaky_sessions, bind=store_kwargs["bind"])
+    index._ensure_tables()
+    with pytest.raises(RuntimeError):
+        _index(index, [("1", "x", "first version", [])])
+    _index(index, [("2", "x", "another post", [])])
+    assert _ids(index.search(q="first")) == ["1"]
+    assert _ids(index.search(q="another")) == ["2"]
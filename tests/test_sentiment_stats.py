@@ -0,0 +1,85 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.schemas.analysis_result import SentimentResult
+from app.schemas.data_ingestion import Post
+from app.services.sentiment_stats import SentimentStats
+
+
+def _label(score):
+    return "positive" if score >= 0.05 else "negative" if score <= -0.05 else "neutral"
+
+
+def _add(stats, rows):
+    """rows: (id, platform, author, score, hour of 2025-01-01 UTC)"""
+    posts = [
+        Post(id=i, platform=platform, author=author, text="",
+             timestamp=datetime(2025, 1, 1, hour, tzinfo=timezone.utc).isoformat())
+        for i, platform, author, _, hour in rows
+    ]
+    stats.add(posts, [SentimentResult(label=_label(s), score=s) for *_, s, _ in rows])
+
+
+def test_groups_by_platform_with_percentiles():
+    stats = SentimentStats()
+    _add(stats, [
+        ("1", "twitter", "a", 0.5, 0),
+        ("2", "twitter", "b", -0.5, 0),
+        ("3", "twitter", "a", 0.9, 1),
+        ("4", "telegram", "c", 0.0, 1),
+    ])
+    result = stats.query(group_by="platform", bins=4, percentiles=[50, 100])
+    assert result.total_posts == 4
+    assert result.histogram_edges == [-1.0, -0.5, 0.0, 0.5, 1.0]
+    twitter, telegram = result.groups
+    assert (twitter.key, twitter.count, twitter.positive, twitter.negative) == ("twitter", 3, 2, 1)
+    assert twitter.mean_score == pytest.approx(0.3, abs=1e-4)
+    assert twitter.histogram == [0, 1, 0, 2]
+    assert twitter.percentiles == {"p50": pytest.approx(0.5, abs=1e-3), "p100": pytest.approx(0.9, abs=1e-3)}
+    assert (telegram.key, telegram.neutral) == ("telegram", 1)
+
+    by_author = stats.query(group_by="author", platform="twitter", top=1)
+    assert [(g.key, g.count) for g in by_author.groups] == [("a", 2)]
+    assert stats.query(platform="unknown").total_posts == 0
+
+
+def test_time_buckets_with_rolling_mean_and_overwrites():
+    stats = SentimentStats()
+    _add(stats, [("1", "x", "a", 1.0, 0), ("2", "x", "a", 0.0, 1), ("3", "x", "a", -0.4, 3)])
+    # Re-analysis of a post replaces its row
+    _add(stats, [("2", "x", "a", 0.2, 1)])
+
+    result = stats.query(group_by="time", bucket_seconds=3600, window=2)
+    assert [g.key for g in result.groups] == [
+        "2025-01-01T00:00:00+00:00", "2025-01-01T01:00:00+00:00", "2025-01-01T03:00:00+00:00"]
+    assert [g.mean_score for g in result.groups] == pytest.approx([1.0, 0.2, -0.4], abs=1e-4)
+    # Hour 2 is empty, so hour 3's trailing two-hour window is only itself
+    assert [g.rolling_mean for g in result.groups] == pytest.approx([1.0, 0.6, -0.4], abs=1e-4)
+
+    since = datetime(2025, 1, 1, 1, tzinfo=timezone.utc)
+    assert stats.query(group_by="none", since=since).groups[0].count == 2
+
+
+def test_oldest_posts_are_evicted():
+    stats = SentimentStats(max_posts=10)
+    _add(stats, [(str(i), "x", "a", 0.1, 0) for i in range(12)])
+    assert len(stats) == 9
+    _add(stats, [("11", "x", "a", -0.9, 0)])
+    assert stats.query(group_by="none").groups[0].negative == 1
+    # An evicted post comes back as a new row; survivors are still overwritten
+    _add(stats, [("0", "x", "a", -0.9, 0), ("5", "x", "a", 0.0, 0)])
+    counts = stats.query(group_by="none").groups[0]
+    assert (len(stats), counts.negative, counts.neutral) == (10, 2, 1)
+
+
+def test_stats_endpoint():
+    client = TestClient(app)
+    client.post("/api/v1/analyze", json={"posts": [
+        {"id": "s1", "platform": "stats-test", "author": "a", "text": "What a great day"}]})
+    r = client.get("/api/v1/stats", params={"group_by": "platform", "platform": "stats-test"})
+    assert r.status_code == 200
+    assert r.json()["groups"][0]["positive"] == 1
+    assert client.get("/api/v1/stats", params={"group_by": "nope"}).status_code == 422
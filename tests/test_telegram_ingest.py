@@ -0,0 +1,83 @@
+import pytest
+
+from app.services import data_fetcher, telegram_ingest
+from app.services.chat_buffer import ChatBuffer
+from app.services.watermarks import Watermark, WatermarkStore
+
+
+def _update(update_id, chat_id, message_id, text="hello"):
+    return {"update_id": update_id, "message": {
+        "message_id": message_id, "chat": {"id": chat_id}, "date": 1704067200,
+        "from": {"id": 7, "username": "ann"}, "text": text}}
+
+
+class FakeTelegram(data_fetcher.TelegramFetcher):
+    def __init__(self, rounds):
+        super().__init__()
+        self.bot_token = "123:abc"
+        self.rounds = rounds
+        self.offsets = []
+
+    def get_updates(self, offset=None, limit=100, timeout=0):
+        self.offsets.append(offset)
+        return self.rounds.pop(0) if self.rounds else []
+
+
+@pytest.fixture
+def store(monkeypatch, store_kwargs):
+    store = WatermarkStore(**store_kwargs)
+    monkeypatch.setattr(telegram_ingest, "watermark_store", store)
+    return store
+
+
+def test_updates_fanned_out_by_chat_and_offset_persisted(store):
+    handled = []
+    fetcher = FakeTelegram([[_update(10, -1, 1), _update(11, -2, 5), _update(12, -1, 2)]])
+    worker = telegram_ingest.TelegramIngestWorker(
+        fetcher=fetcher, handler=lambda chat, posts: handled.append((chat, [p.id for p in posts])))
+
+    assert worker.poll_once() == 3
+    assert handled == [("-1", ["1", "2"]), ("-2", ["5"])]
+    assert [p.id for p in worker.recent("-1")] == ["2", "1"]
+    assert store.get("telegram", "-1").since_id == "2"
+
+    # The offset survives a restart and acknowledges consumed updates
+    restarted = telegram_ingest.TelegramIngestWorker(fetcher=fetcher, handler=lambda c, p: None)
+    restarted.offset = store.get("telegram", restarted._offset_account()).update_offset
+    restarted.poll_once()
+    assert fetcher.offsets[-1] == 13
+
+
+def test_failed_round_is_redelivered_without_double_handling(store):
+    calls = []
+
+    def handler(chat, posts):
+        calls.append(chat)
+        if chat == "-2" and calls.count("-2") == 1:
+            raise RuntimeError("queue full")
+
+    batch = [_update(10, -1, 1), _update(11, -2, 5)]
+    fetcher = FakeTelegram([list(batch), list(batch)])
+    worker = telegram_ingest.TelegramIngestWorker(fetcher=fetcher, handler=handler)
+
+    with pytest.raises(RuntimeError):
+        worker.poll_once()
+    assert worker.offset is None
+
+    worker.poll_once()
+    assert calls == ["-1", "-2", "-2"]
+    assert worker.offset == 12
+
+
+def test_fetcher_serves_the_buffer_while_the_worker_runs(store):
+    buffer = ChatBuffer()
+    fetcher = FakeTelegram([[_update(10, -1, 1), _update(11, -1, 2)]])
+    worker = telegram_ingest.TelegramIngestWorker(
+        fetcher=fetcher, handler=lambda chat, posts: None, buffer=buffer)
+    worker.poll_once()
+
+    reader = data_fetcher.TelegramFetcher(buffer=buffer)
+    reader.bot_token = "123:abc"
+    buffer.live = True
+    assert [p.id for p in reader.iter_posts("-1")] == ["2", "1"]
+    assert [p.id for p in reader.iter_posts("-1", since=Watermark(since_id="1"))] == ["2"]
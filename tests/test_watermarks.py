@@ -0,0 +1,88 @@
+import pytest
+
+from app.schemas.data_ingestion import Post
+from app.services import data_fetcher
+from app.services.rate_limiter import RateLimitScheduler
+from app.services.watermarks import Watermark, WatermarkStore, advance, post_epoch
+
+
+@pytest.fixture
+def store(monkeypatch, store_kwargs):
+    store = WatermarkStore(**store_kwargs)
+    monkeypatch.setattr(data_fetcher, "watermark_store", store)
+    monkeypatch.setattr(data_fetcher.settings, "http_cache_enabled", False)
+    monkeypatch.setattr(data_fetcher, "rate_limiter", RateLimitScheduler())
+    return store
+
+
+def test_post_epoch_accepts_platform_formats():
+    expected = 1704067200.0
+    for ts in ("2024-01-01T00:00:00.000Z", "2024-01-01T00:00:00+0000", "2024-01-01T00:00:00"):
+        assert post_epoch(Post(id="1", platform="x", author="a", text="", timestamp=ts)) == expected
+
+
+def test_advance_keeps_newest():
+    posts = [Post(id=i, platform="twitter", author="a", text="") for i in ("9", "12", "10")]
+    assert advance(Watermark(since_id="11"), posts).since_id == "12"
+    assert advance(Watermark(since_id="20"), posts) is None
+
+
+def test_twitter_fetches_only_the_delta(store, monkeypatch, make_response):
+    fetcher = data_fetcher.TwitterFetcher()
+    fetcher.bearer_token = "token"
+    timeline = {"data": [{"id": "3", "text": "c"}, {"id": "2", "text": "b"}]}
+    sent = []
+
+    def request(method, url, params=None, **kwargs):
+        sent.append(dict(params))
+        tweets = [t for t in timeline["data"]
+                  if "since_id" not in params or int(t["id"]) > int(params["since_id"])]
+        return make_response(body={"data": tweets})
+
+    monkeypatch.setattr(fetcher.session, "request", request)
+    assert [p.id for p in fetcher.fetch_new_posts("42")] == ["3", "2"]
+    assert store.get("twitter", "42").since_id == "3"
+
+    timeline["data"].insert(0, {"id": "4", "text": "d"})
+    assert [p.id for p in fetcher.fetch_new_posts("42")] == ["4"]
+    assert sent[-1]["since_id"] == "3"
+    assert fetcher.fetch_new_posts("42") == []
+
+
+
+def test_surplus_is_caught_up_oldest_first(store, monkeypatch, make_response):
+    fetcher = data_fetcher.TwitterFetcher()
+    fetcher.bearer_token = "token"
+    store.save("twitter", "42", Watermark(since_id="2"))
+
+    def request(method, url, params=None, **kwargs):
+        return make_response(body={"data": [
+            {"id": str(i), "text": "t"} for i in range(7, 0, -1)
+            if i > int(params["since_id"])]})
+
+    monkeypatch.setattr(fetcher.session, "request", request)
+    assert [p.id for p in fetcher.fetch_new_posts("42", limit=2)] == ["4", "3"]
+    assert [p.id for p in fetcher.fetch_new_posts("42", limit=2)] == ["6", "5"]
+    assert [p.id for p in fetcher.fetch_new_posts("42", limit=2)] == ["7"]
+
+    # Past the backfill cap the oldest posts are a gap, not a stall
+    store.save("twitter", "42", Watermark(since_id="0"))
+    monkeypatch.setattr(data_fetcher.settings, "fetch_backfill_max_posts", 3)
+    assert [p.id for p in fetcher.fetch_new_posts("42", limit=2)] == ["6", "5"]
+def test_linkedin_stops_paging_at_known_posts(store, monkeypatch, make_response):
+    fetcher = data_fetcher.LinkedInFetcher()
+    fetcher.access_token = "token"
+    store.save("linkedin", "me", Watermark(since_ts=2000.0))
+    pages = []
+
+    def request(method, url, **kwargs):
+        pages.append(url)
+        return make_response(body={"elements": [
+            {"id": "b", "created": {"time": 3_000_000}},
+            {"id": "a", "created": {"time": 1_000_000}},
+        ]})
+
+    monkeypatch.setattr(fetcher.session, "request", request)
+    assert [p.id for p in fetcher.fetch_new_posts("me", limit=2)] == ["b"]
+    assert len(pages) == 1
+    assert store.get("linkedin", "me").since_ts == 3000.0